@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Cache Read Benchmark
+Compares the lock-free MemoryStorage read path with the previous
+TTLCache + asyncio.Lock design under many concurrent readers
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Optional, List
+
+from cachetools import TTLCache
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from nft_scout.config import Config  # noqa: E402
+from nft_scout.storage.memory import MemoryStorage  # noqa: E402
+
+
+class LockedTTLStorage:
+    """The previous MemoryStorage: one asyncio.Lock around every operation"""
+
+    def __init__(self, ttl: int):
+        self.cache: TTLCache = TTLCache(maxsize=10000, ttl=ttl)
+        self._lock = asyncio.Lock()
+
+    async def get_cache(self, key: str) -> Optional[Any]:
+        async with self._lock:
+            return self.cache.get(key)
+
+    async def set_cache(self, key: str, value: Any, ttl: int = 900) -> None:
+        async with self._lock:
+            self.cache[key] = value
+
+
+async def run(storage, readers: int, reads_per_reader: int, keys: int) -> dict:
+    """Start `readers` coroutines at once, each doing lookups, with one writer running alongside"""
+    value = {"floor_price": 1.23, "volume_24h": 456.7, "owners": 1234, "name": "Collection"}
+    for i in range(keys):
+        await storage.set_cache(f"collection_stats:{i}:ethereum", value, ttl=900)
+
+    latencies: List[float] = []
+    start_gate = asyncio.Event()
+    stop = False
+
+    async def reader(index: int):
+        await start_gate.wait()
+        for n in range(reads_per_reader):
+            started = time.perf_counter()
+            await storage.get_cache(f"collection_stats:{(index + n) % keys}:ethereum")
+            latencies.append(time.perf_counter() - started)
+            # Let other coroutines run, as a real request handler would
+            await asyncio.sleep(0)
+
+    async def writer():
+        await start_gate.wait()
+        n = 0
+        while not stop:
+            await storage.set_cache(f"collection_stats:{n % keys}:ethereum", value, ttl=900)
+            n += 1
+            await asyncio.sleep(0)
+
+    tasks = [asyncio.create_task(reader(i)) for i in range(readers)]
+    writer_task = asyncio.create_task(writer())
+    started = time.perf_counter()
+    start_gate.set()
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+    stop = True
+    await writer_task
+
+    latencies.sort()
+    total = len(latencies)
+    return {
+        "reads": total,
+        "elapsed_s": elapsed,
+        "reads_per_s": total / elapsed,
+        "p50_us": statistics.median(latencies) * 1e6,
+        "p99_us": latencies[int(total * 0.99) - 1] * 1e6,
+    }
+
+
+def print_result(name: str, result: dict):
+    print(f"  {name:<24} {result['reads_per_s']:>12,.0f} reads/s"
+          f"   p50 {result['p50_us']:>7.1f}us   p99 {result['p99_us']:>7.1f}us"
+          f"   ({result['reads']:,} reads in {result['elapsed_s']:.2f}s)")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark MemoryStorage reads")
+    parser.add_argument("--readers", type=int, default=1000)
+    parser.add_argument("--reads", type=int, default=200, help="Reads per reader")
+    parser.add_argument("--keys", type=int, default=500)
+    args = parser.parse_args()
+
+    print("📊 Cache read benchmark")
+    print(f"   {args.readers} concurrent readers x {args.reads} reads, {args.keys} keys, 1 concurrent writer")
+    print("=" * 50)
+
+    config = Config.from_env()
+    locked = await run(LockedTTLStorage(config.cache_ttl), args.readers, args.reads, args.keys)
+    lock_free = await run(MemoryStorage(config), args.readers, args.reads, args.keys)
+
+    print_result("TTLCache + asyncio.Lock", locked)
+    print_result("MemoryStorage (lock-free)", lock_free)
+    print(f"\n  Speedup: {lock_free['reads_per_s'] / locked['reads_per_s']:.2f}x throughput")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+NFT Memory Benchmark
+Measures how much memory a large scraped collection takes as NormalizedNFT
+models versus CompactNFT (with and without raw metadata)
+"""
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from benchmark_normalizer import alchemy_item  # noqa: E402
+from nft_scout.compact import CompactNFT  # noqa: E402
+from nft_scout.models import Chain  # noqa: E402
+from nft_scout.normalizer import Normalizer  # noqa: E402
+
+
+def normalized(i: int, traits: int):
+    return Normalizer.normalize_nft_from_source(alchemy_item(i, traits), "alchemy", Chain.ETHEREUM)
+
+
+def measure(build: Callable[[int], object], items: int) -> dict:
+    """Memory held by a list of `items` objects once everything else is freed"""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    kept: List[object] = [build(i) for i in range(items)]
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    sample = kept[len(kept) // 2]
+    del kept
+    return {"bytes": current, "elapsed_s": elapsed, "sample": sample}
+
+
+def print_result(name: str, result: dict, items: int, baseline: int):
+    mb = result["bytes"] / 1024 / 1024
+    print(f"  {name:<28} {mb:>9,.1f} MB   {result['bytes'] / items:>7,.0f} B/NFT"
+          f"   {baseline / result['bytes']:>5.1f}x smaller   (built in {result['elapsed_s']:.1f}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark in-memory NFT representations")
+    parser.add_argument("--items", type=int, default=100000)
+    parser.add_argument("--traits", type=int, default=8, help="Traits per NFT")
+    args = parser.parse_args()
+
+    print("📊 NFT memory benchmark")
+    print(f"   {args.items:,} NFTs, {args.traits} traits each (synthetic Alchemy items)")
+    print("=" * 50)
+
+    models = measure(lambda i: normalized(i, args.traits), args.items)
+    compact_raw = measure(lambda i: CompactNFT.from_nft(normalized(i, args.traits), keep_raw=True), args.items)
+    compact = measure(lambda i: CompactNFT.from_nft(normalized(i, args.traits)), args.items)
+
+    baseline = models["bytes"]
+    print_result("NormalizedNFT", models, args.items, baseline)
+    print_result("CompactNFT (raw, encoded)", compact_raw, args.items, baseline)
+    print_result("CompactNFT (no raw)", compact, args.items, baseline)
+
+    # Converting back gives the same model
+    original = models["sample"]
+    restored = compact_raw["sample"].to_nft()
+    assert restored == original, "CompactNFT.to_nft() differs from the original model"
+    assert compact["sample"].to_nft() == original.model_copy(update={"raw_metadata": None})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Normalizer Benchmark
+Compares the fast normalizer path with the fully validated one, per source,
+on synthetic pages shaped like real Alchemy, Helius and Moralis responses
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from nft_scout.models import Chain  # noqa: E402
+from nft_scout.normalizer import Normalizer  # noqa: E402
+
+
+def make_traits(i: int, count: int) -> List[Dict[str, Any]]:
+    traits = [{"trait_type": f"Trait {n}", "value": f"Value {(i + n) % 17}"} for n in range(count - 1)]
+    traits.append({"trait_type": "Level", "value": i % 100, "display_type": "number"})
+    return traits
+
+
+def alchemy_item(i: int, traits: int) -> Dict[str, Any]:
+    return {
+        "contract": {"address": "0xbc4ca0eda7647a8ab7c2061c2e118a18a936f13d", "name": "Bench Apes"},
+        "id": {"tokenId": hex(i), "tokenMetadata": {"tokenType": "ERC721"}},
+        "metadata": {
+            "name": f"Ape #{i}",
+            "description": "A benchmark ape",
+            "image": f"ipfs://QmeSjSinHpPnmXmspMjwiXyN6zS4E9zccariGR3jxcaWtq/{i}.png",
+            "external_url": f"https://example.com/apes/{i}",
+            "attributes": make_traits(i, traits),
+        },
+        "owners": [f"0x{i:040x}"],
+    }
+
+
+def helius_item(i: int, traits: int) -> Dict[str, Any]:
+    return {
+        "id": f"Asset{i:040d}",
+        "interface": "V1_NFT",
+        "content": {
+            "metadata": {"name": f"Sol Ape #{i}", "description": "A benchmark ape", "attributes": make_traits(i, traits)},
+            "files": [{"uri": f"https://arweave.net/{i:043d}", "cdn_uri": f"https://cdn.helius-rpc.com/cdn-cgi/image//{i}.png"}],
+            "links": {"image": f"https://arweave.net/{i:043d}"},
+        },
+        "grouping": [{"group_key": "collection", "group_value": "SolApesCollection11111111111111111111111"}],
+        "ownership": {"owner": f"Owner{i:039d}"},
+    }
+
+
+def moralis_item(i: int, traits: int) -> Dict[str, Any]:
+    return {
+        "token_address": "0xbc4ca0eda7647a8ab7c2061c2e118a18a936f13d",
+        "token_id": str(i),
+        "contract_type": "ERC721",
+        "name": "Bench Apes",
+        "metadata": json.dumps({
+            "name": f"Ape #{i}",
+            "image": f"https://example.com/apes/{i}.png",
+            "attributes": make_traits(i, traits),
+        }),
+    }
+
+
+SOURCES = {
+    "alchemy": (alchemy_item, Chain.ETHEREUM),
+    "helius": (helius_item, Chain.SOLANA),
+    "moralis": (moralis_item, Chain.ETHEREUM),
+}
+
+
+def run(source: str, page: List[Dict[str, Any]], chain: Chain, fast: bool, repeat: int) -> float:
+    """Best NFTs/s over `repeat` passes of the page"""
+    best = 0.0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for item in page:
+            Normalizer.normalize_nft_from_source(item, source, chain, fast=fast)
+        best = max(best, len(page) / (time.perf_counter() - started))
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the fast normalizer against the validated one")
+    parser.add_argument("--items", type=int, default=10000, help="NFTs per page")
+    parser.add_argument("--traits", type=int, default=8, help="Traits per NFT")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print("📊 Normalizer benchmark")
+    print(f"   {args.items:,} NFTs per page, {args.traits} traits each, best of {args.repeat}")
+    print("=" * 50)
+
+    for source, (make_item, chain) in SOURCES.items():
+        page = [make_item(i, args.traits) for i in range(args.items)]
+
+        # Both paths must produce the same models
+        for item in page[:100]:
+            fast = Normalizer.normalize_nft_from_source(item, source, chain, fast=True)
+            validated = Normalizer.normalize_nft_from_source(item, source, chain, fast=False)
+            assert fast == validated, f"{source}: fast path differs for {item}"
+            assert fast.model_dump_json() == validated.model_dump_json()
+
+        validated_rate = run(source, page, chain, False, args.repeat)
+        fast_rate = run(source, page, chain, True, args.repeat)
+        print(f"  {source:<8} validated {validated_rate:>10,.0f} NFTs/s"
+              f"   fast {fast_rate:>10,.0f} NFTs/s   ({fast_rate / validated_rate:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,28 +4,40 @@ NFT Scout CLI entrypoint
 """
 
 import asyncio
+import time
 import typer
 from typing import Optional, List
 from rich.console import Console
 from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeElapsedColumn
 from loguru import logger
 
 from src.nft_scout import NFTScout, Chain
 from src.nft_scout.config import config
+from src.nft_scout.export import open_nft_writer, EXPORT_FORMATS
+from src.nft_scout.utils import format_age
 
 app = typer.Typer(help="NFT Scout - Multi-chain NFT data scraper")
 console = Console()
 
 
+def _check_format(fmt: Optional[str]):
+    """Reject an unknown --format before anything is fetched"""
+    if fmt and fmt.lower() not in EXPORT_FORMATS:
+        raise typer.BadParameter(f"expected one of {', '.join(EXPORT_FORMATS)}", param_hint="--format")
+
+
 @app.command()
 def wallet(
     address: str = typer.Argument(..., help="Wallet address or ENS name"),
     chains: str = typer.Option("ethereum", help="Comma-separated chains (ethereum,polygon,solana)"),
     include_transfers: bool = typer.Option(False, "--include-transfers", help="Include transfer history"),
-    output: Optional[str] = typer.Option(None, "--output", "-o", help="Output file (JSON)"),
+    output: Optional[str] = typer.Option(None, "--output", "-o", help="Output file (JSON or Parquet)"),
+    fmt: Optional[str] = typer.Option(None, "--format", "-f", help=f"Output format ({', '.join(EXPORT_FORMATS)}); default from the file extension"),
+    raw_metadata: Optional[bool] = typer.Option(None, "--raw-metadata/--no-raw-metadata", help="Include raw provider metadata (default: JSON yes, Parquet no)"),
 ):
     """Get all NFTs owned by a wallet"""
+    _check_format(fmt)
     chain_list = [Chain.from_string(c.strip()) for c in chains.split(",")]
     
     async def fetch_nfts():
@@ -36,11 +48,14 @@ def wallet(
             console=console,
         ) as progress:
             task = progress.add_task(f"Fetching NFTs for {address}...", total=None)
-            response = await scout.get_wallet_nfts(
-                address,
-                chain_list,
-                include_transfers=include_transfers,
-            )
+            try:
+                response = await scout.get_wallet_nfts(
+                    address,
+                    chain_list,
+                    include_transfers=include_transfers,
+                )
+            finally:
+                await scout.close()
             progress.update(task, completed=True)
         
         # Display results
@@ -67,10 +82,9 @@ def wallet(
                 console.print(f"\n[dim]... and {response.total_count - 20} more[/dim]")
         
         if output:
-            import json
-            with open(output, "w") as f:
-                json.dump([nft.dict() for nft in response.nfts], f, indent=2, default=str)
-            console.print(f"\n[green]Saved to {output}[/green]")
+            with open_nft_writer(output, fmt, include_raw_metadata=raw_metadata) as writer:
+                writer.write(response.nfts)
+            console.print(f"\n[green]Saved {writer.rows_written} NFTs to {output}[/green]")
     
     asyncio.run(fetch_nfts())
 
@@ -79,48 +93,168 @@ def wallet(
 def collection(
     contract: str = typer.Argument(..., help="Collection contract address"),
     chain: str = typer.Option("ethereum", help="Blockchain (ethereum, polygon, solana, etc.)"),
-    output: Optional[str] = typer.Option(None, "--output", "-o", help="Output file (JSON)"),
+    output: Optional[str] = typer.Option(None, "--output", "-o", help="Output file (JSON, NDJSON or Parquet; .gz to compress JSON)"),
+    fmt: Optional[str] = typer.Option(None, "--format", "-f", help=f"Output format ({', '.join(EXPORT_FORMATS)}); default from the file extension"),
+    raw_metadata: Optional[bool] = typer.Option(None, "--raw-metadata/--no-raw-metadata", help="Include raw provider metadata (default: JSON yes, Parquet no)"),
+    all_pages: bool = typer.Option(False, "--all", help="Walk every page, writing NFTs to --output as they arrive"),
+    max_items: Optional[int] = typer.Option(None, "--max-items", min=1, help="Stop after this many NFTs (with --all)"),
+    concurrency: int = typer.Option(2, "--concurrency", min=1, help="Pages fetched ahead of the writer (with --all)"),
+    resync: bool = typer.Option(False, "--resync", help="Walk the whole collection again instead of reusing the stored copy (with --all)"),
+    use_store: bool = typer.Option(True, "--store/--no-store", help="Read and update the local collection store (with --all); --no-store fetches every page from the provider"),
 ):
-    """Get all NFTs in a collection"""
+    """Get the NFTs in a collection (first page, or all of them with --all)"""
+    _check_format(fmt)
     chain_enum = Chain.from_string(chain)
     
     async def fetch_collection():
         scout = NFTScout()
+        if all_pages:
+            writer = open_nft_writer(output, fmt, include_raw_metadata=raw_metadata) if output else None
+            try:
+                sample, count, pages = await _stream_collection(
+                    scout, contract, chain_enum, writer, max_items, concurrency,
+                    full_resync=resync, use_store=use_store,
+                )
+            finally:
+                if writer:
+                    writer.close()
+                await scout.close()
+            console.print(f"\n[bold green]Fetched {count:,} NFTs in {pages:,} pages[/bold green]")
+            _print_collection_table(contract, sample)
+            if output:
+                console.print(f"\n[green]Saved {writer.rows_written:,} NFTs to {output}[/green]")
+            return
+        
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             console=console,
         ) as progress:
             task = progress.add_task(f"Fetching collection {contract}...", total=None)
-            response = await scout.get_collection_nfts(contract, chain_enum)
+            try:
+                response = await scout.get_collection_nfts(contract, chain_enum)
+            finally:
+                await scout.close()
             progress.update(task, completed=True)
         
         console.print(f"\n[bold green]Found {response.total_count} NFTs in collection[/bold green]")
-        
-        if response.nfts:
-            table = Table(title=f"Collection: {contract}")
-            table.add_column("Token ID", style="yellow")
-            table.add_column("Name", style="white")
-            table.add_column("Owner", style="cyan")
-            
-            for nft in response.nfts[:20]:
-                table.add_row(
-                    str(nft.token_id)[:20] + "..." if len(str(nft.token_id)) > 20 else str(nft.token_id),
-                    nft.name or "Unnamed",
-                    (nft.owner_address or "Unknown")[:20] + "..." if nft.owner_address and len(nft.owner_address) > 20 else (nft.owner_address or "Unknown"),
-                )
-            
-            console.print(table)
+        if response.has_more:
+            console.print("[dim]This is the first page only - use --all to fetch the whole collection[/dim]")
+        _print_collection_table(contract, response.nfts)
         
         if output:
-            import json
-            with open(output, "w") as f:
-                json.dump([nft.dict() for nft in response.nfts], f, indent=2, default=str)
-            console.print(f"\n[green]Saved to {output}[/green]")
+            with open_nft_writer(output, fmt, include_raw_metadata=raw_metadata) as writer:
+                writer.write(response.nfts)
+            console.print(f"\n[green]Saved {writer.rows_written} NFTs to {output}[/green]")
     
     asyncio.run(fetch_collection())
 
 
+async def _stream_collection(
+    scout,
+    contract: str,
+    chain: Chain,
+    writer,
+    max_items: Optional[int],
+    concurrency: int,
+    full_resync: bool = False,
+    use_store: bool = True,
+):
+    """
+    Walk every page of a collection, handing NFTs to `writer` page by page
+    
+    Only the first 20 NFTs are kept (for the summary table), so memory does
+    not grow with the collection. Returns (sample, NFT count, page count).
+    
+    With the collection store, NFTs stored by earlier runs are written
+    without asking the provider (a note says so and how old they are);
+    `use_store=False` walks the provider only and leaves the store alone.
+    """
+    page_size = 1000 if chain == Chain.SOLANA else 100
+    sample = []
+    count = 0
+    pages = 0
+    
+    if use_store:
+        sync = await scout.get_sync_info(contract, chain)
+        if sync and not full_resync and not sync["stale"]:
+            console.print(
+                f"[yellow]{sync['stored']:,} NFTs come from the collection store "
+                f"({scout.collection_store.path}), last synced {format_age(sync['synced_at'])}, "
+                f"last full walk {format_age(sync['walk_started_at'])}; only newer pages are fetched. "
+                f"Use --resync for a fresh walk or --no-store to skip the store.[/yellow]"
+            )
+    
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        TextColumn("{task.completed:,.0f} NFTs · {task.fields[pages]:,} pages"),
+        TextColumn("[cyan]{task.fields[nft_rate]:,.0f} NFTs/s · {task.fields[page_rate]:.1f} pages/s"),
+        TimeElapsedColumn(),
+        console=console,
+    ) as progress:
+        task = progress.add_task(
+            f"Fetching collection {contract}...", total=max_items, pages=0, nft_rate=0.0, page_rate=0.0
+        )
+        started = time.monotonic()
+        if use_store:
+            walk = scout.iter_collection_synced(
+                contract, chain, page_size=page_size, prefetch=concurrency, full_resync=full_resync
+            )
+        else:
+            walk = scout.iter_collection_pages(contract, chain, page_size=page_size, prefetch=concurrency)
+        try:
+            async for page in walk:
+                nfts = page.nfts
+                if max_items is not None:
+                    nfts = nfts[:max_items - count]
+                if writer:
+                    writer.write(nfts)
+                if len(sample) < 20:
+                    sample.extend(nfts[:20 - len(sample)])
+                count += len(nfts)
+                pages += 1
+                
+                elapsed = max(time.monotonic() - started, 1e-6)
+                total = page.total
+                if max_items is not None:
+                    total = min(total, max_items) if total else max_items
+                progress.update(
+                    task,
+                    completed=count,
+                    total=total,
+                    pages=pages,
+                    nft_rate=count / elapsed,
+                    page_rate=pages / elapsed,
+                )
+                if max_items is not None and count >= max_items:
+                    break
+        finally:
+            await walk.aclose()
+    
+    return sample, count, pages
+
+
+def _print_collection_table(contract: str, nfts):
+    """Show the first 20 NFTs of a collection"""
+    if not nfts:
+        return
+    table = Table(title=f"Collection: {contract}")
+    table.add_column("Token ID", style="yellow")
+    table.add_column("Name", style="white")
+    table.add_column("Owner", style="cyan")
+    
+    for nft in nfts[:20]:
+        table.add_row(
+            str(nft.token_id)[:20] + "..." if len(str(nft.token_id)) > 20 else str(nft.token_id),
+            nft.name or "Unnamed",
+            (nft.owner_address or "Unknown")[:20] + "..." if nft.owner_address and len(nft.owner_address) > 20 else (nft.owner_address or "Unknown"),
+        )
+    
+    console.print(table)
+
+
 @app.command()
 def stats(
     contract: str = typer.Argument(..., help="Collection contract address"),
@@ -137,7 +271,10 @@ def stats(
             console=console,
         ) as progress:
             task = progress.add_task(f"Fetching stats for {contract}...", total=None)
-            stats = await scout.get_collection_stats(contract, chain_enum)
+            try:
+                stats = await scout.get_collection_stats(contract, chain_enum)
+            finally:
+                await scout.close()
             progress.update(task, completed=True)
         
         table = Table(title=f"Collection Stats: {stats.name or contract}")
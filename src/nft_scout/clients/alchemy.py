@@ -1,7 +1,6 @@
 """Alchemy API client for EVM chains"""
 
 from typing import Dict, Any, Optional, List
-import aiohttp
 from loguru import logger
 
 from .base import BaseAPIClient
@@ -10,6 +9,8 @@ from .base import BaseAPIClient
 class AlchemyClient(BaseAPIClient):
     """Alchemy API client"""
 
+    provider_name = "alchemy"
+
     CHAIN_MAP = {
         "ethereum": "eth-mainnet",
         "polygon": "polygon-mainnet",
@@ -37,17 +38,18 @@ class AlchemyClient(BaseAPIClient):
     ) -> Dict[str, Any]:
         """Make Alchemy API request"""
         chain_name = self._get_chain_name(chain)
-        url = f"https://{chain_name}.g.alchemy.com/v2/{self.get_api_key()}/{endpoint}"
+        base = f"https://{chain_name}.g.alchemy.com/v2"
+        
+        def sign(api_key: Optional[str], url: str, headers: Dict[str, str]):
+            # Alchemy takes the key as a path segment
+            if api_key is None:
+                raise ValueError("No API keys configured")
+            return f"{base}/{api_key}/{endpoint}", headers
         
-        async with aiohttp.ClientSession() as session:
-            if method.upper() == "GET":
-                async with session.get(url, params=params) as response:
-                    response.raise_for_status()
-                    return await response.json()
-            else:
-                async with session.post(url, json=json_data) as response:
-                    response.raise_for_status()
-                    return await response.json()
+        url = f"{base}/{endpoint}"
+        if method.upper() == "GET":
+            return await self._send("GET", url, params=params, sign=sign)
+        return await self._send("POST", url, json_data=json_data, sign=sign)
     
     async def get_wallet_nfts(
         self,
@@ -1,40 +1,83 @@
 """Base client with common functionality"""
 
 import asyncio
-import time
-from typing import Dict, Any, Optional, List
+import json
+from typing import Dict, Any, Optional, List, Callable, Tuple
 from abc import ABC, abstractmethod
 import aiohttp
 from tenacity import (
-    retry,
+    AsyncRetrying,
     stop_after_attempt,
     wait_exponential,
-    retry_if_exception_type,
+    retry_if_exception,
 )
 from loguru import logger
 
+from .session import SessionManager
+from .rate_limit import KeyedRateLimiter, parse_retry_after, mask_key
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Builds the final URL and headers for a request signed with the given key
+RequestSigner = Callable[[Optional[str], str, Dict[str, str]], Tuple[str, Dict[str, str]]]
+
+# Body marker for a 404 (callers map it to their own not_found value)
+_NOT_FOUND = object()
+
+
+class RateLimitedError(aiohttp.ClientResponseError):
+    """Provider answered 429 for the key the request was sent with"""
+
+
+class KeyRejectedError(aiohttp.ClientResponseError):
+    """Provider refused the key itself (401/403) while other keys remain"""
+
+
+def _is_retryable(error: BaseException) -> bool:
+    """Transient failures worth another attempt"""
+    if isinstance(error, (RateLimitedError, KeyRejectedError, asyncio.TimeoutError)):
+        return True
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status >= 500 or error.status == 408
+    return isinstance(error, aiohttp.ClientError)
+
 
 class BaseAPIClient(ABC):
     """Base class for API clients with retry logic and rate limiting"""
     
+    # Name of the connection pool this client's requests go through
+    provider_name = "default"
+    
     def __init__(
         self,
         api_keys: List[str],
         base_url: str,
-        rate_limit: int = 100,
+        rate_limit: float = 100,
         timeout: int = 30,
         max_retries: int = 3,
+        session_manager: Optional[SessionManager] = None,
+        burst: Optional[float] = None,
     ):
         self.api_keys = api_keys
         self.base_url = base_url
         self.rate_limit = rate_limit
         self.timeout = timeout
         self.max_retries = max_retries
+        # Shared pool owned by NFTScout; standalone clients get a private one and close it themselves
+        self._owns_session_manager = session_manager is None
+        self.session_manager = session_manager or SessionManager()
         self.current_key_index = 0
-        self._rate_limiter_semaphore = asyncio.Semaphore(rate_limit)
-        self._last_request_time = 0
-        self._min_request_interval = 1.0 / rate_limit
-        
+        # rate_limit is the quota of a single key; every key gets its own bucket
+        self.rate_limiter = KeyedRateLimiter(rate_limit, burst)
+        # Single-flight: identical requests pending right now share one fetch
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._flight_waiters: Dict[asyncio.Future, int] = {}
+        self.transport_stats = {"upstream_requests": 0, "coalesced": 0, "cancelled": 0}
+    
     def get_api_key(self) -> str:
         """Get current API key (with rotation)"""
         if not self.api_keys:
@@ -46,21 +89,193 @@ class BaseAPIClient(ABC):
         """Rotate to next API key"""
         self.current_key_index = (self.current_key_index + 1) % len(self.api_keys)
     
-    async def _apply_rate_limit(self):
-        """Rate limiting"""
-        async with self._rate_limiter_semaphore:
-            current_time = time.time()
-            time_since_last = current_time - self._last_request_time
-            if time_since_last < self._min_request_interval:
-                await asyncio.sleep(self._min_request_interval - time_since_last)
-            self._last_request_time = time.time()
-    
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((aiohttp.ClientError, asyncio.TimeoutError)),
-        reraise=True,
-    )
+    async def _apply_rate_limit(self) -> Optional[str]:
+        """Wait for a request slot and return the API key to send it with"""
+        return await self.rate_limiter.acquire(self.api_keys, self.current_key_index)
+    
+    def get_rate_limit_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Token-bucket and key health metrics per API key"""
+        return self.rate_limiter.get_stats(self.api_keys)
+    
+    async def close(self) -> None:
+        """Close the private connection pool (a shared one is left to its owner)"""
+        if self._owns_session_manager:
+            await self.session_manager.close()
+    
+    def _session_request(self, method: str, url: str, **kwargs: Any):
+        """Issue a request on this provider's pooled session"""
+        kwargs.setdefault("timeout", aiohttp.ClientTimeout(total=self.timeout))
+        return self.session_manager.request(self.provider_name, method, url, **kwargs)
+    
+    @staticmethod
+    def _retry_wait(retry_state) -> float:
+        """No extra sleep after a 429 (the limiter holds the key back), exponential otherwise"""
+        error = retry_state.outcome.exception() if retry_state.outcome else None
+        if isinstance(error, (RateLimitedError, KeyRejectedError)):
+            return 0.0
+        return wait_exponential(multiplier=1, min=2, max=10)(retry_state)
+    
+    @staticmethod
+    def _flight_key(
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        json_data: Optional[Any],
+        headers: Optional[Dict[str, str]],
+    ) -> str:
+        """Identity of a logical request, independent of the key it is signed with"""
+        return json.dumps(
+            [method.upper(), url, params or {}, json_data, headers or {}],
+            sort_keys=True,
+            default=str,
+        )
+    
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        json_data: Optional[Any] = None,
+        headers: Optional[Dict[str, str]] = None,
+        sign: Optional[RequestSigner] = None,
+        not_found: Optional[Any] = None,
+        coalesce: bool = True,
+    ) -> Any:
+        """
+        Send a request, sharing the upstream call with identical requests in flight
+        
+        `url` is the unsigned URL; together with method, params, body and
+        headers it identifies the logical request. While one such request is
+        pending, later callers await the same in-flight fetch instead of
+        issuing another HTTP call (single flight). The response body is shared
+        as bytes and decoded separately for every caller, so callers can
+        mutate their result freely. If `not_found` is given it is returned for
+        a 404.
+        
+        A caller that is cancelled stops waiting without failing the others;
+        when the last one is gone the shared fetch itself is cancelled, so
+        the HTTP request is aborted instead of finishing for nobody.
+        """
+        allow_not_found = not_found is not None
+        if coalesce:
+            flight_key = self._flight_key(method, url, params, json_data, headers) + f"|404={allow_not_found}"
+            flight = self._in_flight.get(flight_key)
+            if flight is None:
+                flight = asyncio.ensure_future(
+                    self._fetch_body(method, url, params, json_data, headers, sign, allow_not_found)
+                )
+                self._in_flight[flight_key] = flight
+                # Only evict our own entry: a cancelled flight may already have been replaced
+                flight.add_done_callback(
+                    lambda f, key=flight_key: self._in_flight.pop(key, None) if self._in_flight.get(key) is f else None
+                )
+                self.transport_stats["upstream_requests"] += 1
+            else:
+                self.transport_stats["coalesced"] += 1
+            self._flight_waiters[flight] = self._flight_waiters.get(flight, 0) + 1
+            try:
+                # Shielded: one caller giving up must not fail the others
+                body = await asyncio.shield(flight)
+            finally:
+                waiters = self._flight_waiters.pop(flight) - 1
+                if waiters:
+                    self._flight_waiters[flight] = waiters
+                elif not flight.done():
+                    # Forget it now, a caller arriving before the task unwinds must not join it
+                    if self._in_flight.get(flight_key) is flight:
+                        del self._in_flight[flight_key]
+                    flight.cancel()
+                    self.transport_stats["cancelled"] += 1
+        else:
+            self.transport_stats["upstream_requests"] += 1
+            body = await self._fetch_body(method, url, params, json_data, headers, sign, allow_not_found)
+        
+        if body is _NOT_FOUND:
+            return not_found
+        return _json_loads(body)
+    
+    async def _fetch_body(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        json_data: Optional[Any],
+        headers: Optional[Dict[str, str]],
+        sign: Optional[RequestSigner],
+        allow_not_found: bool = False,
+    ) -> Any:
+        """
+        Fetch a response body through the rate limiter with retries and key health tracking
+        
+        Every attempt takes a fresh key from the limiter and signs the request
+        with it via `sign`. A 429 puts that key on cooldown (from Retry-After or
+        the provider's reset header) and the retry goes to the next healthy
+        key. A 401/403 opens the key's circuit. Timeouts, connection errors and
+        5xx responses are retried with exponential backoff, up to max_retries
+        attempts. Returns the raw body, or _NOT_FOUND for a 404 when
+        `allow_not_found` is set.
+        """
+        retrying = AsyncRetrying(
+            stop=stop_after_attempt(max(1, self.max_retries)),
+            wait=self._retry_wait,
+            retry=retry_if_exception(_is_retryable),
+            reraise=True,
+        )
+        async for attempt in retrying:
+            with attempt:
+                key = await self._apply_rate_limit()
+                request_headers = dict(headers or {})
+                request_url = url
+                if sign:
+                    request_url, request_headers = sign(key, url, request_headers)
+                try:
+                    async with self._session_request(
+                        method,
+                        request_url,
+                        params=params,
+                        json=json_data,
+                        headers=request_headers,
+                    ) as response:
+                        if response.status == 429:
+                            retry_after = parse_retry_after(response.headers)
+                            self.rate_limiter.record_rate_limited(key, retry_after)
+                            logger.warning(
+                                f"{self.provider_name} rate limited key {mask_key(key)}"
+                                f" (cooldown {retry_after if retry_after is not None else 'backoff'}s)"
+                            )
+                            raise RateLimitedError(
+                                request_info=response.request_info,
+                                history=response.history,
+                                status=429,
+                            )
+                        if response.status in (401, 403) and key and len(self.api_keys) > 1:
+                            self.rate_limiter.record_rejected(key)
+                            logger.warning(f"{self.provider_name} rejected key {mask_key(key)} ({response.status})")
+                            raise KeyRejectedError(
+                                request_info=response.request_info,
+                                history=response.history,
+                                status=response.status,
+                            )
+                        if response.status == 404 and allow_not_found:
+                            self.rate_limiter.record_success(key)
+                            return _NOT_FOUND
+                        if response.status >= 500:
+                            self.rate_limiter.record_failure(key)
+                        response.raise_for_status()
+                        body = await response.read()
+                        self.rate_limiter.record_success(key)
+                        return body
+                except aiohttp.ClientError as e:
+                    if _is_retryable(e):
+                        logger.debug(f"Request attempt {attempt.retry_state.attempt_number} failed: {e}")
+                    else:
+                        logger.error(f"Request failed: {e}")
+                    raise
+    
+    def get_transport_stats(self) -> Dict[str, int]:
+        """Upstream calls made vs. calls served by an identical in-flight request"""
+        return {**self.transport_stats, "in_flight": len(self._in_flight)}
+    
     async def _request(
         self,
         method: str,
@@ -70,38 +285,13 @@ class BaseAPIClient(ABC):
         headers: Optional[Dict[str, str]] = None,
     ) -> Dict[str, Any]:
         """Make HTTP request with retry logic"""
-        await self._apply_rate_limit()
-        
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
         
         default_headers = {"Content-Type": "application/json"}
         if headers:
             default_headers.update(headers)
         
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout)) as session:
-            try:
-                async with session.request(
-                    method=method,
-                    url=url,
-                    params=params,
-                    json=json_data,
-                    headers=default_headers,
-                ) as response:
-                    if response.status == 429:  # Rate limited
-                        logger.warning(f"Rate limited, rotating API key")
-                        self.rotate_api_key()
-                        await asyncio.sleep(5)
-                        raise aiohttp.ClientResponseError(
-                            request_info=response.request_info,
-                            history=response.history,
-                            status=429,
-                        )
-                    
-                    response.raise_for_status()
-                    return await response.json()
-            except aiohttp.ClientError as e:
-                logger.error(f"Request failed: {e}")
-                raise
+        return await self._send(method, url, params=params, json_data=json_data, headers=default_headers)
     
     @abstractmethod
     async def get_wallet_nfts(
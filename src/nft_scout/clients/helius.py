@@ -1,6 +1,7 @@
 """Helius API client for Solana"""
 
 from typing import Dict, Any, Optional, List, Union, cast
+import asyncio
 import aiohttp
 import re
 from loguru import logger
@@ -11,9 +12,16 @@ from .base import BaseAPIClient
 class HeliusClient(BaseAPIClient):
     """Helius API client for Solana"""
     
-    def __init__(self, api_keys: List[str], rpc_url: Optional[str] = None, rate_limit: int = 1000, timeout: int = 30, max_retries: int = 3, **kwargs: Any):
+    provider_name = "helius"
+    
+    # getAssetBatch accepts at most 1000 asset IDs per call
+    ENRICH_BATCH_SIZE = 1000
+    
+    def __init__(self, api_keys: List[str], rpc_url: Optional[str] = None, rate_limit: int = 1000, timeout: int = 30, max_retries: int = 3, enrich_concurrency: int = 4, **kwargs: Any):
         base_url = "https://api.helius.xyz"
         super().__init__(api_keys, base_url, rate_limit=rate_limit, timeout=timeout, max_retries=max_retries, **kwargs)
+        # Maximum getAssetBatch calls in flight while enriching a page
+        self.enrich_concurrency = max(1, enrich_concurrency)
         # Store base RPC URL without API key
         if rpc_url and "api-key" in rpc_url:
             # Extract base URL if API key is already in URL
@@ -33,16 +41,17 @@ class HeliusClient(BaseAPIClient):
     ) -> Dict[str, Any]:
         """Make Helius DAS API request"""
         url = f"{self.base_url}/v0/{method}"
-        headers = {"X-API-Key": self.get_api_key()}
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=params, headers=headers) as response:
-                if response.status == 404:
-                    # Return empty result for 404 instead of raising
-                    logger.warning(f"Helius DAS API 404 for {method}: {params}")
-                    return {"items": [], "page": None}
-                response.raise_for_status()
-                return await response.json()
+        def sign(api_key: Optional[str], url: str, headers: Dict[str, str]):
+            headers["X-API-Key"] = api_key or ""
+            return url, headers
+        
+        # Return empty result for 404 instead of raising
+        not_found = {"items": [], "page": None}
+        response = await self._send("POST", url, json_data=params, sign=sign, not_found=not_found)
+        if response is not_found:
+            logger.warning(f"Helius DAS API 404 for {method}: {params}")
+        return response
     
     async def _make_rpc_request(
         self,
@@ -50,10 +59,6 @@ class HeliusClient(BaseAPIClient):
         params: Optional[Union[Dict[str, Any], List[Any]]] = None,
     ) -> Dict[str, Any]:
         """Make Solana RPC request via Helius"""
-        # Build RPC URL with API key
-        api_key = self.get_api_key()
-        url = f"{self.rpc_url}/?api-key={api_key}"
-        
         # Handle params - could be a list or a dict
         if params is None:
             rpc_params: Union[Dict[str, Any], List[Any]] = []
@@ -72,11 +77,14 @@ class HeliusClient(BaseAPIClient):
             "params": rpc_params,
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=payload) as response:
-                response.raise_for_status()
-                result = await response.json()
-                return result.get("result", {})
+        def sign(api_key: Optional[str], url: str, headers: Dict[str, str]):
+            # Build RPC URL with API key
+            if api_key is None:
+                raise ValueError("No API keys configured")
+            return f"{self.rpc_url}/?api-key={api_key}", headers
+        
+        result = await self._send("POST", self.rpc_url, json_data=payload, sign=sign)
+        return result.get("result", {})
     
     async def get_wallet_nfts(
         self,
@@ -104,16 +112,8 @@ class HeliusClient(BaseAPIClient):
             # Filter for NFTs only
             nfts_raw = [item for item in items if item.get("interface") in ["V1_NFT", "V2_NFT", "ProgrammableNFT"]]
             
-            # Enrich metadata for all NFTs
-            nfts: List[Dict[str, Any]] = []
-            for item in nfts_raw:
-                try:
-                    enriched_item: Dict[str, Any] = await self._enrich_nft_metadata(item)
-                    nfts.append(enriched_item)
-                except Exception as enrich_err:
-                    logger.debug(f"Error enriching NFT metadata: {enrich_err}")
-                    # item is already Dict[str, Any] from nfts_raw
-                    nfts.append(cast(Dict[str, Any], item))  # Use original if enrichment fails
+            # Enrich metadata for all NFTs (batched getAssetBatch calls)
+            nfts: List[Dict[str, Any]] = await self._enrich_nft_metadata_batch(nfts_raw)
             
             return {
                 "ownedNfts": nfts,
@@ -148,7 +148,7 @@ class HeliusClient(BaseAPIClient):
             # Use first item for collection metadata
             first_item = items[0]
             content = first_item.get("content", {})
-
+            
             return {
                 "name": content.get("metadata", {}).get("name"),
                 "description": content.get("metadata", {}).get("description"),
@@ -208,15 +208,19 @@ class HeliusClient(BaseAPIClient):
         cursor: Optional[str] = None,
         page_size: int = 100,
     ) -> Dict[str, Any]:
-        """Get all NFTs in a Solana collection"""
-        # Reset collection total tracking for new collections
-        if not hasattr(self, '_current_collection') or self._current_collection != collection_address:
-            self._current_collection = collection_address
-            self._collection_total = None
-            self._last_total = None
+        """
+        Get one page of NFTs in a Solana collection
+        
+        The response carries everything about the call itself: `total` is the
+        collection size when the first page reveals it, `collection_address`
+        the address a marketplace symbol resolved to. Nothing is kept on the
+        client, which is shared by concurrent scrapes.
+        """
         if chain.lower() != "solana":
             raise ValueError("Helius client only supports Solana")
         
+        collection_total = None
+        resolved_address = collection_address
         try:
             # Check if it looks like a Solana address (base58, 32-44 chars)
             is_address = len(collection_address) >= 32 and len(collection_address) <= 44 and re.match(r'^[1-9A-HJ-NP-Za-km-z]+$', collection_address)
@@ -273,16 +277,14 @@ class HeliusClient(BaseAPIClient):
                         actual_total = None
                         logger.debug(f"Subsequent request (cursor exists) -> actual_total = None")
                     
-                    # Store total for later retrieval (first request only)
-                    if actual_total is not None and (not hasattr(self, '_collection_total') or self._collection_total is None):
-                        self._collection_total = actual_total
-                        self._last_total = actual_total
+                    # Report the total with this response (first request only)
+                    if actual_total is not None:
+                        collection_total = actual_total
                         logger.info(f"Collection total determined: {actual_total} (from first request with limit={limit}, items={len(items)}, cursor={bool(page_cursor)})")
-                    elif not hasattr(self, '_collection_total') or self._collection_total is None:
-                        # Store the returned total as a fallback estimate
+                    elif not cursor:
+                        # Report the returned total as a fallback estimate
                         if total_returned > 0:
-                            self._collection_total = total_returned
-                            self._last_total = total_returned
+                            collection_total = total_returned
                             logger.info(f"Collection total estimate: {total_returned} (may be incomplete if cursor exists)")
                         else:
                             logger.debug(f"Helius RPC: total_returned={total_returned}, actual_total={actual_total} - not storing (both are 0/None)")
@@ -319,89 +321,88 @@ class HeliusClient(BaseAPIClient):
                 collection_addr_found = None
                 
                 try:
-                    # Try multiple marketplaces: Magic Eden, Nintondo, Froggy.market
-                    async with aiohttp.ClientSession() as session:
-                        # 1. Try Magic Eden API
-                        if not collection_addr_found:
-                            try:
-                                me_listings_url = f"https://api-mainnet.magiceden.io/v2/collections/{collection_address}/listings?limit=1"
-                                async with session.get(me_listings_url, timeout=aiohttp.ClientTimeout(total=10)) as resp:
-                                    if resp.status == 200:
-                                        listings = await resp.json()
-                                        if listings and len(listings) > 0:
-                                            token_mint = listings[0].get("tokenMint") or listings[0].get("token", {}).get("mintAddress")
-                                            if token_mint:
-                                                collection_addr_found = await self._extract_collection_from_mint(token_mint)
-                                                if collection_addr_found:
-                                                    logger.info(f"Resolved collection via Magic Eden + Helius: {collection_addr_found}")
-                            except Exception as me_err:
-                                logger.debug(f"Magic Eden API error: {me_err}")
-                        
-                        # 2. Try Nintondo (check if they have listings endpoint)
-                        if not collection_addr_found:
-                            try:
-                                # Nintondo may use similar structure - try common endpoints
-                                nintondo_urls = [
-                                    f"https://api.nintondo.io/v1/collections/{collection_address}/listings?limit=1",
-                                    f"https://nintondo.io/api/collections/{collection_address}/listings?limit=1",
-                                ]
-                                for nintondo_url in nintondo_urls:
-                                    try:
-                                        async with session.get(nintondo_url, timeout=aiohttp.ClientTimeout(total=10)) as resp:
-                                            if resp.status == 200:
-                                                data = await resp.json()
-                                                # Try to extract token mint from various response formats
-                                                listings: List[Any] = data if isinstance(data, list) else data.get("listings", []) or data.get("items", [])  # type: ignore[assignment]
-                                                if listings and len(listings) > 0:  # type: ignore[arg-type]
-                                                    first_listing = listings[0]  # type: ignore[index]
-                                                    token_mint: Optional[str] = (  # type: ignore[assignment]
-                                                        first_listing.get("tokenMint") if isinstance(first_listing, dict) else None  # type: ignore[union-attr]
-                                                        or (first_listing.get("mint") if isinstance(first_listing, dict) else None)  # type: ignore[union-attr]
-                                                        or (first_listing.get("mintAddress") if isinstance(first_listing, dict) else None)  # type: ignore[union-attr]
-                                                        or (first_listing.get("token", {}).get("mintAddress") if isinstance(first_listing, dict) else None)  # type: ignore[union-attr]
-                                                    )
-                                                    if token_mint and isinstance(token_mint, str):  # type: ignore[redundant-expr, misc]
-                                                        collection_addr_found = await self._extract_collection_from_mint(token_mint)
-                                                        if collection_addr_found:
-                                                            logger.info(f"Resolved collection via Nintondo + Helius: {collection_addr_found}")
-                                                            break
-                                    except Exception:
-                                        continue
-                            except Exception as nintondo_err:
-                                logger.debug(f"Nintondo API error: {nintondo_err}")
-                        
-                        # 3. Try Froggy.market
-                        if not collection_addr_found:
-                            try:
-                                froggy_urls = [
-                                    f"https://api.froggy.market/v1/collections/{collection_address}/listings?limit=1",
-                                    f"https://froggy.market/api/collections/{collection_address}/listings?limit=1",
-                                    f"https://api.froggy.market/collections/{collection_address}?limit=1",
-                                ]
-                                for froggy_url in froggy_urls:
-                                    try:
-                                        async with session.get(froggy_url, timeout=aiohttp.ClientTimeout(total=10)) as resp:
-                                            if resp.status == 200:
-                                                data = await resp.json()
-                                                listings: List[Any] = data if isinstance(data, list) else data.get("listings", []) or data.get("items", []) or data.get("nfts", [])  # type: ignore[assignment]
-                                                if listings and len(listings) > 0:  # type: ignore[arg-type]
-                                                    first_listing = listings[0]  # type: ignore[index]
-                                                    token_mint: Optional[str] = (  # type: ignore[assignment]
-                                                        first_listing.get("tokenMint") if isinstance(first_listing, dict) else None  # type: ignore[union-attr]
-                                                        or (first_listing.get("mint") if isinstance(first_listing, dict) else None)  # type: ignore[union-attr]
-                                                        or (first_listing.get("mintAddress") if isinstance(first_listing, dict) else None)  # type: ignore[union-attr]
-                                                        or (first_listing.get("token", {}).get("mintAddress") if isinstance(first_listing, dict) else None)  # type: ignore[union-attr]
-                                                        or (first_listing.get("mint_address") if isinstance(first_listing, dict) else None)  # type: ignore[union-attr]
-                                                    )
-                                                    if token_mint and isinstance(token_mint, str):  # type: ignore[redundant-expr, misc]
-                                                        collection_addr_found = await self._extract_collection_from_mint(token_mint)
-                                                        if collection_addr_found:
-                                                            logger.info(f"Resolved collection via Froggy.market + Helius: {collection_addr_found}")
-                                                            break
-                                    except Exception:
-                                        continue
-                            except Exception as froggy_err:
-                                logger.debug(f"Froggy.market API error: {froggy_err}")
+                    # Try multiple marketplaces: Magic Eden, Nintondo, Froggy.market (over the pooled Helius session)
+                    # 1. Try Magic Eden API
+                    if not collection_addr_found:
+                        try:
+                            me_listings_url = f"https://api-mainnet.magiceden.io/v2/collections/{collection_address}/listings?limit=1"
+                            async with self._session_request("GET", me_listings_url, timeout=aiohttp.ClientTimeout(total=10)) as resp:
+                                if resp.status == 200:
+                                    listings = await resp.json()
+                                    if listings and len(listings) > 0:
+                                        token_mint = listings[0].get("tokenMint") or listings[0].get("token", {}).get("mintAddress")
+                                        if token_mint:
+                                            collection_addr_found = await self._extract_collection_from_mint(token_mint)
+                                            if collection_addr_found:
+                                                logger.info(f"Resolved collection via Magic Eden + Helius: {collection_addr_found}")
+                        except Exception as me_err:
+                            logger.debug(f"Magic Eden API error: {me_err}")
+                    
+                    # 2. Try Nintondo (check if they have listings endpoint)
+                    if not collection_addr_found:
+                        try:
+                            # Nintondo may use similar structure - try common endpoints
+                            nintondo_urls = [
+                                f"https://api.nintondo.io/v1/collections/{collection_address}/listings?limit=1",
+                                f"https://nintondo.io/api/collections/{collection_address}/listings?limit=1",
+                            ]
+                            for nintondo_url in nintondo_urls:
+                                try:
+                                    async with self._session_request("GET", nintondo_url, timeout=aiohttp.ClientTimeout(total=10)) as resp:
+                                        if resp.status == 200:
+                                            data = await resp.json()
+                                            # Try to extract token mint from various response formats
+                                            listings: List[Any] = data if isinstance(data, list) else data.get("listings", []) or data.get("items", [])  # type: ignore[assignment]
+                                            if listings and len(listings) > 0:  # type: ignore[arg-type]
+                                                first_listing = listings[0]  # type: ignore[index]
+                                                token_mint: Optional[str] = (  # type: ignore[assignment]
+                                                    first_listing.get("tokenMint") if isinstance(first_listing, dict) else None  # type: ignore[union-attr]
+                                                    or (first_listing.get("mint") if isinstance(first_listing, dict) else None)  # type: ignore[union-attr]
+                                                    or (first_listing.get("mintAddress") if isinstance(first_listing, dict) else None)  # type: ignore[union-attr]
+                                                    or (first_listing.get("token", {}).get("mintAddress") if isinstance(first_listing, dict) else None)  # type: ignore[union-attr]
+                                                )
+                                                if token_mint and isinstance(token_mint, str):  # type: ignore[redundant-expr, misc]
+                                                    collection_addr_found = await self._extract_collection_from_mint(token_mint)
+                                                    if collection_addr_found:
+                                                        logger.info(f"Resolved collection via Nintondo + Helius: {collection_addr_found}")
+                                                        break
+                                except Exception:
+                                    continue
+                        except Exception as nintondo_err:
+                            logger.debug(f"Nintondo API error: {nintondo_err}")
+                    
+                    # 3. Try Froggy.market
+                    if not collection_addr_found:
+                        try:
+                            froggy_urls = [
+                                f"https://api.froggy.market/v1/collections/{collection_address}/listings?limit=1",
+                                f"https://froggy.market/api/collections/{collection_address}/listings?limit=1",
+                                f"https://api.froggy.market/collections/{collection_address}?limit=1",
+                            ]
+                            for froggy_url in froggy_urls:
+                                try:
+                                    async with self._session_request("GET", froggy_url, timeout=aiohttp.ClientTimeout(total=10)) as resp:
+                                        if resp.status == 200:
+                                            data = await resp.json()
+                                            listings: List[Any] = data if isinstance(data, list) else data.get("listings", []) or data.get("items", []) or data.get("nfts", [])  # type: ignore[assignment]
+                                            if listings and len(listings) > 0:  # type: ignore[arg-type]
+                                                first_listing = listings[0]  # type: ignore[index]
+                                                token_mint: Optional[str] = (  # type: ignore[assignment]
+                                                    first_listing.get("tokenMint") if isinstance(first_listing, dict) else None  # type: ignore[union-attr]
+                                                    or (first_listing.get("mint") if isinstance(first_listing, dict) else None)  # type: ignore[union-attr]
+                                                    or (first_listing.get("mintAddress") if isinstance(first_listing, dict) else None)  # type: ignore[union-attr]
+                                                    or (first_listing.get("token", {}).get("mintAddress") if isinstance(first_listing, dict) else None)  # type: ignore[union-attr]
+                                                    or (first_listing.get("mint_address") if isinstance(first_listing, dict) else None)  # type: ignore[union-attr]
+                                                )
+                                                if token_mint and isinstance(token_mint, str):  # type: ignore[redundant-expr, misc]
+                                                    collection_addr_found = await self._extract_collection_from_mint(token_mint)
+                                                    if collection_addr_found:
+                                                        logger.info(f"Resolved collection via Froggy.market + Helius: {collection_addr_found}")
+                                                        break
+                                except Exception:
+                                    continue
+                        except Exception as froggy_err:
+                            logger.debug(f"Froggy.market API error: {froggy_err}")
                     
                     # If Magic Eden API didn't work, try searching by name using Helius
                     if not collection_addr_found:
@@ -455,7 +456,7 @@ class HeliusClient(BaseAPIClient):
                             except Exception as search_err:
                                 logger.debug(f"Search failed for '{search_term}': {search_err}")
                                 continue
-                    
+                
                 except Exception as resolve_error:
                     logger.error(f"Error resolving collection symbol: {resolve_error}")
                 
@@ -465,8 +466,8 @@ class HeliusClient(BaseAPIClient):
                 
                 if collection_addr_found:
                     logger.info(f"Using resolved collection address: {collection_addr_found}")
-                    # Store resolved address for later use
-                    self._current_collection = collection_addr_found
+                    # Reported with the response so callers page the resolved address
+                    resolved_address = collection_addr_found
                     # Use RPC getAssetsByGroup instead of DAS API
                     try:
                         rpc_params = {
@@ -504,24 +505,21 @@ class HeliusClient(BaseAPIClient):
                             actual_total = None
                             logger.debug(f"Subsequent request (has cursor) -> actual_total = None")
                         
-                        # Store total for later retrieval (first request only)
+                        # Report the total with this response (first request only)
                         # IMPORTANT: Don't use total_returned when there's a cursor - it's just the page size, not the actual total
-                        if actual_total is not None and (not hasattr(self, '_collection_total') or self._collection_total is None):
-                            self._collection_total = actual_total
-                            self._last_total = actual_total
+                        if actual_total is not None:
+                            collection_total = actual_total
                             logger.info(f"Collection total determined (resolved): {actual_total}")
-                        elif not hasattr(self, '_collection_total') or self._collection_total is None:
+                        elif not cursor:
                             # Only use total_returned if there's NO cursor (meaning we got all items)
                             # If there's a cursor, total_returned is just the page size, not the real total
                             if total_returned > 0 and not page_cursor and len(items) < limit:
                                 # No cursor + got less than limit = this is the actual total
-                                self._collection_total = total_returned
-                                self._last_total = total_returned
+                                collection_total = total_returned
                                 logger.info(f"Collection total determined (no cursor, got all): {total_returned}")
                             elif total_returned > 0 and not page_cursor:
                                 # No cursor but got full page - total_returned might be accurate
-                                self._collection_total = total_returned
-                                self._last_total = total_returned
+                                collection_total = total_returned
                                 logger.info(f"Collection total estimate (no cursor, full page): {total_returned}")
                             else:
                                 # Has cursor = can't determine total from first page, need to paginate
@@ -559,29 +557,12 @@ class HeliusClient(BaseAPIClient):
             if 'has_more' not in locals():
                 has_more = page_cursor is not None
             
-            # Get total from stored value if available
-            collection_total = None
-            if hasattr(self, '_collection_total') and self._collection_total:
-                collection_total = self._collection_total
-            elif hasattr(self, '_last_total') and self._last_total:
-                collection_total = self._last_total
-            
             # Ensure items is a list
             if not isinstance(items, list):
                 items = []
             
-            # Enrich metadata for all NFTs
-            enriched_items: List[Dict[str, Any]] = []
-            for item in items:  # type: ignore[assignment, misc]
-                try:
-                    if isinstance(item, dict):
-                        enriched_item = await self._enrich_nft_metadata(item)  # type: ignore[arg-type, misc]
-                        enriched_items.append(enriched_item)  # type: ignore[arg-type, misc]
-                    else:
-                        enriched_items.append(item)  # type: ignore[arg-type, misc]
-                except Exception as enrich_err:
-                    logger.debug(f"Error enriching NFT metadata: {enrich_err}")
-                    enriched_items.append(item)  # type: ignore[arg-type, misc]  # Use original if enrichment fails
+            # Enrich metadata for all NFTs (batched getAssetBatch calls)
+            enriched_items = await self._enrich_nft_metadata_batch(items)  # type: ignore[arg-type]
             
             items_typed = cast(List[Any], enriched_items)  # type: ignore[assignment]
             
@@ -592,6 +573,7 @@ class HeliusClient(BaseAPIClient):
                 "totalCount": len(items_typed),  # Items in this response
                 "total": collection_total,  # Total collection size (from API)
                 "has_more": has_more,
+                "collection_address": resolved_address,
             }
         except Exception as e:
             logger.error(f"Helius get_collection_nfts error: {e}")
@@ -618,15 +600,36 @@ class HeliusClient(BaseAPIClient):
             logger.debug(f"Error extracting collection from mint {token_mint}: {token_err}")
         return None
     
+    @staticmethod
+    def _needs_enrichment(nft_item: Dict[str, Any]) -> bool:
+        """Check if an asset is missing metadata worth fetching"""
+        metadata = (nft_item.get("content") or {}).get("metadata") or {}
+        return not metadata or not metadata.get("name")
+    
+    @staticmethod
+    def _merge_enriched_metadata(nft_item: Dict[str, Any], asset_response: Dict[str, Any]) -> None:
+        """Merge a full asset response into an item, filling metadata gaps"""
+        content = nft_item.get("content", {})
+        metadata = content.get("metadata", {})
+        enriched_content = asset_response.get("content", {})
+        enriched_metadata = enriched_content.get("metadata", {})
+        
+        # Update metadata if we got better data
+        if enriched_metadata:
+            if not metadata:
+                nft_item["content"] = enriched_content
+            else:
+                # Merge metadata, preferring existing but filling gaps
+                for key, value in enriched_metadata.items():
+                    if not metadata.get(key) and value:
+                        metadata[key] = value
+                nft_item["content"]["metadata"] = metadata
+    
     async def _enrich_nft_metadata(self, nft_item: Dict[str, Any]) -> Dict[str, Any]:
         """Enrich NFT metadata if missing fields"""
         try:
-            # Check if metadata is already complete
-            content = nft_item.get("content", {})
-            metadata = content.get("metadata", {})
-            
             # If metadata is missing or incomplete, try to fetch it
-            if not metadata or not metadata.get("name"):
+            if self._needs_enrichment(nft_item):
                 asset_id = nft_item.get("id")
                 if asset_id:
                     try:
@@ -635,20 +638,7 @@ class HeliusClient(BaseAPIClient):
                         asset_response = await self._make_rpc_request("getAsset", [rpc_params])
                         
                         if isinstance(asset_response, dict):  # type: ignore[redundant-expr]
-                            # Merge the enriched data
-                            enriched_content = asset_response.get("content", {})
-                            enriched_metadata = enriched_content.get("metadata", {})
-                            
-                            # Update metadata if we got better data
-                            if enriched_metadata:
-                                if not metadata:
-                                    nft_item["content"] = enriched_content
-                                else:
-                                    # Merge metadata, preferring existing but filling gaps
-                                    for key, value in enriched_metadata.items():
-                                        if not metadata.get(key) and value:
-                                            metadata[key] = value
-                                    nft_item["content"]["metadata"] = metadata
+                            self._merge_enriched_metadata(nft_item, asset_response)
                     except Exception as enrich_err:
                         logger.debug(f"Error enriching metadata for {asset_id}: {enrich_err}")
             
@@ -657,6 +647,57 @@ class HeliusClient(BaseAPIClient):
             logger.debug(f"Error in _enrich_nft_metadata: {e}")
             return nft_item
     
+    async def _enrich_nft_metadata_batch(self, items: List[Any]) -> List[Any]:
+        """
+        Enrich a whole page of assets with as few round trips as possible
+        
+        Collects the IDs of every asset with missing metadata, fetches them with
+        getAssetBatch (up to ENRICH_BATCH_SIZE IDs per call, at most
+        enrich_concurrency calls in flight) and merges the results back in place.
+        Assets that cannot be enriched are returned unchanged.
+        """
+        pending: Dict[str, List[Dict[str, Any]]] = {}
+        for item in items:
+            if isinstance(item, dict) and item.get("id") and self._needs_enrichment(item):
+                pending.setdefault(item["id"], []).append(item)
+        
+        if not pending:
+            return items
+        
+        asset_ids = list(pending.keys())
+        batches = [
+            asset_ids[i:i + self.ENRICH_BATCH_SIZE]
+            for i in range(0, len(asset_ids), self.ENRICH_BATCH_SIZE)
+        ]
+        semaphore = asyncio.Semaphore(self.enrich_concurrency)
+        
+        async def fetch_batch(batch_ids: List[str]) -> List[Any]:
+            async with semaphore:
+                try:
+                    result = await self._make_rpc_request("getAssetBatch", {"ids": batch_ids})
+                except Exception as batch_err:
+                    logger.debug(f"Error enriching batch of {len(batch_ids)} assets: {batch_err}")
+                    return []
+                return result if isinstance(result, list) else []
+        
+        results = await asyncio.gather(*(fetch_batch(batch) for batch in batches))
+        
+        enriched = 0
+        for batch_result in results:
+            for asset in batch_result:
+                # getAssetBatch returns null for IDs it doesn't know
+                if not isinstance(asset, dict):
+                    continue
+                for nft_item in pending.get(asset.get("id"), []):
+                    try:
+                        self._merge_enriched_metadata(nft_item, asset)
+                        enriched += 1
+                    except Exception as merge_err:
+                        logger.debug(f"Error merging enriched metadata for {asset.get('id')}: {merge_err}")
+        
+        logger.debug(f"Enriched {enriched}/{len(asset_ids)} assets in {len(batches)} getAssetBatch call(s)")
+        return items
+    
     async def parse_transaction(
         self,
         transaction_signature: str,
@@ -0,0 +1,39 @@
+"""Rolling latency percentiles used to time hedged requests"""
+
+from collections import deque
+from typing import Deque, Dict, Any, Optional
+
+
+class LatencyTracker:
+    """Keeps the last `window` latencies of one operation and reports percentiles"""
+
+    def __init__(self, window: int = 200, min_samples: int = 10):
+        self.min_samples = min_samples
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Latency at the given percentile, or None until enough samples exist"""
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def hedge_delay(self, pct: float, default: float, floor: float = 0.1, ceiling: float = 10.0) -> float:
+        """How long to wait before hedging: the pct-th percentile, clamped"""
+        value = self.percentile(pct)
+        if value is None:
+            value = default
+        return min(ceiling, max(floor, value))
+
+    def get_stats(self) -> Dict[str, Any]:
+        p50 = self.percentile(50)
+        p95 = self.percentile(95)
+        return {
+            "samples": len(self._samples),
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+        }
@@ -3,12 +3,11 @@ Magic Eden API client for Solana collections
 Provides floor price, volume, sales, and collection metadata
 """
 
-import aiohttp
-import asyncio
 from typing import Dict, Any, Optional, List
 from loguru import logger
 
 from .base import BaseAPIClient
+from .session import SessionManager
 
 
 class MagicEdenClient(BaseAPIClient):
@@ -16,7 +15,9 @@ class MagicEdenClient(BaseAPIClient):
     
     BASE_URL = "https://api-mainnet.magiceden.io/v2"
     
-    def __init__(self, api_key: Optional[str] = None, rate_limit: float = 1.0):
+    provider_name = "magiceden"
+    
+    def __init__(self, api_key: Optional[str] = None, rate_limit: float = 1.0, session_manager: Optional[SessionManager] = None):
         # Magic Eden API keys (optional but recommended for higher limits)
         import os
         self.api_key = api_key or os.getenv("MAGICEDEN_API_KEY") or os.getenv("MAGICEDEN_PUBLIC_API_KEY")
@@ -31,9 +32,10 @@ class MagicEdenClient(BaseAPIClient):
         super().__init__(
             api_keys=[],
             base_url=self.BASE_URL,
-            rate_limit=int(rate_limit),
+            rate_limit=rate_limit,
             timeout=30,
             max_retries=3,
+            session_manager=session_manager,
         )
     
     async def _make_request(
@@ -44,7 +46,6 @@ class MagicEdenClient(BaseAPIClient):
         **kwargs
     ) -> Any:
         """Make request with Magic Eden API keys in headers"""
-        await self._apply_rate_limit()
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
         default_headers = {"Content-Type": "application/json"}
         
@@ -58,23 +59,13 @@ class MagicEdenClient(BaseAPIClient):
         if "headers" in kwargs:
             default_headers.update(kwargs["headers"])
         
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout)) as session:
-            async with session.request(
-                method=method,
-                url=url,
-                params=params,
-                json=kwargs.get("json_data"),
-                headers=default_headers,
-            ) as response:
-                if response.status == 429:
-                    await asyncio.sleep(5)
-                    raise aiohttp.ClientResponseError(
-                        request_info=response.request_info,
-                        history=response.history,
-                        status=response.status,
-                    )
-                response.raise_for_status()
-                return await response.json()
+        return await self._send(
+            method,
+            url,
+            params=params,
+            json_data=kwargs.get("json_data"),
+            headers=default_headers,
+        )
     
     async def get_collection_stats(self, collection_symbol: str) -> Dict[str, Any]:
         """
@@ -1,8 +1,6 @@
 """Moralis API client"""
 
 from typing import Dict, Any, Optional, List
-import asyncio
-import aiohttp
 from loguru import logger
 
 from .base import BaseAPIClient
@@ -11,6 +9,8 @@ from .base import BaseAPIClient
 class MoralisClient(BaseAPIClient):
     """Moralis API client"""
     
+    provider_name = "moralis"
+    
     CHAIN_MAP = {
         "ethereum": "eth",
         "polygon": "polygon",
@@ -29,10 +29,10 @@ class MoralisClient(BaseAPIClient):
         chain_lower = chain.lower()
         return self.CHAIN_MAP.get(chain_lower, chain_lower)
     
-    def _get_headers(self) -> Dict[str, str]:
+    def _get_headers(self, api_key: Optional[str] = None) -> Dict[str, str]:
         """Get request headers with API key"""
         return {
-            "X-API-Key": self.get_api_key(),
+            "X-API-Key": api_key or self.get_api_key(),
             "Accept": "application/json",
         }
     
@@ -44,17 +44,11 @@ class MoralisClient(BaseAPIClient):
     ) -> Dict[str, Any]:
         """Make Moralis API request"""
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
-        headers = self._get_headers()
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params, headers=headers) as response:
-                if response.status == 429:
-                    logger.warning("Moralis rate limited, rotating key")
-                    self.rotate_api_key()
-                    await asyncio.sleep(5)
-                
-                response.raise_for_status()
-                return await response.json()
+        def sign(api_key: Optional[str], url: str, headers: Dict[str, str]):
+            return url, self._get_headers(api_key)
+        
+        return await self._send(method, url, params=params, sign=sign)
     
     async def get_wallet_nfts(
         self,
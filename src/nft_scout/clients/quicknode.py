@@ -10,6 +10,8 @@ from .base import BaseAPIClient
 class QuickNodeClient(BaseAPIClient):
     """QuickNode API client (fallback)"""
     
+    provider_name = "quicknode"
+    
     def __init__(self, api_keys: List[str], **kwargs):
         base_url = "https://{chain}.quiknode.pro"
         super().__init__(api_keys, base_url, rate_limit=100, **kwargs)
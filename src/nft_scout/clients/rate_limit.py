@@ -0,0 +1,302 @@
+"""Token-bucket rate limiting and health tracking per API key"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Optional, Sequence, Tuple, Mapping
+
+# Longest cooldown we honour from a provider header
+MAX_COOLDOWN = 300.0
+
+# Headers providers use to say when a rate-limit window resets
+RESET_HEADERS = ("X-RateLimit-Reset", "RateLimit-Reset", "X-Rate-Limit-Reset")
+
+
+def mask_key(key: Optional[str]) -> str:
+    """Short, non-secret label for an API key (safe to log or expose in stats)"""
+    if not key:
+        return "anonymous"
+    if len(key) <= 8:
+        return f"{key[:2]}…"
+    return f"{key[:4]}…{key[-2:]}"
+
+
+def parse_retry_after(headers: Mapping[str, str], now: Optional[float] = None) -> Optional[float]:
+    """
+    Seconds to back off according to the response headers, if any
+
+    Understands `Retry-After` (seconds or HTTP date) and the common
+    `X-RateLimit-Reset` style headers (seconds, or a unix timestamp).
+    """
+    now = time.time() if now is None else now
+    value = headers.get("Retry-After")
+    if value:
+        try:
+            return min(MAX_COOLDOWN, max(0.0, float(value)))
+        except ValueError:
+            try:
+                return min(MAX_COOLDOWN, max(0.0, parsedate_to_datetime(value).timestamp() - now))
+            except (TypeError, ValueError):
+                pass
+    for name in RESET_HEADERS:
+        value = headers.get(name)
+        if not value:
+            continue
+        try:
+            reset = float(value)
+        except ValueError:
+            continue
+        # Large values are absolute timestamps (seconds or milliseconds)
+        if reset > 1e12:
+            reset = reset / 1000.0 - now
+        elif reset > 1e9:
+            reset = reset - now
+        return min(MAX_COOLDOWN, max(0.0, reset))
+    return None
+
+
+@dataclass
+class KeyHealth:
+    """
+    Health of one API key
+
+    A rate-limited key is put on cooldown for as long as the provider asked.
+    Repeated failures (or a rejected key) open its circuit, taking it out of
+    rotation for a growing period. `weight` drops on every 429 and slowly
+    recovers on success, so keys that keep hitting their quota get less
+    traffic than keys that don't.
+    """
+    cooldown_until: float = 0.0
+    circuit_open_until: float = 0.0
+    consecutive_failures: int = 0
+    circuit_opens: int = 0
+    weight: float = 1.0
+    successes: int = 0
+    failures: int = 0
+    rate_limited: int = 0
+
+    def is_cooling(self, now: float) -> bool:
+        return now < self.cooldown_until
+
+    def is_open(self, now: float) -> bool:
+        return now < self.circuit_open_until
+
+    def state(self, now: float) -> str:
+        if self.is_open(now):
+            return "open"
+        if self.is_cooling(now):
+            return "cooling"
+        return "healthy"
+
+
+class TokenBucket:
+    """
+    Classic token bucket: `rate` tokens per second, holding at most `burst`
+
+    Tokens are reserved synchronously, so a bucket may go negative; the deficit
+    is the time the caller has to wait before its slot opens. Concurrent callers
+    therefore queue up evenly spaced behind each other instead of all sleeping
+    the same interval and firing together.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1.0, rate))
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        # Metrics
+        self.acquired = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+            self.updated = now
+
+    def available(self, now: Optional[float] = None) -> float:
+        """Tokens available right now (negative while callers are queued)"""
+        self._refill(time.monotonic() if now is None else now)
+        return self.tokens
+
+    def reserve(self, now: Optional[float] = None) -> float:
+        """Take one token and return how long the caller must wait for it"""
+        self._refill(time.monotonic() if now is None else now)
+        self.tokens -= 1.0
+        wait = max(0.0, -self.tokens / self.rate)
+        self.acquired += 1
+        if wait > 0:
+            self.throttled += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+        return wait
+
+
+class KeyedRateLimiter:
+    """
+    One token bucket per API key of a provider
+
+    Each key has its own quota, so each gets its own bucket and the aggregate
+    throughput grows with the number of configured keys. `acquire` hands out
+    the key whose bucket has the most tokens left, which spreads load across
+    keys and only makes a caller wait when every key is exhausted.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        failure_threshold: int = 3,
+        circuit_reset: float = 30.0,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.failure_threshold = failure_threshold
+        self.circuit_reset = circuit_reset
+        self._buckets: Dict[Optional[str], TokenBucket] = {}
+        self._health: Dict[Optional[str], KeyHealth] = {}
+
+    def bucket(self, key: Optional[str]) -> TokenBucket:
+        """Get (or create) the bucket for a key"""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(self.rate, self.burst)
+            self._buckets[key] = bucket
+        return bucket
+
+    def health(self, key: Optional[str]) -> KeyHealth:
+        """Get (or create) the health record for a key"""
+        health = self._health.get(key)
+        if health is None:
+            health = KeyHealth()
+            self._health[key] = health
+        return health
+
+    def reserve(self, keys: Sequence[Optional[str]], start: int = 0) -> Tuple[Optional[str], float]:
+        """
+        Pick the best key and reserve a token on it
+
+        Healthy keys are ranked by available tokens scaled by their weight.
+        Keys are scanned starting at `start`, so ties go to the client's
+        current key. When every key is cooling down, the one that recovers
+        first is used and the wait includes its remaining cooldown. Keys with
+        an open circuit are only used when nothing else is left.
+        """
+        candidates = list(keys) or [None]
+        ordered = [candidates[(start + offset) % len(candidates)] for offset in range(len(candidates))]
+        now = time.monotonic()
+
+        healthy = [
+            key for key in ordered
+            if not self.health(key).is_open(now) and not self.health(key).is_cooling(now)
+        ]
+        delay = 0.0
+        if healthy:
+            best_key = None
+            best_score = None
+            for key in healthy:
+                tokens = self.bucket(key).available(now)
+                score = tokens * self.health(key).weight if tokens > 0 else tokens
+                if best_score is None or score > best_score:
+                    best_key, best_score = key, score
+        else:
+            closed = [key for key in ordered if not self.health(key).is_open(now)]
+            if closed:
+                best_key = min(closed, key=lambda key: self.health(key).cooldown_until)
+                delay = max(0.0, self.health(best_key).cooldown_until - now)
+            else:
+                best_key = min(ordered, key=lambda key: self.health(key).circuit_open_until)
+        return best_key, max(delay, self.bucket(best_key).reserve(now))
+
+    def record_success(self, key: Optional[str]) -> None:
+        """The key served a request"""
+        health = self.health(key)
+        health.successes += 1
+        health.consecutive_failures = 0
+        health.circuit_opens = 0
+        health.weight = min(1.0, health.weight + 0.05)
+
+    def record_rate_limited(self, key: Optional[str], retry_after: Optional[float] = None) -> None:
+        """The provider answered 429 for this key"""
+        health = self.health(key)
+        health.rate_limited += 1
+        health.weight = max(0.1, health.weight / 2)
+        cooldown = retry_after if retry_after is not None else min(MAX_COOLDOWN, 2.0 ** health.consecutive_failures)
+        health.cooldown_until = max(health.cooldown_until, time.monotonic() + cooldown)
+        self._record_failure(health)
+
+    def record_failure(self, key: Optional[str]) -> None:
+        """The request failed for a reason that may be the key's fault"""
+        self._record_failure(self.health(key))
+
+    def record_rejected(self, key: Optional[str]) -> None:
+        """The provider rejected the key outright (invalid or exhausted)"""
+        health = self.health(key)
+        health.consecutive_failures = max(health.consecutive_failures, self.failure_threshold - 1)
+        self._record_failure(health)
+
+    def _record_failure(self, health: KeyHealth) -> None:
+        health.failures += 1
+        health.consecutive_failures += 1
+        if health.consecutive_failures >= self.failure_threshold:
+            health.circuit_opens += 1
+            period = min(MAX_COOLDOWN, self.circuit_reset * 2 ** (health.circuit_opens - 1))
+            health.circuit_open_until = time.monotonic() + period
+            # Half-open after the period: one more failure re-opens it
+            health.consecutive_failures = self.failure_threshold - 1
+
+    def healthy_keys(self, keys: Sequence[Optional[str]]) -> int:
+        """How many of the keys are currently usable without waiting"""
+        now = time.monotonic()
+        return sum(
+            1 for key in (list(keys) or [None])
+            if not self.health(key).is_open(now) and not self.health(key).is_cooling(now)
+        )
+
+    async def acquire(self, keys: Sequence[Optional[str]], start: int = 0) -> Optional[str]:
+        """Wait for a request slot and return the key it was granted on"""
+        key, wait = self.reserve(keys, start)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return key
+
+    def get_stats(self, keys: Sequence[Optional[str]] = ()) -> Dict[str, Dict[str, Any]]:
+        """
+        Tokens available and wait time per key
+        
+        Keys are labelled "<index>:<masked key>" so keys with the same mask
+        stay apart. The index is the key's position in `keys` (the client's
+        configured keys); keys not in it are numbered after them, in the
+        order they were first used.
+        """
+        now = time.monotonic()
+        positions = {key: i for i, key in reversed(list(enumerate(keys)))}
+        unlisted = len(keys)
+        report: Dict[str, Dict[str, Any]] = {}
+        for key, bucket in self._buckets.items():
+            if key not in positions:
+                positions[key] = unlisted
+                unlisted += 1
+            health = self.health(key)
+            report[f"{positions[key]}:{mask_key(key)}"] = {
+                "state": health.state(now),
+                "weight": round(health.weight, 3),
+                "cooldown_remaining_s": round(max(0.0, health.cooldown_until - now), 2),
+                "successes": health.successes,
+                "failures": health.failures,
+                "rate_limited": health.rate_limited,
+                "rate": bucket.rate,
+                "burst": bucket.burst,
+                "tokens_available": round(bucket.available(now), 2),
+                "acquired": bucket.acquired,
+                "throttled": bucket.throttled,
+                "total_wait_s": round(bucket.total_wait, 3),
+                "avg_wait_ms": round(bucket.total_wait / bucket.acquired * 1000, 2) if bucket.acquired else 0.0,
+                "max_wait_ms": round(bucket.max_wait * 1000, 2),
+            }
+        return report
@@ -4,11 +4,11 @@ Provides floor price, volume, sales, owners, and collection metadata
 Supports: Ethereum, Polygon, Arbitrum, Optimism, Base, Zora, etc.
 """
 
-import aiohttp
 from typing import Dict, Any, Optional
 from loguru import logger
 
 from .base import BaseAPIClient
+from .session import SessionManager
 
 
 class ReservoirClient(BaseAPIClient):
@@ -16,6 +16,8 @@ class ReservoirClient(BaseAPIClient):
     
     BASE_URL = "https://api.reservoir.tools/v4"
     
+    provider_name = "reservoir"
+    
     # Chain name mapping
     CHAIN_MAPPING = {
         "ethereum": "ethereum",
@@ -26,22 +28,24 @@ class ReservoirClient(BaseAPIClient):
         "zora": "zora",
     }
     
-    def __init__(self, api_key: Optional[str] = None, rate_limit: float = 1.0):
+    def __init__(self, api_key: Optional[str] = None, rate_limit: float = 1.0, session_manager: Optional[SessionManager] = None):
         """
         Initialize Reservoir client
         
         Args:
             api_key: Optional API key for higher rate limits (free tier available)
             rate_limit: Requests per second
+            session_manager: Shared connection pool (a private one is created if omitted)
         """
         # Convert API key to list format expected by base client
         api_keys = [api_key] if api_key else []
         super().__init__(
             api_keys=api_keys,
             base_url=self.BASE_URL,
-            rate_limit=int(rate_limit),
+            rate_limit=rate_limit,
             timeout=30,
             max_retries=3,
+            session_manager=session_manager,
         )
         self.api_key = api_key
     
@@ -0,0 +1,176 @@
+"""Shared, pooled HTTP sessions for API clients"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Dict, Any, AsyncIterator, List, Tuple
+import aiohttp
+from loguru import logger
+
+
+@dataclass
+class PoolStats:
+    """Connection pool counters for a single provider"""
+    requests: int = 0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    connections_created: int = 0
+    connections_reused: int = 0
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Share of requests served over an already-open connection"""
+        total = self.connections_created + self.connections_reused
+        if not total:
+            return 0.0
+        return self.connections_reused / total
+
+
+class SessionManager:
+    """
+    Owns one long-lived aiohttp session per provider
+
+    Every provider gets its own TCPConnector so a slow marketplace cannot starve
+    the connection pool of another provider. Sessions are created lazily on the
+    running event loop and reused for every request, so keep-alive connections
+    and the DNS cache survive between pages of a scrape.
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 20,
+        dns_cache_ttl: int = 300,
+        keepalive_timeout: float = 30.0,
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+        self._session_loops: Dict[str, asyncio.AbstractEventLoop] = {}
+        self._stats: Dict[str, PoolStats] = {}
+        # Replaced sessions of other event loops, closed on the next request or close()
+        self._stale: List[Tuple[str, aiohttp.ClientSession, asyncio.AbstractEventLoop]] = []
+
+    def _get_stats(self, provider: str) -> PoolStats:
+        """Get (or create) the counters for a provider"""
+        stats = self._stats.get(provider)
+        if stats is None:
+            stats = PoolStats()
+            self._stats[provider] = stats
+        return stats
+
+    def _build_trace_config(self, stats: PoolStats) -> aiohttp.TraceConfig:
+        """Trace hooks that count new vs reused connections"""
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_connection_create_end(session, context, params):
+            stats.connections_created += 1
+
+        async def on_connection_reuseconn(session, context, params):
+            stats.connections_reused += 1
+
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace_config
+
+    def get_session(self, provider: str) -> aiohttp.ClientSession:
+        """Get the shared session for a provider, creating it on first use"""
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(provider)
+        if session is not None and not session.closed and self._session_loops.get(provider) is loop:
+            return session
+        if session is not None and not session.closed:
+            # Opened on an event loop that is no longer ours (e.g. a previous asyncio.run)
+            self._stale.append((provider, session, self._session_loops[provider]))
+
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            ttl_dns_cache=self.dns_cache_ttl,
+            keepalive_timeout=self.keepalive_timeout,
+        )
+        session = aiohttp.ClientSession(
+            connector=connector,
+            trace_configs=[self._build_trace_config(self._get_stats(provider))],
+        )
+        self._sessions[provider] = session
+        self._session_loops[provider] = loop
+        logger.debug(f"Opened pooled HTTP session for {provider} (limit={self.limit}, per_host={self.limit_per_host})")
+        return session
+
+    async def _close_stale(self) -> None:
+        """Close sessions that were replaced because they belonged to another event loop"""
+        stale, self._stale = self._stale, []
+        for provider, session, loop in stale:
+            if session.closed:
+                continue
+            try:
+                if loop.is_running():
+                    # Still alive in another thread: close it on its own loop
+                    asyncio.run_coroutine_threadsafe(session.close(), loop)
+                else:
+                    # Its loop is gone: aiohttp marks the connector closed and drops the connections
+                    await session.close()
+            except Exception as e:
+                logger.debug(f"Error closing stale {provider} session: {e}")
+            else:
+                logger.debug(f"Closed stale pooled HTTP session for {provider}")
+
+    @asynccontextmanager
+    async def request(
+        self,
+        provider: str,
+        method: str,
+        url: str,
+        **kwargs: Any,
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Issue a request on the provider's pooled session"""
+        session = self.get_session(provider)
+        if self._stale:
+            await self._close_stale()
+        stats = self._get_stats(provider)
+        stats.requests += 1
+        stats.in_flight += 1
+        stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+        try:
+            async with session.request(method, url, **kwargs) as response:
+                yield response
+        finally:
+            stats.in_flight -= 1
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Pool occupancy and connection reuse per provider"""
+        report: Dict[str, Dict[str, Any]] = {}
+        for provider, stats in self._stats.items():
+            session = self._sessions.get(provider)
+            report[provider] = {
+                "open": bool(session and not session.closed),
+                "requests": stats.requests,
+                "in_flight": stats.in_flight,
+                "peak_in_flight": stats.peak_in_flight,
+                "pool_limit": self.limit,
+                "pool_limit_per_host": self.limit_per_host,
+                "pool_occupancy": round(stats.in_flight / self.limit, 3) if self.limit else 0.0,
+                "connections_created": stats.connections_created,
+                "connections_reused": stats.connections_reused,
+                "reuse_ratio": round(stats.reuse_ratio, 3),
+            }
+        return report
+
+    async def close(self) -> None:
+        """Close every pooled session"""
+        await self._close_stale()
+        sessions = list(self._sessions.items())
+        self._sessions.clear()
+        self._session_loops.clear()
+        for provider, session in sessions:
+            if session.closed:
+                continue
+            try:
+                await session.close()
+            except Exception as e:
+                logger.debug(f"Error closing {provider} session: {e}")
+        if sessions:
+            logger.debug(f"Closed {len(sessions)} pooled HTTP sessions")
@@ -0,0 +1,178 @@
+"""
+Compact in-memory representation of NormalizedNFT for large collections
+
+Used by the page cache, which holds many pages at once. Scrape loops and CLI
+dumps stream page by page with bounded memory, so they keep the models.
+"""
+
+import sys
+from typing import Any, Dict, Optional, Tuple
+
+from .models import NormalizedNFT
+from .normalizer import build_trusted_nft
+from .storage.codecs import get_codec
+
+# Raw metadata is kept as encoded bytes (compressed when large) and only
+# decoded when someone asks for it
+_RAW_CODEC = get_codec("auto", compression="zlib", compress_threshold=512)
+
+# Rarely set fields live in one dict instead of a slot each
+_EXTRA_FIELDS = (
+    "owner_ens", "collection_slug", "floor_price", "last_sale_price", "last_sale_currency",
+    "minted_at", "last_transferred_at", "rarity_rank", "rarity_score", "metadata_cached",
+    "metadata_cache_date",
+)
+
+# Trait tuples shared between NFTs, like sys.intern for strings
+_TRAITS: Dict[Tuple[Any, ...], Tuple[Any, ...]] = {}
+_TRAITS_MAX = 100000
+
+TraitTuple = Tuple[str, Any, Optional[str]]
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _intern_trait(trait_type: str, value: Any, display_type: Optional[str]) -> TraitTuple:
+    # type(value) keeps 1, 1.0, True and "1" apart
+    key = (trait_type, value, type(value), display_type)
+    trait = _TRAITS.get(key)
+    if trait is None:
+        if len(_TRAITS) >= _TRAITS_MAX:
+            _TRAITS.clear()
+        trait = (_intern(trait_type), _intern(value), _intern(display_type))
+        _TRAITS[key] = trait
+    return trait
+
+
+class CompactNFT:
+    """
+    Slotted, interned form of a NormalizedNFT
+    
+    Strings that repeat across a collection (contract, chain, collection
+    name, token standard, trait types and values) are interned, traits are
+    shared tuples, URLs are plain strings and the rarely-set fields share
+    one dict. raw_metadata is opt-in: when kept it is stored encoded and
+    decoded on access. to_nft() gives the Pydantic model back (validated
+    again); to_trusted_nft() skips that for NFTs compacted from models.
+    """
+    
+    __slots__ = (
+        "token_id", "contract_address", "chain", "name", "description",
+        "image_url", "animation_url", "external_url", "owner_address",
+        "collection_name", "collection_verified", "token_standard",
+        "traits", "extra", "_raw",
+    )
+    
+    def __init__(
+        self,
+        token_id: str,
+        contract_address: str,
+        chain: str,
+        name: Optional[str] = None,
+        description: Optional[str] = None,
+        image_url: Optional[str] = None,
+        animation_url: Optional[str] = None,
+        external_url: Optional[str] = None,
+        owner_address: Optional[str] = None,
+        collection_name: Optional[str] = None,
+        collection_verified: bool = False,
+        token_standard: Optional[str] = None,
+        traits: Tuple[TraitTuple, ...] = (),
+        extra: Optional[Dict[str, Any]] = None,
+        raw: Optional[bytes] = None,
+    ):
+        self.token_id = token_id
+        self.contract_address = _intern(contract_address)
+        self.chain = _intern(chain)
+        self.name = name
+        self.description = description
+        self.image_url = image_url
+        self.animation_url = animation_url
+        self.external_url = external_url
+        self.owner_address = owner_address
+        self.collection_name = _intern(collection_name)
+        self.collection_verified = collection_verified
+        self.token_standard = _intern(token_standard)
+        self.traits = traits
+        self.extra = extra
+        self._raw = raw
+    
+    @classmethod
+    def from_nft(cls, nft: NormalizedNFT, keep_raw: bool = False) -> "CompactNFT":
+        """Compact a NormalizedNFT (raw_metadata is dropped unless `keep_raw`)"""
+        data = nft.__dict__
+        extra = {
+            name: data[name] for name in _EXTRA_FIELDS
+            if data.get(name) is not None and not (name == "metadata_cached" and data[name] is False)
+        }
+        raw = None
+        if keep_raw and nft.raw_metadata is not None:
+            raw = _RAW_CODEC.encode(nft.raw_metadata)
+        return cls(
+            token_id=nft.token_id,
+            contract_address=nft.contract_address,
+            chain=getattr(nft.chain, "value", nft.chain),
+            name=nft.name,
+            description=nft.description,
+            image_url=str(nft.image_url) if nft.image_url else None,
+            animation_url=str(nft.animation_url) if nft.animation_url else None,
+            external_url=str(nft.external_url) if nft.external_url else None,
+            owner_address=nft.owner_address,
+            collection_name=nft.collection_name,
+            collection_verified=nft.collection_verified,
+            token_standard=nft.token_standard,
+            traits=tuple(
+                _intern_trait(trait.trait_type, trait.value, trait.display_type)
+                for trait in nft.attributes
+            ),
+            extra=extra or None,
+            raw=raw,
+        )
+    
+    @property
+    def raw_metadata(self) -> Optional[Dict[str, Any]]:
+        """Raw provider metadata, decoded on access (None if it wasn't kept)"""
+        return _RAW_CODEC.decode(self._raw) if self._raw is not None else None
+    
+    @property
+    def has_raw_metadata(self) -> bool:
+        return self._raw is not None
+    
+    def to_dict(self, include_raw_metadata: bool = True) -> Dict[str, Any]:
+        """Plain dict with NormalizedNFT's fields (JSON-compatible apart from datetimes)"""
+        data = {
+            "token_id": self.token_id,
+            "contract_address": self.contract_address,
+            "chain": self.chain,
+            "name": self.name,
+            "description": self.description,
+            "image_url": self.image_url,
+            "animation_url": self.animation_url,
+            "external_url": self.external_url,
+            "owner_address": self.owner_address,
+            "attributes": [
+                {"trait_type": trait_type, "value": value, "display_type": display_type}
+                for trait_type, value, display_type in self.traits
+            ],
+            "collection_name": self.collection_name,
+            "collection_verified": self.collection_verified,
+            "token_standard": self.token_standard,
+        }
+        if self.extra:
+            data.update(self.extra)
+        if include_raw_metadata:
+            data["raw_metadata"] = self.raw_metadata
+        return data
+    
+    def to_nft(self, include_raw_metadata: bool = True) -> NormalizedNFT:
+        """The Pydantic model (validated again, so only call it when needed)"""
+        return NormalizedNFT(**self.to_dict(include_raw_metadata))
+    
+    def to_trusted_nft(self, include_raw_metadata: bool = True) -> NormalizedNFT:
+        """The Pydantic model without validating it again (the model it was compacted from was)"""
+        return build_trusted_nft(self.to_dict(include_raw_metadata))
+    
+    def __repr__(self) -> str:
+        return f"CompactNFT({self.chain}:{self.contract_address}:{self.token_id})"
@@ -12,6 +12,9 @@ from dotenv import load_dotenv
 env_path = Path(__file__).parent.parent.parent / ".env"
 load_dotenv(env_path)
 
+# Fixed per-user data dir, so the store does not depend on where the app is started from
+DEFAULT_COLLECTION_STORE_PATH = str(Path.home() / ".nft_scout" / "collections.db")
+
 
 @dataclass
 class APIConfig:
@@ -45,8 +48,42 @@ class Config:
     
     # Cache settings
     cache_ttl: int = 900  # 15 minutes
-    cache_type: str = "memory"  # "memory" or "redis"
+    stats_soft_ttl: int = 60  # collection stats older than this are refreshed in the background
+    stats_hard_ttl: int = 3600  # ...and older than this are not served at all
+    stats_metadata_ttl: int = 6 * 3600  # per-source cache: names, descriptions, socials, images
+    stats_market_ttl: int = 60  # per-source cache: floor price, volume, sales
+    page_cache_ttl: int = 900  # normalized collection pages, keyed by provider/chain/collection/cursor/page size
+    page_cache_raw_metadata: bool = False  # keep raw provider metadata in cached pages (GET /api/nfts/... has it anyway)
+    collection_store_enabled: bool = True  # keep scraped collections on disk and resync incrementally
+    collection_store_path: str = DEFAULT_COLLECTION_STORE_PATH
+    collection_resync_age: int = 24 * 3600  # a stored collection last walked in full longer ago is walked again (0 = never)
+    fast_normalizer: bool = True  # build NFT models without re-validating fields the normalizer already typed
+    normalize_workers: int = 0  # processes for normalizing large pages off the event loop (0 = inline)
+    normalize_pool_threshold: int = 500  # pages with fewer NFTs are always normalized inline
+    normalize_chunk_size: int = 500  # NFTs per process pool task
+    ws_batch_size: int = 100  # NFTs per WebSocket frame during a scrape
+    ws_batch_interval: float = 0.1  # seconds; a partial batch is sent after this long
+    ws_status_rate: float = 4.0  # status/progress messages per second (extra ones are coalesced)
+    scrape_max_jobs: int = 2  # collection scrapes running at once (web UI); more are queued
+    scrape_job_buffer: int = 50000  # events (NFTs and messages) a job keeps for clients that reattach
+    scrape_job_replay: int = 200000  # NFTs past the buffer a job can still replay from the collection store
+    scrape_job_retention: int = 3600  # seconds a finished job stays available
+    scrape_checkpoint_interval: float = 5.0  # seconds between job checkpoints (pages are committed as they arrive)
+    scrape_auto_resume: bool = False  # resume scrapes interrupted by a restart as soon as the server is up
+    cache_type: str = "memory"  # "memory", "redis" or "tiered" (memory L1 in front of Redis)
+    cache_max_bytes: int = 256 * 1024 * 1024  # approximate memory budget of the in-memory cache
+    cache_max_entries: int = 10000
     redis_url: Optional[str] = None
+    redis_max_connections: int = 50
+    cache_codec: str = "auto"  # "auto", "orjson", "msgpack" or "json" (Redis values)
+    cache_compression: str = "zlib"  # "zlib", "zstd" or "none"
+    cache_compress_threshold: int = 16384  # bytes; smaller values are stored uncompressed
+    
+    # L1 of the tiered cache
+    l1_cache_ttl: int = 30  # seconds a Redis value may be served from process memory
+    l1_cache_max_bytes: int = 32 * 1024 * 1024
+    l1_cache_max_entries: int = 2000
+    cache_invalidation: bool = True  # publish set/delete on Redis pub/sub so other workers drop their L1 copy
     
     # Webhook settings
     webhook_secret: Optional[str] = None
@@ -57,6 +94,18 @@ class Config:
     timeout: int = 30
     batch_size: int = 100
     max_workers: int = 10  # Maximum concurrent workers for parallel API calls
+    enrich_concurrency: int = 4  # Concurrent Helius getAssetBatch calls per page
+    
+    # HTTP connection pool settings (one pool per provider)
+    http_pool_limit: int = 100  # Total connections per provider
+    http_pool_limit_per_host: int = 20  # Connections per host within a provider
+    http_dns_cache_ttl: int = 300  # seconds
+    http_keepalive_timeout: float = 30.0  # seconds an idle connection is kept open
+    
+    # Hedged EVM collection pages (Alchemy first, Moralis if Alchemy is slow); opt-in, it spends Moralis quota
+    hedge_requests: bool = False
+    hedge_percentile: float = 95.0  # Alchemy latency percentile used as the hedge deadline
+    hedge_default_delay: float = 2.0  # seconds, used until enough latency samples exist
     
     @classmethod
     def from_env(cls) -> "Config":
@@ -77,14 +126,54 @@ class Config:
             helius_rpc_url=os.getenv("HELIUS_RPC_URL", "https://mainnet.helius-rpc.com"),
             quicknode_rpc_url=os.getenv("QUICKNODE_RPC_URL"),
             redis_url=os.getenv("REDIS_URL"),
+            redis_max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", "50")),
+            cache_codec=os.getenv("CACHE_CODEC", "auto"),
+            cache_compression=os.getenv("CACHE_COMPRESSION", "zlib"),
+            cache_compress_threshold=int(os.getenv("CACHE_COMPRESS_THRESHOLD", "16384")),
+            l1_cache_ttl=int(os.getenv("L1_CACHE_TTL", "30")),
+            l1_cache_max_bytes=int(os.getenv("L1_CACHE_MAX_BYTES", str(32 * 1024 * 1024))),
+            l1_cache_max_entries=int(os.getenv("L1_CACHE_MAX_ENTRIES", "2000")),
+            cache_invalidation=os.getenv("CACHE_INVALIDATION", "true").lower() in ("1", "true", "yes"),
             webhook_secret=os.getenv("WEBHOOK_SECRET"),
             webhook_port=int(os.getenv("WEBHOOK_PORT", "8000")),
             cache_ttl=int(os.getenv("CACHE_TTL", "900")),
+            stats_soft_ttl=int(os.getenv("STATS_SOFT_TTL", "60")),
+            stats_hard_ttl=int(os.getenv("STATS_HARD_TTL", "3600")),
+            stats_metadata_ttl=int(os.getenv("STATS_METADATA_TTL", str(6 * 3600))),
+            stats_market_ttl=int(os.getenv("STATS_MARKET_TTL", "60")),
+            page_cache_ttl=int(os.getenv("PAGE_CACHE_TTL", "900")),
+            page_cache_raw_metadata=os.getenv("PAGE_CACHE_RAW_METADATA", "false").lower() in ("1", "true", "yes"),
+            collection_store_enabled=os.getenv("COLLECTION_STORE", "true").lower() in ("1", "true", "yes"),
+            collection_store_path=os.path.expanduser(os.getenv("COLLECTION_STORE_PATH", DEFAULT_COLLECTION_STORE_PATH)),
+            collection_resync_age=int(os.getenv("COLLECTION_RESYNC_AGE", str(24 * 3600))),
+            fast_normalizer=os.getenv("FAST_NORMALIZER", "true").lower() in ("1", "true", "yes"),
+            normalize_workers=int(os.getenv("NORMALIZE_WORKERS", "0")),
+            normalize_pool_threshold=int(os.getenv("NORMALIZE_POOL_THRESHOLD", "500")),
+            normalize_chunk_size=int(os.getenv("NORMALIZE_CHUNK_SIZE", "500")),
+            ws_batch_size=int(os.getenv("WS_BATCH_SIZE", "100")),
+            ws_batch_interval=float(os.getenv("WS_BATCH_INTERVAL", "0.1")),
+            ws_status_rate=float(os.getenv("WS_STATUS_RATE", "4")),
+            scrape_max_jobs=int(os.getenv("SCRAPE_MAX_JOBS", "2")),
+            scrape_job_buffer=int(os.getenv("SCRAPE_JOB_BUFFER", "50000")),
+            scrape_job_replay=int(os.getenv("SCRAPE_JOB_REPLAY", "200000")),
+            scrape_job_retention=int(os.getenv("SCRAPE_JOB_RETENTION", "3600")),
+            scrape_checkpoint_interval=float(os.getenv("SCRAPE_CHECKPOINT_INTERVAL", "5")),
+            scrape_auto_resume=os.getenv("SCRAPE_AUTO_RESUME", "false").lower() in ("1", "true", "yes"),
             cache_type=os.getenv("CACHE_TYPE", "memory"),
+            cache_max_bytes=int(os.getenv("CACHE_MAX_BYTES", str(256 * 1024 * 1024))),
+            cache_max_entries=int(os.getenv("CACHE_MAX_ENTRIES", "10000")),
             max_retries=int(os.getenv("MAX_RETRIES", "3")),
             timeout=int(os.getenv("TIMEOUT", "30")),
             batch_size=int(os.getenv("BATCH_SIZE", "100")),
             max_workers=int(os.getenv("MAX_WORKERS", "10")),
+            enrich_concurrency=int(os.getenv("ENRICH_CONCURRENCY", "4")),
+            http_pool_limit=int(os.getenv("HTTP_POOL_LIMIT", "100")),
+            http_pool_limit_per_host=int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "20")),
+            http_dns_cache_ttl=int(os.getenv("HTTP_DNS_CACHE_TTL", "300")),
+            http_keepalive_timeout=float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30")),
+            hedge_requests=os.getenv("HEDGE_REQUESTS", "false").lower() in ("1", "true", "yes"),
+            hedge_percentile=float(os.getenv("HEDGE_PERCENTILE", "95")),
+            hedge_default_delay=float(os.getenv("HEDGE_DEFAULT_DELAY", "2.0")),
         )
     
     def get_alchemy_config(self) -> APIConfig:
@@ -0,0 +1,166 @@
+"""
+Batched, coalesced delivery of scrape results to a WebSocket client
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from loguru import logger
+
+from .storage.codecs import get_codec
+
+# Serializer only (no compression header): frames are plain JSON text
+_CODEC = get_codec("auto")
+
+# Message types that only matter in their latest form
+COALESCED_TYPES = ("status", "progress")
+
+
+def encode_message(message: Dict[str, Any]) -> str:
+    """JSON text of a message (orjson when installed; models, URLs and datetimes are handled)"""
+    return _CODEC.serialize(message).decode("utf-8")
+
+
+class BatchedSender:
+    """
+    Sends NFTs in batches and rate-limits status/progress messages
+    
+    NFTs are buffered and sent as one `nft_batch` frame every `batch_size`
+    items or `max_delay` seconds, whichever comes first, so a page of 1000
+    NFTs costs ten frames instead of a thousand. `status` and `progress`
+    messages are coalesced: at most `status_rate` of each type per second
+    go out, and an interval that saw several only sends the latest.
+    Everything else goes through send() in order (buffered NFTs and pending
+    statuses are flushed first). Each frame is serialized once and handed to
+    `send_text`; call close() at the end to flush what is left.
+    """
+    
+    def __init__(
+        self,
+        send_text: Callable[[str], Awaitable[Any]],
+        batch_size: int = 100,
+        max_delay: float = 0.1,
+        status_rate: float = 4.0,
+    ):
+        self._send_text = send_text
+        self.batch_size = max(1, batch_size)
+        self.max_delay = max_delay
+        self.status_interval = 1.0 / status_rate if status_rate > 0 else 0.0
+        self._nfts: List[Any] = []
+        self._batch_fields: Dict[str, Any] = {}
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._last_sent: Dict[str, float] = {}
+        self._lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+        self._closed = False
+        self.stats = {"frames": 0, "nfts": 0, "batches": 0, "coalesced": 0}
+    
+    async def add_nft(self, nft: Any, **fields: Any) -> None:
+        """
+        Queue an NFT (a dict or a model) for the next batch
+        
+        `fields` (e.g. total_scraped, api_source) are sent with the batch;
+        the values given with the last NFT of a batch win.
+        """
+        self._nfts.append(nft)
+        self._batch_fields.update(fields)
+        if len(self._nfts) >= self.batch_size:
+            await self.flush_nfts()
+        else:
+            self._schedule()
+    
+    async def status(self, message: Dict[str, Any]) -> None:
+        """Send a status/progress message, or keep it as the pending one if one went out recently"""
+        kind = message.get("type", "status")
+        if kind not in COALESCED_TYPES:
+            await self.send(message)
+            return
+        if kind in self._pending:
+            self.stats["coalesced"] += 1
+        self._pending[kind] = message
+        if time.monotonic() - self._last_sent.get(kind, 0.0) >= self.status_interval:
+            await self._flush_pending(kind)
+        else:
+            self._schedule()
+    
+    async def send(self, message: Dict[str, Any]) -> None:
+        """Send a message that must not be dropped, after everything queued before it"""
+        await self.flush()
+        async with self._lock:
+            await self._send(message)
+    
+    async def flush_nfts(self) -> None:
+        """Send buffered NFTs as one batch"""
+        async with self._lock:
+            if not self._nfts:
+                return
+            nfts, self._nfts = self._nfts, []
+            fields, self._batch_fields = self._batch_fields, {}
+            await self._send({"type": "nft_batch", "nfts": nfts, "count": len(nfts), **fields})
+            self.stats["batches"] += 1
+            self.stats["nfts"] += len(nfts)
+    
+    async def flush(self) -> None:
+        """Send buffered NFTs, then the pending status/progress messages"""
+        await self.flush_nfts()
+        for kind in list(self._pending):
+            await self._flush_pending(kind)
+    
+    async def close(self) -> None:
+        """Flush everything and stop the timer"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._timer and not self._timer.done():
+            self._timer.cancel()
+        await self.flush()
+        logger.debug(f"Delivery: {self.stats['nfts']} NFTs in {self.stats['batches']} batches, "
+                     f"{self.stats['frames']} frames, {self.stats['coalesced']} status messages coalesced")
+    
+    def abort(self) -> None:
+        """Drop whatever is still buffered and stop the timer (the client went elsewhere)"""
+        self._closed = True
+        if self._timer and not self._timer.done():
+            self._timer.cancel()
+        self._nfts.clear()
+        self._pending.clear()
+    
+    async def _flush_pending(self, kind: str) -> None:
+        # NFTs queued before this status go first, so counts never run ahead of the grid
+        await self.flush_nfts()
+        async with self._lock:
+            message = self._pending.pop(kind, None)
+            if message is None:
+                return
+            await self._send(message)
+            self._last_sent[kind] = time.monotonic()
+    
+    async def _send(self, message: Dict[str, Any]) -> None:
+        await self._send_text(encode_message(message))
+        self.stats["frames"] += 1
+    
+    def _schedule(self) -> None:
+        """Make sure something flushes the buffers once the current interval is over"""
+        if self._closed or (self._timer and not self._timer.done()):
+            return
+        self._timer = asyncio.create_task(self._flush_later())
+    
+    async def _flush_later(self) -> None:
+        while not self._closed and (self._nfts or self._pending):
+            # Wake at least every max_delay, NFTs may arrive while waiting on a status slot
+            now = time.monotonic()
+            delay = self.max_delay
+            for kind in self._pending:
+                delay = min(delay, self._last_sent.get(kind, 0.0) + self.status_interval - now)
+            await asyncio.sleep(max(0.0, delay))
+            try:
+                if self._nfts:
+                    await self.flush_nfts()
+                now = time.monotonic()
+                for kind in list(self._pending):
+                    if now - self._last_sent.get(kind, 0.0) >= self.status_interval:
+                        await self._flush_pending(kind)
+            except Exception as e:
+                # The socket is gone; the caller finds out on its next send
+                logger.debug(f"Delivery flush failed: {e}")
+                return
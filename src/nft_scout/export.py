@@ -0,0 +1,279 @@
+"""
+Streaming exporters for NFT dumps (Parquet, JSON, NDJSON)
+"""
+
+import gzip
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+from loguru import logger
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+    pa = None
+    pq = None
+
+from .models import NormalizedNFT
+
+EXPORT_FORMATS = ("json", "ndjson", "parquet")
+
+_STRING_FIELDS = (
+    "token_id", "contract_address", "chain", "name", "description",
+    "image_url", "animation_url", "external_url", "owner_address", "owner_ens",
+    "collection_name", "collection_slug", "token_standard", "last_sale_currency",
+)
+_FLOAT_FIELDS = ("floor_price", "last_sale_price", "rarity_score")
+_INT_FIELDS = ("rarity_rank",)
+_BOOL_FIELDS = ("collection_verified", "metadata_cached")
+_TIMESTAMP_FIELDS = ("minted_at", "last_transferred_at", "metadata_cache_date")
+
+
+def nft_schema(include_raw_metadata: bool = False) -> "pa.Schema":
+    """
+    Arrow schema of an NFT dump
+    
+    Traits become a list<struct> column; trait values are kept as strings,
+    with numeric values also in `value_number` so they can be filtered on
+    without parsing. `raw_metadata` (a JSON string) is only included on
+    request, it is usually most of the file.
+    """
+    if not PYARROW_AVAILABLE:
+        raise ImportError("pyarrow package not installed. Install with: pip install pyarrow")
+    trait = pa.struct([
+        ("trait_type", pa.string()),
+        ("value", pa.string()),
+        ("value_number", pa.float64()),
+        ("display_type", pa.string()),
+    ])
+    fields = [(name, pa.string()) for name in _STRING_FIELDS]
+    fields += [(name, pa.float64()) for name in _FLOAT_FIELDS]
+    fields += [(name, pa.int64()) for name in _INT_FIELDS]
+    fields += [(name, pa.bool_()) for name in _BOOL_FIELDS]
+    fields += [(name, pa.timestamp("us", tz="UTC")) for name in _TIMESTAMP_FIELDS]
+    fields.append(("attributes", pa.list_(trait)))
+    if include_raw_metadata:
+        fields.append(("raw_metadata", pa.string()))
+    return pa.schema(fields)
+
+
+def _text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if hasattr(value, "value"):  # enums
+        return str(value.value)
+    return str(value)
+
+
+def _timestamp(value: Any) -> Optional[datetime]:
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is None:
+        # Naive datetimes in the models are UTC
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _traits(nft: NormalizedNFT) -> List[Dict[str, Any]]:
+    traits = []
+    for trait in nft.attributes or []:
+        value = trait.value
+        is_number = isinstance(value, (int, float)) and not isinstance(value, bool)
+        traits.append({
+            "trait_type": _text(trait.trait_type),
+            "value": _text(value),
+            "value_number": float(value) if is_number else None,
+            "display_type": trait.display_type,
+        })
+    return traits
+
+
+class ParquetNFTWriter:
+    """
+    Writes NormalizedNFT rows to a Parquet file, one row group at a time
+    
+    Rows are buffered column by column and flushed every `row_group_size`
+    NFTs, so memory use depends on the row group size, not on how many NFTs
+    are written. Call write() as pages arrive and close() at the end.
+    """
+    
+    def __init__(
+        self,
+        path: str,
+        include_raw_metadata: bool = False,
+        row_group_size: int = 10000,
+        compression: str = "zstd",
+    ):
+        self.schema = nft_schema(include_raw_metadata)
+        self.include_raw_metadata = include_raw_metadata
+        self.row_group_size = row_group_size
+        self.path = path
+        self._writer = pq.ParquetWriter(path, self.schema, compression=compression)
+        self._columns: Dict[str, List[Any]] = {name: [] for name in self.schema.names}
+        self._buffered = 0
+        self.rows_written = 0
+        self.row_groups = 0
+    
+    def write(self, nfts: Iterable[NormalizedNFT]) -> None:
+        """Buffer NFTs, flushing full row groups to disk"""
+        columns = self._columns
+        for nft in nfts:
+            for name in _STRING_FIELDS:
+                columns[name].append(_text(getattr(nft, name, None)))
+            for name in _FLOAT_FIELDS + _INT_FIELDS + _BOOL_FIELDS:
+                columns[name].append(getattr(nft, name, None))
+            for name in _TIMESTAMP_FIELDS:
+                columns[name].append(_timestamp(getattr(nft, name, None)))
+            columns["attributes"].append(_traits(nft))
+            if self.include_raw_metadata:
+                raw = nft.raw_metadata
+                columns["raw_metadata"].append(json.dumps(raw, default=str) if raw is not None else None)
+            self._buffered += 1
+            if self._buffered >= self.row_group_size:
+                self.flush()
+    
+    def flush(self) -> None:
+        """Write buffered rows as one row group"""
+        if not self._buffered:
+            return
+        table = pa.Table.from_pydict(self._columns, schema=self.schema)
+        self._writer.write_table(table, row_group_size=self._buffered)
+        self.rows_written += self._buffered
+        self.row_groups += 1
+        # Emptied in place: write() holds on to these lists while it fills them
+        for values in self._columns.values():
+            values.clear()
+        self._buffered = 0
+    
+    def close(self) -> None:
+        """Flush the last row group and finish the file"""
+        self.flush()
+        self._writer.close()
+        logger.debug(f"Wrote {self.rows_written} NFTs in {self.row_groups} row groups to {self.path}")
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _open_text(path: str):
+    """Open a text file for writing, gzip-compressed when the name ends in .gz"""
+    if path.lower().endswith(".gz"):
+        return gzip.open(path, "wt", encoding="utf-8")
+    return open(path, "w", encoding="utf-8")
+
+
+class JSONNFTWriter:
+    """
+    Writes NormalizedNFT rows to a JSON array as they arrive
+    
+    Same interface as ParquetNFTWriter; each NFT is serialized and written
+    straight away, nothing is kept in memory.
+    """
+    
+    def __init__(self, path: str, include_raw_metadata: bool = False):
+        self.path = path
+        self.include_raw_metadata = include_raw_metadata
+        self._file = _open_text(path)
+        self._file.write("[")
+        self.rows_written = 0
+    
+    def write(self, nfts: Iterable[NormalizedNFT]) -> None:
+        """Append NFTs to the array"""
+        exclude = None if self.include_raw_metadata else {"raw_metadata"}
+        for nft in nfts:
+            if self.rows_written:
+                self._file.write(",\n")
+            self._file.write(nft.model_dump_json(exclude=exclude))
+            self.rows_written += 1
+    
+    def close(self) -> None:
+        """Close the array and the file"""
+        self._file.write("]\n")
+        self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+
+class NDJSONNFTWriter:
+    """
+    Writes one JSON object per line (gzip-compressed for *.gz paths)
+    
+    Unlike a JSON array, a partial file is still valid up to the last line,
+    and it can be read line by line (pandas.read_json(lines=True)).
+    """
+    
+    def __init__(self, path: str, include_raw_metadata: bool = False):
+        self.path = path
+        self.include_raw_metadata = include_raw_metadata
+        self._file = _open_text(path)
+        self.rows_written = 0
+    
+    def write(self, nfts: Iterable[NormalizedNFT]) -> None:
+        """Append NFTs, one per line"""
+        exclude = None if self.include_raw_metadata else {"raw_metadata"}
+        for nft in nfts:
+            self._file.write(nft.model_dump_json(exclude=exclude) + "\n")
+            self.rows_written += 1
+    
+    def close(self) -> None:
+        """Close the file"""
+        self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+
+def guess_format(path: str) -> str:
+    """Export format implied by a file name (.parquet, .ndjson/.jsonl, else JSON; .gz is ignored)"""
+    name = path.lower()
+    if name.endswith(".gz"):
+        name = name[:-3]
+    if name.endswith((".parquet", ".pq")):
+        return "parquet"
+    if name.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    return "json"
+
+
+def open_nft_writer(
+    path: str,
+    fmt: Optional[str] = None,
+    include_raw_metadata: Optional[bool] = None,
+    **kwargs: Any,
+):
+    """
+    Open a streaming NFT writer for `path`
+    
+    `fmt` is "json", "ndjson" or "parquet"; when not given it is taken from
+    the file extension. JSON and NDJSON files ending in .gz are gzipped.
+    `raw_metadata` is kept in JSON dumps and left out of Parquet ones unless
+    asked otherwise.
+    """
+    fmt = (fmt or guess_format(path)).lower()
+    if fmt == "parquet":
+        include = False if include_raw_metadata is None else include_raw_metadata
+        return ParquetNFTWriter(path, include_raw_metadata=include, **kwargs)
+    include = True if include_raw_metadata is None else include_raw_metadata
+    if fmt == "json":
+        return JSONNFTWriter(path, include_raw_metadata=include)
+    if fmt == "ndjson":
+        return NDJSONNFTWriter(path, include_raw_metadata=include)
+    raise ValueError(f"Unknown export format: {fmt} (expected one of {', '.join(EXPORT_FORMATS)})")
@@ -0,0 +1,618 @@
+"""
+Background scrape jobs that keep running when the WebSocket that started them goes away
+"""
+
+import asyncio
+import secrets
+import time
+import uuid
+from bisect import bisect_left
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+from loguru import logger
+
+from .delivery import BatchedSender, COALESCED_TYPES
+
+# Kinds of buffered events
+_NFT = "nft"
+_STATUS = "status"  # may be coalesced by the subscriber's sender
+_MESSAGE = "message"  # always delivered
+
+# (kind, payload, batch fields, (chain, contract) an NFT is stored under)
+Event = Tuple[str, Dict[str, Any], Optional[Dict[str, Any]], Optional[Tuple[str, str]]]
+
+# Trimmed NFTs read back from the store per query
+_REPLAY_BATCH = 500
+
+
+class JobState(str, Enum):
+    """Lifecycle of a scrape job"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+    INTERRUPTED = "interrupted"  # was queued or running when the process went away; resumable
+
+
+_FINISHED_STATES = (JobState.COMPLETED, JobState.FAILED, JobState.CANCELLED)
+
+
+class JobError(Exception):
+    """Raised by a runner that has already published why it failed (the manager doesn't repeat it)"""
+
+
+def _raw_image(raw: Dict[str, Any]) -> Optional[str]:
+    """Image named by provider metadata (Helius files/links, plain `image`) when it didn't normalize"""
+    content = raw.get("content") if isinstance(raw.get("content"), dict) else {}
+    for files in (content.get("files"), raw.get("files")):
+        if isinstance(files, list) and files and isinstance(files[0], dict):
+            image = files[0].get("cdn_uri") or files[0].get("uri") or files[0].get("link")
+            if image:
+                return str(image)
+    nested = raw.get("metadata") if isinstance(raw.get("metadata"), dict) else {}
+    image = raw.get("image") or (content.get("links") or {}).get("image") or nested.get("image")
+    return str(image) if image else None
+
+
+def nft_event(nft: Any) -> Dict[str, Any]:
+    """
+    An NFT as buffered in job events
+    
+    raw_metadata stays out (events are kept for the whole job retention);
+    the one thing the UI takes from it, an image when image_url is missing,
+    is copied into image_url.
+    """
+    event = nft.model_dump(mode="json", exclude={"raw_metadata"})
+    if not event.get("image_url") and isinstance(nft.raw_metadata, dict):
+        event["image_url"] = _raw_image(nft.raw_metadata)
+    return event
+
+
+class ScrapeJob:
+    """
+    One scrape running in the background
+    
+    The runner publishes NFTs and messages into an append-only event buffer
+    and never waits for anyone reading it. Subscribers read the buffer at
+    their own pace, each through its own BatchedSender, so a slow or absent
+    browser doesn't hold up the upstream pages. Every event has a sequence
+    number: a client that reattaches passes the last one it saw and gets
+    everything after it. Only the last `buffer_size` events are kept; for
+    NFTs trimmed from the buffer the job keeps only where they are stored
+    (seq, chain, contract, token id), and replays them from the collection
+    store. That index is bounded too: beyond the last `replay_size` NFTs it
+    only keeps the ones a current subscriber still has to read, and a
+    client attaching after the rest were dropped gets a warning instead.
+    """
+    
+    def __init__(
+        self,
+        job_id: str,
+        params: Dict[str, Any],
+        buffer_size: int = 50000,
+        key: Optional[str] = None,
+        token: Optional[str] = None,
+        replay_size: int = 200000,
+    ):
+        self.id = job_id
+        self.key = key  # what the job scrapes; concurrent requests for the same key share the job
+        # Owner token: only its holder may stop the job for everyone or resume it (never in summary())
+        self.token = token or secrets.token_urlsafe(16)
+        # Read token: handed to everyone following the job so they can reattach to it (never in summary())
+        self.view_token = secrets.token_urlsafe(16)
+        self.params = params
+        self.state = JobState.QUEUED
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.progress: Dict[str, Any] = {"total_scraped": 0, "collection_total": None, "progress_pct": 0}
+        self.buffer_size = max(1, buffer_size)
+        self.replay_size = max(0, replay_size)
+        self.subscribers: List["JobSubscription"] = []
+        self.task: Optional[asyncio.Task] = None
+        self.cancel_requested = False
+        self._events: List[Event] = []
+        self._first_seq = 0  # sequence number of self._events[0]
+        self.nfts_published = 0
+        # (seq, chain, contract, token_id) of the NFTs trimmed from the buffer, in publish order;
+        # the ones before seq _trimmed_from (_trimmed_offset NFTs) are dropped
+        self._trimmed: List[Tuple[int, Optional[str], Optional[str], str]] = []
+        self._trimmed_from = 0
+        self._trimmed_offset = 0
+        self._wakeup = asyncio.Event()
+        self._checkpointer: Optional[Callable[["ScrapeJob"], Awaitable[None]]] = None
+        self._checkpoint_interval = 5.0
+        self._checkpointed_at = 0.0
+    
+    @property
+    def next_seq(self) -> int:
+        """Sequence number the next event will get"""
+        return self._first_seq + len(self._events)
+    
+    @property
+    def done(self) -> bool:
+        return self.state in _FINISHED_STATES
+    
+    def publish(self, message: Dict[str, Any], coalesce: Optional[bool] = None) -> None:
+        """
+        Buffer a message for subscribers
+        
+        status and progress messages may be coalesced on the way out (only
+        the latest of a burst is sent); pass coalesce=False for one that
+        must arrive.
+        """
+        if coalesce is None:
+            coalesce = message.get("type") in COALESCED_TYPES
+        if message.get("type") in ("progress", "complete"):
+            for key in ("total_scraped", "collection_total", "progress_pct"):
+                if message.get(key) is not None:
+                    self.progress[key] = message[key]
+        self._append((_STATUS if coalesce else _MESSAGE, message, None, None))
+    
+    def add_nft(self, nft: Dict[str, Any], stored_as: Optional[Tuple[str, str]] = None, **fields: Any) -> None:
+        """
+        Buffer a scraped NFT; `fields` (total_scraped, api_source) travel with its batch
+        
+        `stored_as` is the (chain, contract) the collection store keeps it
+        under; without it the NFT can't be replayed once it is trimmed.
+        """
+        if "total_scraped" in fields:
+            self.progress["total_scraped"] = fields["total_scraped"]
+        self._append((_NFT, nft, fields, stored_as))
+    
+    async def checkpoint(self, force: bool = False, **params: Any) -> None:
+        """
+        Record what a resume needs to know (merged into `params`) and save
+        a checkpoint, at most every few seconds unless `force`
+        
+        The pages themselves are committed by the collection store as they
+        are fetched; this only keeps the job's own parameters and counters.
+        """
+        self.params.update(params)
+        if self._checkpointer is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._checkpointed_at < self._checkpoint_interval:
+            return
+        self._checkpointed_at = now
+        await self._checkpointer(self)
+    
+    def owned_by(self, token: Optional[str]) -> bool:
+        """Whether `token` is this job's owner token"""
+        return bool(token) and secrets.compare_digest(str(token), self.token)
+    
+    def readable_by(self, token: Optional[str]) -> bool:
+        """Whether `token` may read the job's summary and events (its owner or read token)"""
+        return self.owned_by(token) or (bool(token) and secrets.compare_digest(str(token), self.view_token))
+    
+    def summary(self) -> Dict[str, Any]:
+        """JSON-friendly description of the job"""
+        return {
+            "job_id": self.id,
+            "key": self.key,
+            "state": self.state.value,
+            "error": self.error,
+            "params": self.params,
+            "progress": dict(self.progress),
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "subscribers": len(self.subscribers),
+            "next_seq": self.next_seq,
+        }
+    
+    def _append(self, event: Event) -> None:
+        self._events.append(event)
+        if event[0] == _NFT:
+            self.nfts_published += 1
+        overflow = len(self._events) - self.buffer_size
+        # Trim in chunks so the list isn't shifted on every event
+        if overflow >= max(1, self.buffer_size // 10):
+            for seq, (kind, payload, _, stored_as) in enumerate(self._events[:overflow], self._first_seq):
+                if kind == _NFT:
+                    chain, contract = stored_as or (None, None)
+                    self._trimmed.append((seq, chain, contract, str(payload.get("token_id"))))
+            del self._events[:overflow]
+            self._first_seq += overflow
+            self._drop_read_trimmed()
+        self._notify()
+    
+    def _drop_read_trimmed(self) -> None:
+        """Forget trimmed NFTs beyond the last `replay_size` that every current subscriber has read"""
+        floor = min([subscriber.next_seq for subscriber in self.subscribers] + [self._first_seq])
+        dropped = min(bisect_left(self._trimmed, (floor,)), len(self._trimmed) - self.replay_size)
+        if dropped <= 0:
+            return
+        self._trimmed_from = self._trimmed[dropped - 1][0] + 1
+        del self._trimmed[:dropped]
+        self._trimmed_offset += dropped
+    
+    def _notify(self) -> None:
+        # Wake everyone waiting on the current event and hand out a fresh one
+        self._wakeup.set()
+        self._wakeup = asyncio.Event()
+    
+    def _set_state(self, state: JobState, error: Optional[str] = None) -> None:
+        self.state = state
+        if state == JobState.RUNNING:
+            self.started_at = time.time()
+        elif state in _FINISHED_STATES:
+            self.finished_at = time.time()
+            self.error = error
+        self.publish({"type": "job", **self.summary()}, coalesce=False)
+
+
+class JobSubscription:
+    """
+    A client reading a job's events from a given sequence number
+    
+    A client behind the buffer (one that fell behind, or reattaches) first
+    gets the trimmed NFTs from `store`, then the buffered and live events.
+    """
+    
+    def __init__(self, job: ScrapeJob, sender: BatchedSender, after: int = -1, store: Optional[Any] = None):
+        self.job = job
+        self.sender = sender
+        self.store = store
+        self.next_seq = max(0, after + 1)
+        self.task = asyncio.create_task(self._pump())
+        job.subscribers.append(self)
+    
+    async def close(self) -> None:
+        """Stop reading (the job keeps running)"""
+        self.sender.abort()
+        if self.task and not self.task.done():
+            self.task.cancel()
+            try:
+                await self.task
+            except (asyncio.CancelledError, Exception):
+                pass
+    
+    async def _pump(self) -> None:
+        job = self.job
+        sender = self.sender
+        try:
+            while True:
+                wakeup = job._wakeup
+                if self.next_seq < job._first_seq:
+                    await self._catch_up()
+                    continue
+                if self.next_seq >= job.next_seq:
+                    if job.done:
+                        break
+                    # Caught up: send what we have now, pending statuses keep their rate limit
+                    await sender.flush_nfts()
+                    await wakeup.wait()
+                    continue
+                seq = self.next_seq
+                kind, payload, fields, _ = job._events[seq - job._first_seq]
+                self.next_seq = seq + 1
+                if kind == _NFT:
+                    await sender.add_nft(payload, seq=seq, job_id=job.id, **fields)
+                elif kind == _STATUS:
+                    await sender.status({**payload, "seq": seq, "job_id": job.id})
+                else:
+                    await sender.send({**payload, "seq": seq, "job_id": job.id})
+            await sender.close()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # The socket went away; the job doesn't care
+            logger.debug(f"Subscriber of job {job.id} stopped: {e}")
+        finally:
+            if self in job.subscribers:
+                job.subscribers.remove(self)
+    
+    async def _catch_up(self) -> None:
+        """Replay the NFTs of trimmed events from the store, up to the start of the buffer"""
+        job = self.job
+        if self.next_seq < job._trimmed_from:
+            # Dropped before this client attached
+            self.next_seq = job._trimmed_from
+            await self.sender.send({
+                "type": "warning",
+                "message": f"⚠️ Earlier NFTs of job {job.id} are no longer available",
+                "job_id": job.id,
+            })
+        missing = 0
+        # The buffer may be trimmed again, and the read part of `_trimmed` dropped, while the
+        # replay runs: look the next chunk up again after every read
+        while self.next_seq < job._first_seq:
+            trimmed = job._trimmed
+            start = bisect_left(trimmed, (self.next_seq,))
+            chunk = trimmed[start:start + _REPLAY_BATCH]
+            chunk = chunk[:bisect_left(chunk, (job._first_seq,))]
+            if not chunk:
+                self.next_seq = job._first_seq
+                break
+            # An NFT's place among the trimmed ones is how many were published before it
+            published_before = job._trimmed_offset + start
+            stored = await self._read_stored(chunk)
+            for position, (seq, chain, contract, token_id) in enumerate(chunk, published_before + 1):
+                nft = stored.get((chain, contract, token_id))
+                if nft is None:
+                    missing += 1
+                    continue
+                await self.sender.add_nft(nft_event(nft), seq=seq, job_id=job.id, total_scraped=position)
+            self.next_seq = chunk[-1][0] + 1
+        if missing:
+            logger.warning(f"Job {job.id}: {missing} trimmed NFTs could not be replayed")
+            await self.sender.send({
+                "type": "warning",
+                "message": f"⚠️ {missing:,} earlier NFTs of job {job.id} are no longer available",
+                "job_id": job.id,
+            })
+    
+    async def _read_stored(self, chunk: List[Tuple[int, Optional[str], Optional[str], str]]) -> Dict[Tuple, Any]:
+        """Stored NFTs of trimmed events, by (chain, contract, token_id)"""
+        if self.store is None:
+            return {}
+        collections: Dict[Tuple[str, str], List[str]] = {}
+        for _, chain, contract, token_id in chunk:
+            if chain and contract:
+                collections.setdefault((chain, contract), []).append(token_id)
+        stored = {}
+        for (chain, contract), token_ids in collections.items():
+            nfts = await self.store.get_nfts(chain, contract, token_ids)
+            stored.update(((chain, contract, token_id), nft) for token_id, nft in nfts.items())
+        return stored
+
+
+class ScrapeJobManager:
+    """
+    Runs scrape jobs in the background on a bounded number of workers
+    
+    submit() returns straight away with a queued job; at most `max_jobs`
+    run at once, the rest wait for a slot. Finished jobs are kept for
+    `retention` seconds so clients can still reattach and read the end.
+    
+    Jobs submitted with a `key` (e.g. chain:contract) are shared: while one
+    is queued or running, active_job(key) returns it and further requests
+    subscribe to it instead of starting another upstream walk. A late
+    subscriber gets the buffered events from the start, then live ones.
+    
+    With a `store` (CollectionStore), every job is checkpointed on state
+    changes and every `checkpoint_interval` seconds while it runs, so jobs
+    cut short by a crash or redeploy can be found and resumed by id.
+    """
+    
+    def __init__(
+        self,
+        max_jobs: int = 2,
+        buffer_size: int = 50000,
+        retention: float = 3600,
+        replay_size: int = 200000,
+        sender_options: Optional[Dict[str, Any]] = None,
+        store: Optional[Any] = None,
+        checkpoint_interval: float = 5.0,
+    ):
+        self.max_jobs = max(1, max_jobs)
+        self.buffer_size = buffer_size
+        self.replay_size = replay_size
+        self.retention = retention
+        self.sender_options = sender_options or {}
+        self.store = store
+        self.checkpoint_interval = checkpoint_interval
+        self.jobs: Dict[str, ScrapeJob] = {}
+        self._active: Dict[str, ScrapeJob] = {}  # key -> queued/running job
+        self._slots = asyncio.Semaphore(self.max_jobs)
+        self.stats = {"submitted": 0, "shared": 0}
+    
+    def submit(
+        self,
+        runner: Callable[[ScrapeJob], Awaitable[None]],
+        job_id: Optional[str] = None,
+        key: Optional[str] = None,
+        token: Optional[str] = None,
+        **params: Any,
+    ) -> ScrapeJob:
+        """
+        Queue `runner(job)` and return the job (`job_id` and `token` are reused when resuming)
+        
+        The job's owner token is only handed to whoever submitted it.
+        
+        Callers that want to share work look for active_job(key) first; a
+        job submitted with the key of an active one replaces it as the one
+        new subscribers are sent to.
+        """
+        self._prune()
+        job = ScrapeJob(
+            job_id or uuid.uuid4().hex[:12], params,
+            buffer_size=self.buffer_size, replay_size=self.replay_size, key=key, token=token,
+        )
+        if self.store is not None:
+            job._checkpointer = self._save_checkpoint
+            job._checkpoint_interval = self.checkpoint_interval
+        self.jobs[job.id] = job
+        if key:
+            self._active[key] = job
+        self.stats["submitted"] += 1
+        job._set_state(JobState.QUEUED)
+        job.task = asyncio.create_task(self._run(job, runner))
+        logger.info(f"Scrape job {job.id} queued: {params}")
+        return job
+    
+    def get(self, job_id: Optional[str]) -> Optional[ScrapeJob]:
+        return self.jobs.get(job_id) if job_id else None
+    
+    def active_job(self, key: str) -> Optional[ScrapeJob]:
+        """The queued or running job for `key`, to subscribe to instead of starting another"""
+        job = self._active.get(key)
+        if job is None or job.done:
+            return None
+        self.stats["shared"] += 1
+        return job
+    
+    async def rekey(self, job: ScrapeJob, key: str, **params: Any) -> None:
+        """
+        Move a running job to another key (e.g. the collection turned out to
+        be on another chain), merging `params` and checkpointing right away
+        
+        New requests for `key` then join the job, and a resume starts from
+        the new params.
+        """
+        if job.key and self._active.get(job.key) is job:
+            del self._active[job.key]
+        job.key = key
+        if not job.done:
+            self._active[key] = job
+        await job.checkpoint(force=True, **params)
+    
+    async def get_checkpoint(self, job_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Last saved checkpoint of a job (also of jobs from before a restart)"""
+        if not job_id or self.store is None:
+            return None
+        try:
+            return await self.store.get_job_checkpoint(job_id)
+        except Exception as e:
+            logger.warning(f"Could not read checkpoint of job {job_id}: {e}")
+            return None
+    
+    async def recover_interrupted(self) -> List[Dict[str, Any]]:
+        """
+        Mark checkpoints of jobs that were queued or running when the last
+        process stopped as interrupted, and return them (call on startup)
+        """
+        if self.store is None:
+            return []
+        try:
+            stale = [JobState.QUEUED.value, JobState.RUNNING.value]
+            checkpoints = [cp for cp in await self.store.list_job_checkpoints(stale) if cp["job_id"] not in self.jobs]
+            for checkpoint in checkpoints:
+                checkpoint["state"] = JobState.INTERRUPTED.value
+                await self.store.save_job_checkpoint(
+                    checkpoint["job_id"],
+                    checkpoint["state"],
+                    checkpoint["params"],
+                    checkpoint["progress"],
+                    created_at=checkpoint["created_at"],
+                    token=checkpoint["token"],
+                )
+            # Finished checkpoints are only kept as long as finished jobs
+            finished = [state.value for state in _FINISHED_STATES]
+            await self.store.delete_job_checkpoints(time.time() - self.retention, finished)
+            if checkpoints:
+                logger.info(f"Found {len(checkpoints)} interrupted scrape job(s): {[cp['job_id'] for cp in checkpoints]}")
+            return checkpoints
+        except Exception as e:
+            logger.warning(f"Could not recover interrupted scrape jobs: {e}")
+            return []
+    
+    def subscribe(
+        self,
+        job: ScrapeJob,
+        send_text: Callable[[str], Awaitable[Any]],
+        after: int = -1,
+    ) -> JobSubscription:
+        """Start sending `job`'s events after sequence number `after` to a client"""
+        return JobSubscription(job, BatchedSender(send_text, **self.sender_options), after=after, store=self.store)
+    
+    def list_jobs(self, job_ids: Iterable[str] = (), tokens: Iterable[Optional[str]] = ()) -> List[Dict[str, Any]]:
+        """Summaries of the jobs in `job_ids` or owned by one of `tokens` (nobody gets to see every job)"""
+        self._prune()
+        job_ids = set(job_ids)
+        tokens = [token for token in tokens if token]
+        return [
+            job.summary() for job in self.jobs.values()
+            if job.id in job_ids or any(job.owned_by(token) for token in tokens)
+        ]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        states: Dict[str, int] = {}
+        for job in self.jobs.values():
+            states[job.state.value] = states.get(job.state.value, 0) + 1
+        return {
+            "max_jobs": self.max_jobs,
+            "jobs": states,
+            "submitted": self.stats["submitted"],
+            "shared": self.stats["shared"],  # requests that joined a running job instead of starting one
+            "subscribers": sum(len(job.subscribers) for job in self.jobs.values()),
+        }
+    
+    async def cancel(self, job_id: Optional[str]) -> Optional[ScrapeJob]:
+        """
+        Stop a job for everyone and wait until it has wound down (usually a few milliseconds)
+        
+        Callers check the owner token first; a viewer without it uses leave().
+        The cancellation reaches whatever the job is awaiting: the page
+        prefetch task, in-flight HTTP requests (aborted unless another caller
+        shares them), Helius enrichment batches and rate limiter waits. The
+        worker slot is free again when this returns.
+        """
+        job = self.get(job_id)
+        if job is None or job.done or job.task is None:
+            return job
+        job.cancel_requested = True
+        job.task.cancel()
+        await asyncio.wait({job.task})
+        return job
+    
+    async def leave(self, subscription: JobSubscription) -> bool:
+        """
+        Detach a subscriber that asked to stop the job
+        
+        The job keeps running while anyone else follows it and is cancelled
+        when the last one leaves this way (a dropped connection only detaches,
+        so the scrape survives a reload). True if the job was cancelled.
+        """
+        job = subscription.job
+        await subscription.close()
+        if job.done or job.subscribers:
+            return False
+        await self.cancel(job.id)
+        return True
+    
+    async def shutdown(self) -> None:
+        """Cancel running jobs (on server shutdown)"""
+        tasks = [job.task for job in self.jobs.values() if job.task and not job.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def _run(self, job: ScrapeJob, runner: Callable[[ScrapeJob], Awaitable[None]]) -> None:
+        try:
+            await self._save_checkpoint(job)
+            async with self._slots:
+                job._set_state(JobState.RUNNING)
+                await self._save_checkpoint(job)
+                try:
+                    await runner(job)
+                except Exception as e:
+                    logger.error(f"Scrape job {job.id} failed: {e}")
+                    if not isinstance(e, JobError):
+                        job.publish({"type": "error", "message": str(e)})
+                    job._set_state(JobState.FAILED, error=str(e))
+                else:
+                    job._set_state(JobState.COMPLETED)
+                    logger.info(f"Scrape job {job.id} completed: {job.progress['total_scraped']} NFTs")
+        except asyncio.CancelledError:
+            if not job.cancel_requested:
+                # Shutdown: the checkpoint still says queued/running, so the job comes back as interrupted
+                raise
+            job._set_state(JobState.CANCELLED)
+            logger.info(f"Scrape job {job.id} cancelled after {job.progress['total_scraped']} NFTs")
+        finally:
+            if job.key and self._active.get(job.key) is job:
+                del self._active[job.key]
+        await self._save_checkpoint(job)
+    
+    async def _save_checkpoint(self, job: ScrapeJob) -> None:
+        if self.store is None:
+            return
+        try:
+            await self.store.save_job_checkpoint(
+                job.id, job.state.value, job.params, job.progress,
+                error=job.error, created_at=job.created_at, token=job.token,
+            )
+        except Exception as e:
+            # A missed checkpoint only means a resume starts a little further back
+            logger.warning(f"Could not checkpoint scrape job {job.id}: {e}")
+    
+    def _prune(self) -> None:
+        """Forget finished jobs nobody can still be interested in"""
+        cutoff = time.time() - self.retention
+        for job_id, job in list(self.jobs.items()):
+            if job.done and job.finished_at < cutoff and not job.subscribers:
+                del self.jobs[job_id]
@@ -38,10 +38,13 @@ class Chain(str, Enum):
 
 
 class Trait(BaseModel):
-    """NFT trait/attribute"""
+    """NFT trait/attribute (immutable: the fast normalizer shares one instance between NFTs)"""
     trait_type: str
     value: Union[str, int, float]
     display_type: Optional[str] = None
+    
+    class Config:
+        frozen = True
 
 
 class NormalizedNFT(BaseModel):
@@ -258,4 +261,5 @@ class CollectionNFTResponse(BaseModel):
     nfts: List[NormalizedNFT]
     cursor: Optional[str] = None
     has_more: bool = False
+    resolved_address: Optional[str] = None  # Address a collection symbol resolved to (Helius)
 
@@ -1,10 +1,11 @@
 """Normalize API responses to unified models"""
 
+import json
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 from urllib.parse import urlparse
 
-from pydantic import HttpUrl as PydanticHttpUrl
+from pydantic import HttpUrl as PydanticHttpUrl, TypeAdapter, ValidationError
 from loguru import logger
 from .models import (
     NormalizedNFT,
@@ -38,6 +39,170 @@ def convert_ipfs_to_http(ipfs_url: str) -> Optional[str]:
     return ipfs_url
 
 
+def _gateway_url(value: Any) -> Any:
+    """IPFS links rewritten to a gateway; other values untouched (left for the model to validate)"""
+    if isinstance(value, str):
+        return convert_ipfs_to_http(value)
+    return value
+
+
+# Cheaper than PydanticHttpUrl(url): no per-call adapter setup
+_HTTP_URL = TypeAdapter(PydanticHttpUrl)
+
+# NormalizedNFT field defaults in field order (required fields as None), so
+# a dict built from it keeps the same key order as a validated model
+_NFT_TEMPLATE: Dict[str, Any] = {
+    name: None if field.is_required() else field.get_default(call_default_factory=True)
+    for name, field in NormalizedNFT.model_fields.items()
+}
+
+
+def _build_nft(values: Dict[str, Any]) -> NormalizedNFT:
+    """
+    Create a NormalizedNFT from values that already have the right types
+    
+    Skips validation entirely (like model_construct, without its per-field
+    default handling). Only for values the fast normalizers produced.
+    """
+    data = dict(_NFT_TEMPLATE)
+    data["attributes"] = []
+    data.update(values)
+    nft = NormalizedNFT.__new__(NormalizedNFT)
+    object.__setattr__(nft, "__dict__", data)
+    object.__setattr__(nft, "__pydantic_fields_set__", set(values))
+    object.__setattr__(nft, "__pydantic_extra__", None)
+    object.__setattr__(nft, "__pydantic_private__", None)
+    return nft
+
+
+def _text(value: Any) -> Optional[str]:
+    """Optional string field from provider data"""
+    if value is None or isinstance(value, str):
+        return value
+    return str(value)
+
+
+def _http_url(value: Any) -> Optional[PydanticHttpUrl]:
+    """Validated media URL (IPFS links rewritten to a gateway), None if invalid"""
+    if not value or not isinstance(value, str):
+        return None
+    url = convert_ipfs_to_http(value)
+    if not url:
+        return None
+    try:
+        return _HTTP_URL.validate_python(url)
+    except ValidationError:
+        return None
+
+
+# Trait models shared between NFTs: a collection has a few hundred distinct
+# (trait_type, value) pairs repeated across thousands of tokens. Trait is
+# frozen, so one NFT can't change another's traits through a shared instance
+_TRAIT_CACHE: Dict[tuple, Trait] = {}
+_TRAIT_CACHE_SIZE = 50000
+
+
+def _trait(attr: Any) -> Optional[Trait]:
+    """Validated (and shared) Trait for one raw attribute, None if it doesn't fit the model"""
+    if not isinstance(attr, dict):
+        return None
+    trait_type = attr.get("trait_type", "")
+    value = attr.get("value")
+    display_type = attr.get("display_type")
+    try:
+        # type(value) keeps 1, 1.0, True and "1" apart
+        key = (trait_type, value, type(value), display_type)
+        trait = _TRAIT_CACHE.get(key)
+    except TypeError:
+        # Unhashable value (list, dict): can't be a valid trait value anyway
+        key = None
+        trait = None
+    if trait is not None:
+        return trait
+    try:
+        trait = Trait(trait_type=trait_type, value=value, display_type=display_type)
+    except ValidationError:
+        return None
+    if key is not None:
+        if len(_TRAIT_CACHE) >= _TRAIT_CACHE_SIZE:
+            _TRAIT_CACHE.clear()
+        _TRAIT_CACHE[key] = trait
+    return trait
+
+
+def _traits(metadata: Dict[str, Any]) -> List[Trait]:
+    """Validated traits; entries that don't fit the Trait model are dropped"""
+    raw = metadata.get("attributes")
+    if not raw or not isinstance(raw, list):
+        return []
+    traits = []
+    for attr in raw:
+        trait = _trait(attr)
+        if trait is not None:
+            traits.append(trait)
+    return traits
+
+
+_URL_FIELDS = ("image_url", "animation_url", "external_url")
+_DATETIME_FIELDS = ("minted_at", "last_transferred_at", "metadata_cache_date")
+
+
+def build_trusted_nft(data: Dict[str, Any]) -> NormalizedNFT:
+    """
+    Rebuild a NormalizedNFT from its dict form (CompactNFT.to_dict, or a
+    model_dump read back from a cache) without validating it again
+    
+    Only for data that came from a validated model: only the URLs (parsed
+    by the same adapter as the fast normalizer), traits (shared instances),
+    the chain and JSON-encoded datetimes are converted back.
+    """
+    values = dict(data)
+    values["chain"] = Chain(values["chain"]).value
+    for name in _URL_FIELDS:
+        url = values.get(name)
+        values[name] = _HTTP_URL.validate_python(str(url)) if url else None
+    for name in _DATETIME_FIELDS:
+        if isinstance(values.get(name), str):
+            values[name] = datetime.fromisoformat(values[name])
+    attributes = []
+    for attr in values.get("attributes") or []:
+        trait = attr if isinstance(attr, Trait) else _trait(attr)
+        if trait is not None:
+            attributes.append(trait)
+    values["attributes"] = attributes
+    return _build_nft(values)
+
+
+def normalize_chunk(
+    items: List[Dict[str, Any]],
+    source: str,
+    chain: str,
+    fast: bool = False,
+) -> List[NormalizedNFT]:
+    """
+    Normalize raw provider items in a worker process (process pool entry point)
+    
+    Inputs are the plain dicts the provider returned. The models come back
+    without raw_metadata, so only the normalized fields are pickled back;
+    the caller still has the raw items and re-attaches it with
+    Normalizer.raw_metadata.
+    """
+    chain_enum = Chain(chain)
+    nfts = [Normalizer.normalize_nft_from_source(item, source, chain_enum, fast=fast) for item in items]
+    for nft in nfts:
+        nft.raw_metadata = None
+    return nfts
+
+
+def _metadata_dict(value: Any) -> Dict[str, Any]:
+    if isinstance(value, str):
+        try:
+            value = json.loads(value) if value else {}
+        except ValueError:
+            value = {}
+    return value if isinstance(value, dict) else {}
+
+
 class Normalizer:
     """Convert API-specific responses to normalized models"""
     
@@ -170,9 +335,9 @@ class Normalizer:
             chain=chain,
             name=metadata.get("name"),
             description=metadata.get("description"),
-            image_url=image_url,
-            animation_url=content.get("animation_url") or metadata.get("animation_url"),
-            external_url=metadata.get("external_url"),
+            image_url=_gateway_url(image_url),
+            animation_url=_gateway_url(content.get("animation_url") or metadata.get("animation_url")),
+            external_url=_gateway_url(metadata.get("external_url")),
             raw_metadata=data,
             attributes=attributes,
             collection_name=collection_name or metadata.get("name"),
@@ -208,15 +373,100 @@ class Normalizer:
             chain=chain,
             name=metadata.get("name") or data.get("name"),
             description=metadata.get("description"),
-            image_url=metadata.get("image") if metadata.get("image") else None,
-            animation_url=metadata.get("animation_url"),
-            external_url=metadata.get("external_url"),
+            image_url=_gateway_url(metadata.get("image")),
+            animation_url=_gateway_url(metadata.get("animation_url")),
+            external_url=_gateway_url(metadata.get("external_url")),
             raw_metadata=metadata,
             attributes=attributes,
             collection_name=data.get("name"),
             token_standard=data.get("contract_type"),
         )
     
+    @staticmethod
+    def fast_alchemy_nft(data: Dict[str, Any], chain: Chain) -> NormalizedNFT:
+        """Alchemy NFT via the fast path (same model as normalize_alchemy_nft where that one does not raise)"""
+        contract = data.get("contract") or {}
+        metadata = _metadata_dict(data.get("metadata"))
+        token = data.get("id") or {}
+        owners = data.get("owners")
+        return _build_nft({
+            "token_id": str(token.get("tokenId", "")),
+            "contract_address": _text(contract.get("address")) or "",
+            "chain": Chain(chain).value,
+            "name": _text(metadata.get("name")),
+            "description": _text(metadata.get("description")),
+            "image_url": _http_url(metadata.get("image")),
+            "animation_url": _http_url(metadata.get("animation_url")),
+            "external_url": _http_url(metadata.get("external_url")),
+            "raw_metadata": metadata,
+            "attributes": _traits(metadata),
+            "collection_name": _text(contract.get("name")),
+            "token_standard": _text((token.get("tokenMetadata") or {}).get("tokenType")),
+            "owner_address": _text(owners[0]) if owners else None,
+        })
+    
+    @staticmethod
+    def fast_helius_nft(data: Dict[str, Any], chain: Chain = Chain.SOLANA) -> NormalizedNFT:
+        """Helius NFT via the fast path (same model as normalize_helius_nft where that one does not raise)"""
+        content = data.get("content") or {}
+        metadata = _metadata_dict(content.get("metadata"))
+        files = content.get("files") or []
+        
+        image_url = None
+        if files and isinstance(files[0], dict):
+            image_url = files[0].get("cdn_uri") or files[0].get("uri")
+        elif metadata.get("image"):
+            image_url = metadata.get("image")
+        if not image_url:
+            image_url = (content.get("links") or {}).get("image")
+        
+        collection_address = None
+        collection_name = None
+        for g in data.get("grouping") or []:
+            if (g.get("groupKey") or g.get("group_key")) == "collection":
+                collection_address = g.get("groupValue") or g.get("group_value")
+                collection_meta = g.get("collectionMetadata") or g.get("collection_metadata") or {}
+                collection_name = collection_meta.get("name") if isinstance(collection_meta, dict) else None
+        
+        token_id = data.get("id", "") or metadata.get("tokenId") or metadata.get("name") or ""
+        ownership = data.get("ownership") or {}
+        owner_address = ownership.get("owner") or ownership.get("ownerAddress")
+        
+        return _build_nft({
+            "token_id": str(token_id),
+            "contract_address": _text(collection_address or data.get("id")) or "",
+            "chain": Chain(chain).value,
+            "name": _text(metadata.get("name")),
+            "description": _text(metadata.get("description")),
+            "image_url": _http_url(image_url),
+            "animation_url": _http_url(content.get("animation_url") or metadata.get("animation_url")),
+            "external_url": _http_url(metadata.get("external_url")),
+            "raw_metadata": data,
+            "attributes": _traits(metadata),
+            "collection_name": _text(collection_name or metadata.get("name")),
+            "token_standard": _text(data.get("interface", "SPL")),
+            "owner_address": _text(owner_address),
+        })
+    
+    @staticmethod
+    def fast_moralis_nft(data: Dict[str, Any], chain: Chain) -> NormalizedNFT:
+        """Moralis NFT via the fast path (same model as normalize_moralis_nft where that one does not raise)"""
+        metadata = _metadata_dict(data.get("metadata"))
+        return _build_nft({
+            "token_id": _text(data.get("token_id")) or "",
+            "contract_address": _text(data.get("token_address")) or "",
+            "chain": Chain(chain).value,
+            "name": _text(metadata.get("name") or data.get("name")),
+            "description": _text(metadata.get("description")),
+            "image_url": _http_url(metadata.get("image")),
+            "animation_url": _http_url(metadata.get("animation_url")),
+            "external_url": _http_url(metadata.get("external_url")),
+            "raw_metadata": metadata,
+            "attributes": _traits(metadata),
+            "collection_name": _text(data.get("name")),
+            "token_standard": _text(data.get("contract_type")),
+        })
+    
     @staticmethod
     def normalize_alchemy_collection(data: Dict[str, Any], chain: Chain) -> CollectionStats:
         """Normalize Alchemy collection response"""
@@ -619,19 +869,47 @@ class Normalizer:
             raw_data=data,
         )
     
+    @staticmethod
+    def raw_metadata(data: Dict[str, Any], source: str) -> Optional[Dict[str, Any]]:
+        """The raw_metadata the normalizer for `source` keeps for an item"""
+        if source == "helius":
+            return data
+        return _metadata_dict(data.get("metadata"))
+    
     @staticmethod
     def normalize_nft_from_source(
         data: Dict[str, Any],
         source: str,
         chain: Chain,
+        fast: bool = False,
     ) -> NormalizedNFT:
-        """Normalize NFT from any source"""
-        if source == "alchemy":
-            return Normalizer.normalize_alchemy_nft(data, chain)
-        elif source == "helius":
-            return Normalizer.normalize_helius_nft(data, chain)
-        elif source == "moralis":
-            return Normalizer.normalize_moralis_nft(data, chain)
+        """
+        Normalize NFT from any source
+        
+        `fast=True` (NFTScout passes Config.fast_normalizer) validates only
+        what comes from the provider and builds the model without validating
+        it again; it is several times faster on large pages. Both paths
+        rewrite IPFS media links to a gateway. Where the fully validated
+        normalizers raise on an attribute that doesn't fit Trait, or (Helius,
+        Moralis) on an invalid media URL, the fast path drops the attribute
+        and leaves the URL None; otherwise they build the same model.
+        """
+        if fast:
+            normalize = _FAST_NORMALIZERS.get(source)
         else:
+            normalize = _VALIDATED_NORMALIZERS.get(source)
+        if normalize is None:
             raise ValueError(f"Unknown source: {source}")
+        return normalize(data, chain)
+
 
+_FAST_NORMALIZERS = {
+    "alchemy": Normalizer.fast_alchemy_nft,
+    "helius": Normalizer.fast_helius_nft,
+    "moralis": Normalizer.fast_moralis_nft,
+}
+_VALIDATED_NORMALIZERS = {
+    "alchemy": Normalizer.normalize_alchemy_nft,
+    "helius": Normalizer.normalize_helius_nft,
+    "moralis": Normalizer.normalize_moralis_nft,
+}
@@ -3,9 +3,12 @@ Main NFT Scout scraper class
 """
 
 import asyncio
+import multiprocessing
 import os
-from typing import List, Optional, Dict, Any, Union
-from datetime import datetime
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Dict, Any, Union, Tuple, AsyncIterator, Callable, Awaitable
 from loguru import logger
 
 from .config import Config, config
@@ -23,6 +26,8 @@ from .clients.helius import HeliusClient
 from .clients.quicknode import QuickNodeClient
 from .clients.magiceden import MagicEdenClient
 from .clients.reservoir import ReservoirClient
+from .clients.session import SessionManager
+from .clients.latency import LatencyTracker
 
 try:
     from .clients.selenium_scraper import SeleniumScraper
@@ -30,8 +35,33 @@ try:
 except ImportError:
     SELENIUM_AVAILABLE = False
     SeleniumScraper = None
-from .normalizer import Normalizer
+from .normalizer import Normalizer, build_trusted_nft, normalize_chunk
+from .compact import CompactNFT
 from .storage import get_storage_adapter
+from .storage.sqlite_store import CollectionStore
+from .utils import format_age
+
+
+# Queue markers used by NFTScout.iter_collection_pages
+_END_OF_PAGES = object()
+
+# Collection stats sources by how fast their data changes: metadata (name,
+# description, socials, images) is cached for hours, market data for a minute.
+# Selenium drives a whole browser and mostly fills metadata gaps, so it is
+# kept as long as metadata even though it can also supply a floor price
+STATS_METADATA_SOURCES = frozenset({"helius", "alchemy", "moralis", "quicknode", "magiceden_info", "selenium"})
+STATS_MARKET_SOURCES = frozenset({"reservoir", "magiceden_stats"})
+
+# Cursors of pages served by Moralis in a hedged EVM walk carry this prefix,
+# so the following pages are fetched from the same provider
+MORALIS_CURSOR_PREFIX = "moralis:"
+
+
+class _PageFetchError:
+    """Carries a page fetch failure from the prefetch task to the consumer"""
+    
+    def __init__(self, error: Exception):
+        self.error = error
 
 
 class NFTScout:
@@ -49,11 +79,42 @@ class NFTScout:
         self.reservoir = None
         self.selenium_scraper = None
         
+        # Shared HTTP connection pools (one per provider), closed in close()
+        self.sessions = SessionManager(
+            limit=self.config.http_pool_limit,
+            limit_per_host=self.config.http_pool_limit_per_host,
+            dns_cache_ttl=self.config.http_dns_cache_ttl,
+            keepalive_timeout=self.config.http_keepalive_timeout,
+        )
+        
+        # Alchemy collection page latency. Only first pages (the ones hedged) drive the hedge
+        # deadline; cursor pages are tracked apart since they are served differently
+        self.alchemy_first_page_latency = LatencyTracker()
+        self.alchemy_page_latency = LatencyTracker()
+        self.hedge_stats = {"hedged": 0, "alchemy_won": 0, "moralis_won": 0}
+        
+        # Collection stats refreshes in progress, one per cache key
+        self._stats_refreshes: Dict[str, asyncio.Task] = {}
+        # Stats sources answered from the per-source cache
+        self.stats_source_hits: Dict[str, int] = {}
+        
         # Initialize storage
         self.storage = get_storage_adapter(self.config)
         
+        # On-disk copy of scraped collections, for incremental re-scrapes
+        self.collection_store: Optional[CollectionStore] = None
+        if self.config.collection_store_enabled:
+            try:
+                self.collection_store = CollectionStore(self.config.collection_store_path)
+                logger.info(f"Collection store: {self.collection_store.path.resolve()}")
+            except Exception as e:
+                logger.warning(f"Collection store not available: {e}")
+        
         # Initialize normalizer
         self.normalizer = Normalizer()
+        # Worker processes for normalizing large pages, started on first use
+        self._normalize_pool: Optional[ProcessPoolExecutor] = None
+        self.normalize_stats = {"inline_pages": 0, "pool_pages": 0, "pool_errors": 0}
         
         # Initialize worker semaphore for concurrency control
         self._worker_semaphore = asyncio.Semaphore(self.config.max_workers)
@@ -68,6 +129,7 @@ class NFTScout:
                 api_keys=alchemy_config.keys,
                 timeout=self.config.timeout,
                 max_retries=self.config.max_retries,
+                session_manager=self.sessions,
             )
             logger.info("Alchemy client initialized")
         except Exception as e:
@@ -79,6 +141,7 @@ class NFTScout:
                 api_keys=moralis_config.keys,
                 timeout=self.config.timeout,
                 max_retries=self.config.max_retries,
+                session_manager=self.sessions,
             )
             logger.info("Moralis client initialized")
         except Exception as e:
@@ -92,6 +155,8 @@ class NFTScout:
                 rate_limit=helius_config.rate_limit,
                 timeout=self.config.timeout,
                 max_retries=self.config.max_retries,
+                enrich_concurrency=self.config.enrich_concurrency,
+                session_manager=self.sessions,
             )
             logger.info("Helius client initialized")
         except Exception as e:
@@ -104,6 +169,7 @@ class NFTScout:
                     api_keys=quicknode_config.keys,
                     timeout=self.config.timeout,
                     max_retries=self.config.max_retries,
+                    session_manager=self.sessions,
                 )
                 logger.info("QuickNode client initialized")
         except Exception as e:
@@ -111,9 +177,8 @@ class NFTScout:
         
         # Initialize Magic Eden client (with API key if available)
         try:
-            import os
             magiceden_api_key = os.getenv("MAGICEDEN_PUBLIC_API_KEY") or os.getenv("MAGICEDEN_API_KEY")
-            self.magiceden = MagicEdenClient(api_key=magiceden_api_key, rate_limit=1.0)
+            self.magiceden = MagicEdenClient(api_key=magiceden_api_key, rate_limit=1.0, session_manager=self.sessions)
             if magiceden_api_key:
                 logger.info("Magic Eden client initialized with API key")
             else:
@@ -124,7 +189,7 @@ class NFTScout:
         # Initialize Reservoir client (optional API key for higher limits)
         try:
             reservoir_api_key = os.getenv("RESERVOIR_API_KEY")
-            self.reservoir = ReservoirClient(api_key=reservoir_api_key, rate_limit=2.0)
+            self.reservoir = ReservoirClient(api_key=reservoir_api_key, rate_limit=2.0, session_manager=self.sessions)
             logger.info("Reservoir client initialized")
         except Exception as e:
             logger.warning(f"Reservoir client not available: {e}")
@@ -137,6 +202,53 @@ class NFTScout:
             except Exception as e:
                 logger.warning(f"Selenium scraper not available: {e}")
     
+    def _api_clients(self) -> List[Any]:
+        """All configured API clients"""
+        clients = [self.alchemy, self.moralis, self.helius, self.quicknode, self.magiceden, self.reservoir]
+        return [client for client in clients if client is not None]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Runtime stats for monitoring (connection pools, rate limiters, etc.)"""
+        return {
+            "http": self.sessions.get_stats(),
+            "rate_limits": {
+                client.provider_name: client.get_rate_limit_stats()
+                for client in self._api_clients()
+            },
+            "hedging": {
+                **self.hedge_stats,
+                "alchemy_first_page_latency": self.alchemy_first_page_latency.get_stats(),
+                "alchemy_page_latency": self.alchemy_page_latency.get_stats(),
+            },
+            "cache": self.storage.get_stats(),
+            "stats_source_cache_hits": dict(self.stats_source_hits),
+            "coalescing": {
+                client.provider_name: client.get_transport_stats()
+                for client in self._api_clients()
+            },
+            "normalization": {
+                **self.normalize_stats,
+                "pool_workers": self.config.normalize_workers,
+                "pool_threshold": self.config.normalize_pool_threshold,
+            },
+        }
+    
+    async def close(self):
+        """Release pooled connections and storage handles"""
+        for task in list(self._stats_refreshes.values()):
+            task.cancel()
+        if self._normalize_pool is not None:
+            self._normalize_pool.shutdown(wait=False, cancel_futures=True)
+            self._normalize_pool = None
+        await self.sessions.close()
+        if hasattr(self.storage, "close"):
+            try:
+                await self.storage.close()
+            except Exception as e:
+                logger.debug(f"Error closing storage: {e}")
+        if self.collection_store is not None:
+            self.collection_store.close()
+    
     def _get_client_for_chain(self, chain: Chain):
         """Get appropriate client for chain"""
         if chain == Chain.SOLANA:
@@ -196,10 +308,7 @@ class NFTScout:
                     
                     # Normalize NFTs
                     source = "helius" if chain == Chain.SOLANA else ("alchemy" if isinstance(client, AlchemyClient) else "moralis")
-                    normalized = [
-                        self.normalizer.normalize_nft_from_source(nft_data, source, chain)
-                        for nft_data in nfts_data
-                    ]
+                    normalized = await self._normalize_page(nfts_data, source, chain)
                     
                     return normalized, response
                 except Exception as e:
@@ -243,58 +352,400 @@ class NFTScout:
         chain: Chain,
         cursor: Optional[str] = None,
         page_size: int = 100,
+        fresh: bool = False,
     ) -> CollectionNFTResponse:
-        """Get all NFTs in a collection"""
+        """
+        Get one page of NFTs in a collection
+        
+        `fresh` skips the page cache and asks the provider; the page it
+        returns still replaces the cached one.
+        """
+        client = self._get_client_for_chain(chain)
+        if not client:
+            raise ValueError(f"No client available for {chain}")
+        
+        page_key = self._page_cache_key(client, contract_address, chain, cursor, page_size)
+        if not fresh:
+            cached = await self._get_cached_page(page_key, contract_address, chain)
+            if cached is not None:
+                return cached
+        
+        source, nfts_data, response = await self._fetch_collection_page(
+            client, contract_address, chain, cursor, page_size
+        )
+        normalized = await self._normalize_page(nfts_data, source, chain)
+        result = self._build_collection_response(
+            client, contract_address, chain, page_size, normalized, response
+        )
+        await self._cache_page(page_key, result)
+        return result
+    
+    @staticmethod
+    def _page_cache_key(
+        client: Any,
+        contract_address: str,
+        chain: Chain,
+        cursor: Optional[str],
+        page_size: int,
+    ) -> str:
+        """Cache key of one collection page: provider, chain, collection, cursor and page size"""
+        provider = getattr(client, "provider_name", type(client).__name__.lower())
+        return f"page:{provider}:{chain.value}:{contract_address}:{cursor or ''}:{page_size}"
+    
+    async def _get_cached_page(
+        self,
+        page_key: str,
+        contract_address: str,
+        chain: Chain,
+    ) -> Optional[CollectionNFTResponse]:
+        """
+        Rebuild a cached collection page (and its next cursor)
+        
+        Cached NFTs were validated when the page was normalized, so they are
+        rebuilt without validating them again (CompactNFTs from the memory
+        cache, their dict form from Redis).
+        """
+        cached = await self.storage.get_cache(page_key)
+        if not cached:
+            return None
+        nfts = []
+        for nft in cached["nfts"]:
+            if isinstance(nft, CompactNFT):
+                nft = nft.to_trusted_nft()
+            elif not isinstance(nft, NormalizedNFT):
+                nft = build_trusted_nft(nft)
+            nfts.append(nft)
+        return CollectionNFTResponse(
+            contract_address=contract_address,
+            chain=chain,
+            total_count=len(nfts),
+            total=cached.get("total"),
+            nfts=nfts,
+            cursor=cached.get("cursor"),
+            has_more=cached.get("has_more", False),
+            resolved_address=cached.get("resolved_address"),
+        )
+    
+    async def _cache_page(self, page_key: str, page: CollectionNFTResponse) -> None:
+        """Cache a normalized page together with the cursor that follows it"""
+        if not page.nfts:
+            # An empty page may be a wrong chain/address guess - don't pin it
+            return
+        keep_raw = self.config.page_cache_raw_metadata
+        await self.storage.set_cache(
+            page_key,
+            {
+                # Compact form: a cached collection can be hundreds of thousands of NFTs. Raw metadata
+                # is left out unless PAGE_CACHE_RAW_METADATA, except where events still need it: the
+                # image fallback of NFTs whose image didn't normalize
+                "nfts": [
+                    CompactNFT.from_nft(nft, keep_raw=keep_raw or nft.image_url is None)
+                    for nft in page.nfts
+                ],
+                "cursor": page.cursor,
+                "has_more": page.has_more,
+                "total": page.total,
+                "resolved_address": page.resolved_address,
+            },
+            ttl=self.config.page_cache_ttl,
+        )
+    
+    async def iter_collection_pages(
+        self,
+        contract_address: str,
+        chain: Chain,
+        cursor: Optional[str] = None,
+        page_size: int = 100,
+        prefetch: int = 2,
+        max_pages: Optional[int] = None,
+        fresh: bool = False,
+    ) -> AsyncIterator[CollectionNFTResponse]:
+        """
+        Walk a collection page by page, fetching ahead of the consumer
+        
+        A background task follows the cursor chain and keeps up to `prefetch`
+        raw pages queued, so page N+1 is already in flight while page N is
+        being normalized and consumed. When the consumer falls behind the
+        queue fills up and fetching pauses (backpressure). Iteration stops
+        when the provider returns no cursor, an empty page, or a cursor it
+        has already returned, or after `max_pages` pages.
+        
+        Pages found in the page cache are replayed without touching the
+        provider, following the cached next cursors; fetched pages are cached
+        as they are consumed. `fresh` skips the page cache and asks the
+        provider for every page (which still replaces the cached one).
+        """
         client = self._get_client_for_chain(chain)
         if not client:
             raise ValueError(f"No client available for {chain}")
         
-        # Check cache - but only use it if we're not starting from the beginning (cursor exists)
-        # This allows fresh scraping while still using cache for pagination
-        cache_key = f"collection:{contract_address}:{chain.value}"
-        cached = None
-        # DISABLED: Cache interferes with pagination counting
-        # Always fetch fresh data to ensure accurate counting
-        # if cursor:  # Only use cache if we're paginating (not starting fresh)
-        #     cached = await self.storage.get_cache(cache_key)
-        #     if cached:
-        #         logger.debug(f"Cache hit for {cache_key} during pagination - {len(cached)} NFTs in cache")
-        #         # For pagination, we still need to fetch from API to get next page
-        #         # Cache is not reliable for pagination, so continue to API fetch
-        #         cached = None
-        
-        # Only use cache if no cursor (meaning we're starting fresh AND have cache)
-        # BUT we should still fetch fresh to ensure we get the latest data
-        # Commented out cache usage on first request to ensure fresh scraping
-        # if not cursor:
-        #     cached = await self.storage.get_cache(cache_key)
-        #     if cached:
-        #         logger.debug(f"Cache hit for {cache_key} - {len(cached)} NFTs in cache")
-        #         # Even on cache hit, try to get total from Helius client if available
-        #         collection_total = None
-        #         if chain == Chain.SOLANA and isinstance(client, HeliusClient):
-        #             helius_last_total = getattr(client, '_last_total', None)
-        #             helius_collection_total = getattr(client, '_collection_total', None)
-        #             logger.debug(f"Cache hit - Checking Helius totals: _last_total={helius_last_total}, _collection_total={helius_collection_total}")
-        #             
-        #             if hasattr(client, '_last_total') and client._last_total:
-        #                 collection_total = client._last_total
-        #                 logger.debug(f"Cache hit - Using _last_total: {collection_total}")
-        #             elif hasattr(client, '_collection_total') and client._collection_total:
-        #                 collection_total = client._collection_total
-        #                 logger.debug(f"Cache hit - Using _collection_total: {collection_total}")
-        #             else:
-        #                 logger.debug(f"Cache hit - Both Helius totals are None")
-        #         
-        #         return CollectionNFTResponse(
-        #             contract_address=contract_address,
-        #             chain=chain,
-        #             total_count=len(cached),
-        #             total=collection_total,  # Include total if available from client
-        #             nfts=cached,
-        #             has_more=False,
-        #         )
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, prefetch))
+        
+        async def produce():
+            page_cursor = cursor
+            seen_cursors = set()
+            pages_fetched = 0
+            try:
+                while True:
+                    page_key = self._page_cache_key(client, contract_address, chain, page_cursor, page_size)
+                    cached = None if fresh else await self._get_cached_page(page_key, contract_address, chain)
+                    if cached is not None:
+                        await queue.put((page_key, cached))
+                        next_cursor = cached.cursor
+                        has_nfts = bool(cached.nfts)
+                    else:
+                        raw_page = await self._fetch_collection_page(
+                            client, contract_address, chain, page_cursor, page_size
+                        )
+                        await queue.put((page_key, raw_page))
+                        next_cursor = self._extract_page_cursor(raw_page[2])
+                        has_nfts = bool(raw_page[1])
+                    pages_fetched += 1
+                    
+                    if not has_nfts or not next_cursor or next_cursor in seen_cursors:
+                        break
+                    if max_pages and pages_fetched >= max_pages:
+                        break
+                    seen_cursors.add(next_cursor)
+                    page_cursor = next_cursor
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                await queue.put(_PageFetchError(e))
+                return
+            await queue.put(_END_OF_PAGES)
+        
+        producer = asyncio.create_task(produce())
+        total = None
+        try:
+            while True:
+                item = await queue.get()
+                if item is _END_OF_PAGES:
+                    break
+                if isinstance(item, _PageFetchError):
+                    raise item.error
+                page_key, page = item
+                if not isinstance(page, CollectionNFTResponse):
+                    source, nfts_data, response = page
+                    normalized = await self._normalize_page(nfts_data, source, chain)
+                    page = self._build_collection_response(
+                        client, contract_address, chain, page_size, normalized, response
+                    )
+                    await self._cache_page(page_key, page)
+                # Some providers (Helius) only report the size with the first page
+                if page.total is None:
+                    page.total = total
+                total = page.total
+                yield page
+        finally:
+            if not producer.done():
+                producer.cancel()
+            try:
+                await producer
+            except (asyncio.CancelledError, Exception):
+                pass
+    
+    async def iter_collection_synced(
+        self,
+        contract_address: str,
+        chain: Chain,
+        cursor: Optional[str] = None,
+        page_size: int = 100,
+        prefetch: int = 2,
+        max_pages: Optional[int] = None,
+        full_resync: bool = False,
+    ) -> AsyncIterator[CollectionNFTResponse]:
+        """
+        Walk a collection, serving what the local collection store already has
+        
+        NFTs stored by earlier scrapes are yielded first, straight from disk.
+        The provider is then only asked for what the last sync didn't cover:
+        an interrupted sync resumes from its next cursor, a finished one
+        re-reads its last page and follows any new cursors (newly minted
+        tokens). Fetched pages are written to the store as they are yielded,
+        together with the cursor reached, so an interrupted walk can resume.
+        
+        Owner, metadata and image changes and burned tokens only show up in a
+        walk from the first page. `full_resync`, or a finished sync whose
+        last full walk is older than COLLECTION_RESYNC_AGE, ignores the sync
+        state and walks the whole collection again: stored NFTs are updated
+        in place, and those the walk no longer sees are deleted when it
+        reaches the end. Walks that continue or redo a stored sync skip the
+        page cache. Without a collection store this is the same as
+        iter_collection_pages.
+        """
+        store = self.collection_store
+        if store is None:
+            async for page in self.iter_collection_pages(
+                contract_address, chain, cursor=cursor, page_size=page_size, prefetch=prefetch, max_pages=max_pages
+            ):
+                yield page
+            return
+        
+        state = None
+        resync = full_resync
+        if cursor is None and not full_resync:
+            state = await store.get_sync_state(chain.value, contract_address)
+            if state and self.sync_is_stale(state):
+                logger.info(
+                    f"Collection store: last full walk of {contract_address} was "
+                    f"{format_age(state['walk_started_at'])}, walking it again"
+                )
+                state = None
+                resync = True
+        
+        served = 0
+        if state:
+            async for batch in store.iter_nfts(chain.value, contract_address, batch_size=page_size):
+                served += len(batch)
+                yield CollectionNFTResponse(
+                    contract_address=contract_address,
+                    chain=chain,
+                    total_count=len(batch),
+                    total=state.get("total"),
+                    nfts=batch,
+                    cursor=None,
+                    has_more=True,
+                )
+            if state["complete"]:
+                cursor = state["last_cursor"]
+            else:
+                cursor = state["next_cursor"] or state["last_cursor"]
+            logger.info(
+                f"Collection store: served {served} stored NFTs of {contract_address}, "
+                f"{'checking the last page' if state['complete'] else 'resuming the interrupted sync'}"
+            )
         
+        page_cursor = cursor
+        # Pages up to the stored cursor boundary were yielded from disk already: the first page
+        # is the stored last page again (a finished sync re-reads it), and after a rejected
+        # cursor the walk restarts from the top. Their stored tokens are filtered out.
+        overlap = bool(state) and cursor == state["last_cursor"]
+        rewalk = False
+        fetched_any = False
+        # Resyncs, resumed syncs and the re-read last page skip the page cache: a cached copy (up to
+        # PAGE_CACHE_TTL old) would hide burned tokens and the new cursor after the old last page
+        pages = self.iter_collection_pages(
+            contract_address, chain, cursor=page_cursor, page_size=page_size, prefetch=prefetch,
+            max_pages=max_pages, fresh=resync or bool(state),
+        )
+        try:
+            while True:
+                try:
+                    page = await pages.__anext__()
+                except StopAsyncIteration:
+                    break
+                except Exception as e:
+                    if fetched_any or not page_cursor or not state:
+                        raise
+                    # Stored cursors can expire; walking from the start is always valid
+                    logger.warning(f"Stored cursor for {contract_address} was rejected ({e}), resyncing from the start")
+                    await pages.aclose()
+                    page_cursor = None
+                    overlap = rewalk = True
+                    pages = self.iter_collection_pages(
+                        contract_address, chain, page_size=page_size, prefetch=prefetch, max_pages=max_pages, fresh=True
+                    )
+                    continue
+                fetched_any = True
+                
+                stored = None
+                if overlap and page.nfts:
+                    # Looked up before this page is written, which would make every token "stored"
+                    stored = await store.stored_token_ids(
+                        chain.value, contract_address, [nft.token_id for nft in page.nfts]
+                    )
+                    overlap = rewalk
+                if page.nfts or not (page.has_more and page.cursor):
+                    # An empty last page still marks the sync complete
+                    await self._store_synced_page(contract_address, chain, page_cursor, page)
+                page_cursor = page.cursor
+                
+                if stored:
+                    page.nfts = [nft for nft in page.nfts if str(nft.token_id) not in stored]
+                    page.total_count = len(page.nfts)
+                    if not page.nfts:
+                        # Consumers stop at an empty page; the cursors after it may hold new tokens
+                        continue
+                yield page
+        finally:
+            await pages.aclose()
+    
+    async def _store_synced_page(
+        self,
+        contract_address: str,
+        chain: Chain,
+        page_cursor: Optional[str],
+        page: CollectionNFTResponse,
+    ) -> None:
+        """Persist a fetched page and how far the walk has got"""
+        now = time.time()
+        complete = not (page.has_more and page.cursor)
+        fields: Dict[str, Any] = {}
+        if page_cursor is None:
+            # A walk from the first page; once complete, rows it didn't rewrite are gone upstream
+            fields["walk_started_at"] = now
+        try:
+            pruned = await self.collection_store.commit_page(
+                chain.value,
+                contract_address,
+                page.nfts,
+                prune=complete,
+                last_cursor=page_cursor,
+                next_cursor=page.cursor,
+                complete=complete,
+                total=page.total,
+                synced_at=now,
+                **fields,
+            )
+        except Exception as e:
+            # The scrape itself can go on; the next one just starts further back
+            logger.warning(f"Collection store write failed for {contract_address}: {e}")
+            return
+        if pruned:
+            logger.info(f"Collection store: removed {pruned} NFTs of {contract_address} the full walk no longer sees")
+    
+    def sync_is_stale(self, state: Dict[str, Any]) -> bool:
+        """Whether a finished sync is old enough (COLLECTION_RESYNC_AGE) to be walked again in full"""
+        max_age = self.config.collection_resync_age
+        if not max_age or not state["complete"]:
+            # An interrupted walk is resumed rather than restarted
+            return False
+        walked_at = state.get("walk_started_at")
+        return walked_at is None or time.time() - walked_at > max_age
+    
+    async def get_sync_info(self, contract_address: str, chain: Chain) -> Optional[Dict[str, Any]]:
+        """
+        What the collection store holds for a collection: its sync state plus
+        the number of stored NFTs and whether the next walk will be a full one
+        
+        None without a collection store or if the collection was never synced.
+        """
+        if self.collection_store is None:
+            return None
+        state = await self.collection_store.get_sync_state(chain.value, contract_address)
+        if state is None:
+            return None
+        state["stored"] = await self.collection_store.count_nfts(chain.value, contract_address)
+        state["stale"] = self.sync_is_stale(state)
+        return state
+    
+    @staticmethod
+    def _extract_page_cursor(response: Any) -> Optional[str]:
+        """Get the next-page cursor from a raw provider response"""
+        if not isinstance(response, dict):
+            return None
+        return response.get("pageKey") or response.get("nextToken") or response.get("page") or response.get("cursor")
+    
+    async def _fetch_collection_page(
+        self,
+        client: Any,
+        contract_address: str,
+        chain: Chain,
+        cursor: Optional[str],
+        page_size: int,
+    ) -> Tuple[str, List[Dict[str, Any]], Dict[str, Any]]:
+        """Fetch one raw page of a collection from the chain's provider"""
         # Fetch from API
         response = None
         if chain == Chain.SOLANA and isinstance(client, HeliusClient):
@@ -302,10 +753,24 @@ class NFTScout:
                 contract_address, chain.value, cursor, page_size
             )
             nfts_data = response.get("nfts", [])
+        elif cursor and cursor.startswith(MORALIS_CURSOR_PREFIX):
+            # Later pages of a walk whose first page was won by the Moralis hedge
+            if not self.moralis:
+                # e.g. a checkpoint resumed after the Moralis key was removed; no other provider can
+                # continue it (a synced walk restarts from the first page on this error)
+                raise ValueError(f"Cursor {cursor} can only be served by Moralis, which is not configured")
+            return await self._fetch_moralis_page(
+                contract_address, chain, cursor[len(MORALIS_CURSOR_PREFIX):], page_size
+            )
         elif isinstance(client, AlchemyClient):
+            if cursor is None and self._can_hedge(client):
+                return await self._fetch_hedged_page(contract_address, chain, page_size)
+            started = time.monotonic()
             response = await client.get_contract_nfts(
                 contract_address, chain.value, cursor, page_size
             )
+            tracker = self.alchemy_page_latency if cursor else self.alchemy_first_page_latency
+            tracker.record(time.monotonic() - started)
             nfts_data = response.get("nfts", [])
             # Store raw response for debugging pageKey extraction
             if chain != Chain.SOLANA and len(nfts_data) == page_size:
@@ -321,20 +786,195 @@ class NFTScout:
             nfts_data = []
             response = {"nfts": [], "pageKey": None, "page": None, "cursor": None}
         
-        # Normalize NFTs
         source = "helius" if chain == Chain.SOLANA else ("alchemy" if isinstance(client, AlchemyClient) else "moralis")
-        normalized = [
-            self.normalizer.normalize_nft_from_source(nft_data, source, chain)
-            for nft_data in nfts_data
-        ]
+        return source, nfts_data, response
+    
+    def _can_hedge(self, client: Any) -> bool:
+        """Whether a page request to this client may be hedged with Moralis"""
+        return bool(self.config.hedge_requests and self.moralis and client is self.alchemy)
+    
+    async def _fetch_alchemy_page(
+        self,
+        contract_address: str,
+        chain: Chain,
+        page_size: int,
+    ) -> Tuple[str, List[Dict[str, Any]], Dict[str, Any]]:
+        """First collection page from Alchemy, timed for the hedge deadline"""
+        started = time.monotonic()
+        response = await self.alchemy.get_contract_nfts(contract_address, chain.value, None, page_size)
+        self.alchemy_first_page_latency.record(time.monotonic() - started)
+        return "alchemy", response.get("nfts", []), response
+    
+    async def _fetch_moralis_page(
+        self,
+        contract_address: str,
+        chain: Chain,
+        cursor: Optional[str],
+        page_size: int,
+    ) -> Tuple[str, List[Dict[str, Any]], Dict[str, Any]]:
+        """Collection page from Moralis with its cursor tagged for routing"""
+        response = await self.moralis.get_contract_nfts(contract_address, chain.value, cursor, page_size)
+        next_cursor = response.get("cursor")
+        tagged = f"{MORALIS_CURSOR_PREFIX}{next_cursor}" if next_cursor else None
+        response = {**response, "cursor": tagged, "pageKey": tagged, "page": tagged}
+        return "moralis", response.get("nfts", []), response
+    
+    async def _fetch_hedged_page(
+        self,
+        contract_address: str,
+        chain: Chain,
+        page_size: int,
+    ) -> Tuple[str, List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        First collection page from Alchemy, hedged with Moralis
+        
+        Alchemy gets a head start equal to its recent p95 page latency. If it
+        has not answered by then, the same page is requested from Moralis and
+        the first non-empty answer wins; the loser is cancelled. Only the
+        first page is hedged: cursors are provider specific, so the rest of
+        the walk stays with the winner (Moralis cursors are tagged).
+        
+        An Alchemy request that loses and is cancelled still adds a sample:
+        the time it had been running (at least the deadline), a lower bound
+        of its latency. Without it the percentile would only see the fast
+        answers and drop exactly when Alchemy slows down.
+        """
+        delay = self.alchemy_first_page_latency.hedge_delay(
+            self.config.hedge_percentile, self.config.hedge_default_delay
+        )
+        started = time.monotonic()
+        primary = asyncio.create_task(self._fetch_alchemy_page(contract_address, chain, page_size))
+        tasks = {primary}
+        hedged = False
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if primary in done and primary.exception() is None:
+                self.hedge_stats["alchemy_won"] += 1
+                return primary.result()
+            
+            if primary not in done:
+                logger.info(f"Alchemy page slower than {delay:.2f}s, hedging with Moralis")
+            self.hedge_stats["hedged"] += 1
+            hedged = True
+            tasks.add(asyncio.create_task(
+                self._fetch_moralis_page(contract_address, chain, None, page_size)
+            ))
+            
+            pending = set(tasks)
+            fallback = None
+            first_error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        first_error = first_error or task.exception()
+                        continue
+                    result = task.result()
+                    if result[1]:
+                        self.hedge_stats[f"{result[0]}_won"] += 1
+                        return result
+                    # Empty page: keep it, but give the other provider a chance
+                    fallback = fallback or result
+            if fallback is not None:
+                return fallback
+            raise first_error
+        finally:
+            if hedged and not primary.done():
+                # Censored sample: Alchemy took at least this long
+                self.alchemy_first_page_latency.record(max(time.monotonic() - started, delay))
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    
+    def _get_normalize_pool(self) -> Optional[ProcessPoolExecutor]:
+        """The normalization process pool, if enabled (created on first use)"""
+        if self.config.normalize_workers <= 0:
+            return None
+        if self._normalize_pool is None:
+            # spawn, not fork: the parent has an event loop and helper threads running
+            self._normalize_pool = ProcessPoolExecutor(
+                max_workers=self.config.normalize_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._normalize_pool
+    
+    async def _normalize_page(
+        self,
+        nfts_data: List[Dict[str, Any]],
+        source: str,
+        chain: Chain,
+    ) -> List[NormalizedNFT]:
+        """
+        Normalize a raw page without holding the event loop for long
+        
+        Pages smaller than `normalize_pool_threshold` are normalized inline.
+        Larger ones are split into `normalize_chunk_size` chunks and sent to
+        the process pool (when NORMALIZE_WORKERS is set): the raw items and
+        the models travel pickled, and raw_metadata is re-attached here from
+        the items we already hold. Without a pool, chunks are normalized
+        inline with a yield to the event loop after each one. If a worker
+        died, the pool is dropped (the next large page starts a new one) and
+        this page is normalized inline; errors raised by the normalizer in a
+        worker propagate like inline ones.
+        """
+        fast = self.config.fast_normalizer
+        if len(nfts_data) < self.config.normalize_pool_threshold:
+            self.normalize_stats["inline_pages"] += 1
+            return [
+                self.normalizer.normalize_nft_from_source(nft_data, source, chain, fast=fast)
+                for nft_data in nfts_data
+            ]
+        
+        chunk_size = max(1, self.config.normalize_chunk_size)
+        chunks = [nfts_data[i:i + chunk_size] for i in range(0, len(nfts_data), chunk_size)]
         
-        # Cache results
-        await self.storage.set_cache(cache_key, normalized, ttl=self.config.cache_ttl)
+        pool = self._get_normalize_pool()
+        if pool is not None:
+            loop = asyncio.get_running_loop()
+            try:
+                results = await asyncio.gather(*[
+                    loop.run_in_executor(pool, normalize_chunk, chunk, source, chain.value, fast)
+                    for chunk in chunks
+                ])
+                normalized: List[NormalizedNFT] = []
+                for chunk, nfts in zip(chunks, results):
+                    for nft_data, nft in zip(chunk, nfts):
+                        nft.raw_metadata = self.normalizer.raw_metadata(nft_data, source)
+                    normalized.extend(nfts)
+                self.normalize_stats["pool_pages"] += 1
+                return normalized
+            except BrokenProcessPool as e:
+                self.normalize_stats["pool_errors"] += 1
+                logger.warning(f"Normalization process pool broke, restarting it and normalizing this page inline: {e}")
+                if self._normalize_pool is pool:
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    self._normalize_pool = None
         
+        normalized = []
+        for chunk in chunks:
+            normalized.extend(
+                self.normalizer.normalize_nft_from_source(nft_data, source, chain, fast=fast)
+                for nft_data in chunk
+            )
+            await asyncio.sleep(0)
+        self.normalize_stats["inline_pages"] += 1
+        return normalized
+    
+    def _build_collection_response(
+        self,
+        client: Any,
+        contract_address: str,
+        chain: Chain,
+        page_size: int,
+        normalized: List[NormalizedNFT],
+        response: Dict[str, Any],
+    ) -> CollectionNFTResponse:
+        """Build a collection page from normalized NFTs and extract its pagination state"""
         # Safe cursor extraction - response should always be a dict
         cursor = None
         has_more = False
         collection_total = None
+        resolved_address = None
         if isinstance(response, dict):
             # For Alchemy, check pageKey first, then nextToken, then page, then cursor
             cursor = response.get("pageKey") or response.get("nextToken") or response.get("page") or response.get("cursor")
@@ -356,20 +996,11 @@ class NFTScout:
             collection_total = response.get("total") or response.get("totalCount") or response.get("totalSupply")
             logger.debug(f"Extracting total from response: total={response.get('total')}, totalCount={response.get('totalCount')}, totalSupply={response.get('totalSupply')}, extracted={collection_total}")
             
-            # Also check Helius client for stored total
-            if not collection_total and chain == Chain.SOLANA and isinstance(client, HeliusClient):
-                helius_last_total = getattr(client, '_last_total', None)
-                helius_collection_total = getattr(client, '_collection_total', None)
-                logger.debug(f"Response had no total, checking Helius client: _last_total={helius_last_total}, _collection_total={helius_collection_total}")
-                
-                if hasattr(client, '_last_total') and client._last_total:
-                    collection_total = client._last_total
-                    logger.debug(f"Using Helius _last_total: {collection_total}")
-                elif hasattr(client, '_collection_total') and client._collection_total:
-                    collection_total = client._collection_total
-                    logger.debug(f"Using Helius _collection_total: {collection_total}")
-                else:
-                    logger.debug(f"Helius client also has no total - collection_total remains None")
+            # Helius reports the collection size only with the first page;
+            # its totalCount is the page length, not a fallback
+            if chain == Chain.SOLANA and isinstance(client, HeliusClient):
+                collection_total = response.get("total")
+                resolved_address = response.get("collection_address")
         
         return CollectionNFTResponse(
             contract_address=contract_address,
@@ -379,6 +1010,7 @@ class NFTScout:
             nfts=normalized,
             cursor=cursor,
             has_more=has_more,
+            resolved_address=resolved_address,
         )
     
     async def get_collection_stats(
@@ -389,15 +1021,101 @@ class NFTScout:
         collection_url: Optional[str] = None,
     ) -> CollectionStats:
         """
-        Get collection statistics by running ALL APIs in parallel
-        Aggregates data from: Helius, Alchemy, Moralis, Magic Eden, Reservoir, Selenium
+        Get collection statistics, served stale-while-revalidate
+        
+        Cached stats younger than `stats_soft_ttl` are returned as is. Between
+        the soft and the hard TTL the cached stats are still returned right
+        away, and a single background task refreshes them. Only a miss (or
+        stats older than `stats_hard_ttl`) waits for the full fan-out, and
+        concurrent callers share that one fetch.
         """
-        # Check cache
         cache_key = f"collection_stats:{contract_address}:{chain.value}"
         cached = await self.storage.get_cache(cache_key)
         if cached:
-            return CollectionStats(**cached)
+            if "fetched_at" not in cached:
+                # Written before stats carried a timestamp; storage TTL bounds its age
+                return CollectionStats(**cached)
+            age = time.time() - cached["fetched_at"]
+            if age < self.config.stats_soft_ttl:
+                return CollectionStats(**cached["stats"])
+            if age < self.config.stats_hard_ttl:
+                logger.debug(f"Serving stale stats for {cache_key} ({age:.0f}s old), refreshing in background")
+                self._refresh_collection_stats(cache_key, contract_address, chain, magic_eden_symbol, collection_url)
+                return CollectionStats(**cached["stats"])
+        
+        refresh = self._refresh_collection_stats(cache_key, contract_address, chain, magic_eden_symbol, collection_url)
+        return await asyncio.shield(refresh)
+    
+    def _refresh_collection_stats(
+        self,
+        cache_key: str,
+        contract_address: str,
+        chain: Chain,
+        magic_eden_symbol: Optional[str],
+        collection_url: Optional[str],
+    ) -> "asyncio.Task[CollectionStats]":
+        """Start (or join) the one refresh of a collection's stats"""
+        task = self._stats_refreshes.get(cache_key)
+        if task is not None and not task.done():
+            return task
+        
+        async def refresh() -> CollectionStats:
+            stats = await self._fetch_collection_stats(contract_address, chain, magic_eden_symbol, collection_url)
+            await self.storage.set_cache(
+                cache_key,
+                {"stats": stats.dict(), "fetched_at": time.time()},
+                ttl=self.config.stats_hard_ttl,
+            )
+            return stats
+        
+        def finished(done: "asyncio.Task[CollectionStats]") -> None:
+            if self._stats_refreshes.get(cache_key) is done:
+                del self._stats_refreshes[cache_key]
+            if not done.cancelled() and done.exception() is not None:
+                logger.warning(f"Collection stats refresh failed for {cache_key}: {done.exception()}")
+        
+        task = asyncio.create_task(refresh())
+        task.add_done_callback(finished)
+        self._stats_refreshes[cache_key] = task
+        return task
+    
+    async def _cached_stats_source(
+        self,
+        source: str,
+        source_id: str,
+        chain: Chain,
+        fetch: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        One source of the collection stats fan-out, cached by how fast it changes
+        
+        Metadata sources are kept for `stats_metadata_ttl`, market sources for
+        `stats_market_ttl`, so refreshing stats normally only calls the market
+        sources. Empty results are not cached.
+        """
+        cache_key = f"stats_source:{source}:{source_id}:{chain.value}"
+        cached = await self.storage.get_cache(cache_key)
+        if cached is not None:
+            self.stats_source_hits[source] = self.stats_source_hits.get(source, 0) + 1
+            return cached
         
+        result = await fetch()
+        if result:
+            ttl = self.config.stats_market_ttl if source in STATS_MARKET_SOURCES else self.config.stats_metadata_ttl
+            await self.storage.set_cache(cache_key, result, ttl=ttl)
+        return result
+    
+    async def _fetch_collection_stats(
+        self,
+        contract_address: str,
+        chain: Chain,
+        magic_eden_symbol: Optional[str] = None,
+        collection_url: Optional[str] = None,
+    ) -> CollectionStats:
+        """
+        Get collection statistics by running ALL APIs in parallel
+        Aggregates data from: Helius, Alchemy, Moralis, Magic Eden, Reservoir, Selenium
+        """
         # Prepare tasks for parallel execution
         tasks = {}
         results = {}
@@ -408,7 +1126,10 @@ class NFTScout:
         if chain == Chain.SOLANA:
             # Task 1: Helius (base metadata)
             if isinstance(client, HeliusClient):
-                tasks["helius"] = client.get_collection_metadata(contract_address, chain.value)
+                tasks["helius"] = self._cached_stats_source(
+                    "helius", contract_address, chain,
+                    lambda: client.get_collection_metadata(contract_address, chain.value),
+                )
             
             # Task 2: Magic Eden stats
             if self.magiceden:
@@ -418,35 +1139,59 @@ class NFTScout:
                         me_symbol = contract_address
                 
                 if me_symbol:
-                    tasks["magiceden_stats"] = self.magiceden.get_collection_stats(me_symbol)
-                    tasks["magiceden_info"] = self.magiceden.get_collection_info(me_symbol)
+                    tasks["magiceden_stats"] = self._cached_stats_source(
+                        "magiceden_stats", me_symbol, chain,
+                        lambda: self.magiceden.get_collection_stats(me_symbol),
+                    )
+                    tasks["magiceden_info"] = self._cached_stats_source(
+                        "magiceden_info", me_symbol, chain,
+                        lambda: self.magiceden.get_collection_info(me_symbol),
+                    )
             
             # Task 3: Moralis (if available for Solana)
             if self.moralis:
-                tasks["moralis"] = self.moralis.get_collection_metadata(contract_address, chain.value)
+                tasks["moralis"] = self._cached_stats_source(
+                    "moralis", contract_address, chain,
+                    lambda: self.moralis.get_collection_metadata(contract_address, chain.value),
+                )
         
         # === EVM CHAINS ===
         else:
             # Task 1: Alchemy (primary for EVM)
             if isinstance(client, AlchemyClient):
-                tasks["alchemy"] = client.get_collection_metadata(contract_address, chain.value)
+                tasks["alchemy"] = self._cached_stats_source(
+                    "alchemy", contract_address, chain,
+                    lambda: client.get_collection_metadata(contract_address, chain.value),
+                )
             
             # Task 2: Moralis
             if self.moralis:
-                tasks["moralis"] = self.moralis.get_collection_metadata(contract_address, chain.value)
+                tasks["moralis"] = self._cached_stats_source(
+                    "moralis", contract_address, chain,
+                    lambda: self.moralis.get_collection_metadata(contract_address, chain.value),
+                )
             
             # Task 3: Reservoir (marketplace data)
             if self.reservoir:
-                tasks["reservoir"] = self.reservoir.get_collection_stats(contract_address, chain.value)
+                tasks["reservoir"] = self._cached_stats_source(
+                    "reservoir", contract_address, chain,
+                    lambda: self.reservoir.get_collection_stats(contract_address, chain.value),
+                )
             
             # Task 4: QuickNode (fallback)
             if self.quicknode:
-                tasks["quicknode"] = self.quicknode.get_collection_metadata(contract_address, chain.value)
+                tasks["quicknode"] = self._cached_stats_source(
+                    "quicknode", contract_address, chain,
+                    lambda: self.quicknode.get_collection_metadata(contract_address, chain.value),
+                )
         
         # Task 5: Selenium scraper (if URL provided) - with timeout to prevent hanging
         # Note: Selenium already has timeout built in, but we add it here as safety
         if self.selenium_scraper and collection_url:
-            tasks["selenium"] = self.selenium_scraper.get_collection_info_from_url(collection_url)
+            tasks["selenium"] = self._cached_stats_source(
+                "selenium", collection_url, chain,
+                lambda: self.selenium_scraper.get_collection_info_from_url(collection_url),
+            )
         
         # Execute ALL tasks in parallel with worker limit
         logger.info(f"Fetching collection stats from {len(tasks)} sources in parallel (max {self.config.max_workers} workers)...")
@@ -702,13 +1447,6 @@ class NFTScout:
                 name=contract_address,
             )
         
-        # Cache results
-        await self.storage.set_cache(
-            cache_key,
-            stats.dict(),
-            ttl=self.config.cache_ttl,
-        )
-        
         logger.info(f"✅ Aggregated collection stats from {len([k for k in results if results[k]])} sources")
         
         return stats
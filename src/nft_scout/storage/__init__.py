@@ -3,12 +3,15 @@
 from .base import StorageAdapter
 from .memory import MemoryStorage
 from .redis_adapter import RedisStorage
+from .tiered import TieredStorage
 
-__all__ = ["MemoryStorage", "RedisStorage", "StorageAdapter"]
+__all__ = ["MemoryStorage", "RedisStorage", "TieredStorage", "StorageAdapter"]
 
 
 def get_storage_adapter(config):
     """Get appropriate storage adapter based on config"""
+    if config.cache_type == "tiered" and config.redis_url:
+        return TieredStorage(config)
     if config.cache_type == "redis" and config.redis_url:
         return RedisStorage(config)
     return MemoryStorage(config)
@@ -1,7 +1,7 @@
 """Base storage adapter"""
 
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from typing import Any, Optional, Dict, List
 
 
 class StorageAdapter(ABC):
@@ -21,4 +21,22 @@ class StorageAdapter(ABC):
     async def delete_cache(self, key: str) -> None:
         """Delete cached value"""
         pass
+    
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Get several cached values (missing keys are left out)"""
+        result: Dict[str, Any] = {}
+        for key in keys:
+            value = await self.get_cache(key)
+            if value is not None:
+                result[key] = value
+        return result
+    
+    async def set_many(self, items: Dict[str, Any], ttl: int = 900) -> None:
+        """Set several cached values with the same TTL"""
+        for key, value in items.items():
+            await self.set_cache(key, value, ttl=ttl)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache counters for monitoring (adapters override when they track any)"""
+        return {}
 
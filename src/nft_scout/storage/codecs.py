@@ -0,0 +1,164 @@
+"""Binary codecs for cached values (serialization + optional compression)"""
+
+import json
+import zlib
+from abc import ABC, abstractmethod
+from datetime import datetime, date
+from typing import Any, Optional
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+    msgpack = None
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+    zstandard = None
+
+from loguru import logger
+
+# First byte of every encoded payload says how the rest is compressed
+_RAW = b"\x00"
+_ZLIB = b"\x01"
+_ZSTD = b"\x02"
+
+
+def _to_serializable(value: Any) -> Any:
+    """Fallback for values the serializer doesn't know (models, compact NFTs, datetimes, enums)"""
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if hasattr(value, "value"):
+        return value.value
+    return str(value)
+
+
+class Codec(ABC):
+    """
+    Turns cache values into bytes and back
+    
+    Payloads larger than `compress_threshold` bytes are compressed with
+    `compression` ("zlib", "zstd" or "none"). A one-byte header records what
+    was used, so values written with one setting can be read with another.
+    """
+    
+    name = "base"
+    
+    def __init__(self, compression: str = "zlib", compress_threshold: int = 16384, level: int = 3):
+        if compression == "zstd" and not ZSTD_AVAILABLE:
+            logger.warning("zstandard not installed - falling back to zlib compression")
+            compression = "zlib"
+        self.compression = compression
+        self.compress_threshold = compress_threshold
+        self.level = level
+        self._zstd_compressor = zstandard.ZstdCompressor(level=level) if compression == "zstd" else None
+    
+    @abstractmethod
+    def serialize(self, value: Any) -> bytes:
+        """Turn a value into uncompressed bytes"""
+        pass
+    
+    @abstractmethod
+    def deserialize(self, data: bytes) -> Any:
+        """Turn uncompressed bytes back into a value"""
+        pass
+    
+    def encode(self, value: Any) -> bytes:
+        data = self.serialize(value)
+        if self.compression == "none" or len(data) < self.compress_threshold:
+            return _RAW + data
+        if self._zstd_compressor is not None:
+            return _ZSTD + self._zstd_compressor.compress(data)
+        return _ZLIB + zlib.compress(data, self.level)
+    
+    def decode(self, payload: Optional[bytes]) -> Any:
+        if not payload:
+            return None
+        if isinstance(payload, str):
+            # Written by an older version (plain JSON text)
+            return json.loads(payload)
+        header, body = payload[:1], payload[1:]
+        if header == _RAW:
+            return self.deserialize(body)
+        if header == _ZLIB:
+            return self.deserialize(zlib.decompress(body))
+        if header == _ZSTD:
+            if not ZSTD_AVAILABLE:
+                raise ValueError("Cached value is zstd-compressed but zstandard is not installed")
+            return self.deserialize(zstandard.ZstdDecompressor().decompress(body))
+        # No header: plain JSON from before codecs existed
+        return json.loads(payload)
+
+
+class JSONCodec(Codec):
+    """Standard library JSON"""
+    
+    name = "json"
+    
+    def serialize(self, value: Any) -> bytes:
+        return json.dumps(value, default=_to_serializable, separators=(",", ":")).encode()
+    
+    def deserialize(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(Codec):
+    """orjson: several times faster than json, same wire format"""
+    
+    name = "orjson"
+    
+    def serialize(self, value: Any) -> bytes:
+        return orjson.dumps(value, default=_to_serializable)
+    
+    def deserialize(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+class MsgpackCodec(Codec):
+    """msgpack: compact binary encoding"""
+    
+    name = "msgpack"
+    
+    def serialize(self, value: Any) -> bytes:
+        return msgpack.packb(value, default=_to_serializable, use_bin_type=True)
+    
+    def deserialize(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, raw=False)
+
+
+def get_codec(name: str = "auto", compression: str = "zlib", compress_threshold: int = 16384) -> Codec:
+    """
+    Get a codec by name ("auto", "orjson", "msgpack" or "json")
+    
+    "auto" picks orjson when installed and stdlib json otherwise. Asking for
+    a codec whose package is missing falls back the same way.
+    """
+    name = (name or "auto").lower()
+    if name == "msgpack" and not MSGPACK_AVAILABLE:
+        logger.warning("msgpack not installed - falling back to JSON codec")
+        name = "auto"
+    if name == "orjson" and not ORJSON_AVAILABLE:
+        logger.warning("orjson not installed - falling back to stdlib JSON codec")
+        name = "json"
+    if name == "auto":
+        name = "orjson" if ORJSON_AVAILABLE else "json"
+    
+    codec_cls = {"json": JSONCodec, "orjson": OrjsonCodec, "msgpack": MsgpackCodec}.get(name)
+    if codec_cls is None:
+        raise ValueError(f"Unknown cache codec: {name}")
+    return codec_cls(compression=compression, compress_threshold=compress_threshold)
@@ -1,45 +1,169 @@
 """In-memory storage adapter"""
 
-import asyncio
-from typing import Any, Optional, Dict
-from datetime import datetime, timedelta
-from cachetools import TTLCache
+import sys
+import time
+from collections import OrderedDict
+from itertools import islice
+from typing import Any, Optional, Dict, NamedTuple
 
 from .base import StorageAdapter
 from ..config import Config
 
+# Long lists are sized from a sample of their items
+_SIZE_SAMPLE = 32
+# Nested structures deeper than this are counted as a flat object
+_SIZE_MAX_DEPTH = 6
+# Full scans for expired entries run at most this often (seconds)
+_SWEEP_INTERVAL = 60.0
+
+
+def approximate_size(value: Any, depth: int = 0) -> int:
+    """
+    Rough deep size of a cached value in bytes
+    
+    Walks dicts, lists, tuples, sets and object attributes (__dict__ or
+    __slots__). Large containers
+    are sized from a sample of their items, so sizing a page of 10,000 NFTs
+    stays cheap. The result is an estimate for eviction, not an exact figure.
+    """
+    size = sys.getsizeof(value)
+    if depth >= _SIZE_MAX_DEPTH or isinstance(value, (str, bytes, bytearray, int, float, bool)) or value is None:
+        return size
+    
+    if isinstance(value, dict):
+        items = list(value.items())
+        if not items:
+            return size
+        sample = items[:_SIZE_SAMPLE]
+        sampled = sum(approximate_size(k, depth + 1) + approximate_size(v, depth + 1) for k, v in sample)
+        return size + sampled * len(items) // len(sample)
+    
+    if isinstance(value, (list, tuple, set, frozenset)):
+        if not value:
+            return size
+        sample = list(islice(value, _SIZE_SAMPLE))
+        sampled = sum(approximate_size(item, depth + 1) for item in sample)
+        return size + sampled * len(value) // len(sample)
+    
+    attributes = getattr(value, "__dict__", None)
+    if attributes:
+        return size + approximate_size(attributes, depth + 1)
+    slots = getattr(type(value), "__slots__", None)
+    if slots:
+        return size + sum(approximate_size(getattr(value, name, None), depth + 1) for name in slots)
+    return size
+
+
+class _Entry(NamedTuple):
+    value: Any
+    expires_at: float
+    size: int
+
 
 class MemoryStorage(StorageAdapter):
-    """In-memory TTL cache"""
+    """
+    In-memory cache with a TTL per entry and a byte budget
+    
+    Entries are kept in LRU order. When the approximate size of all entries
+    exceeds `cache_max_bytes` (or the entry count exceeds `cache_max_entries`)
+    the least recently used entries are evicted. Expired entries are dropped
+    when they are read or reach the LRU head while evicting; a full sweep
+    for the rest runs at most once a minute, so writes stay O(1) amortised.
+    
+    There is no lock. Every operation runs to completion without awaiting, so
+    on the event loop it is atomic with respect to other coroutines: a read
+    never waits behind another read or a write, and never yields. Sizing a
+    value (the only expensive part of a write) happens before the entry is
+    touched.
+    """
     
     def __init__(self, config: Config):
         self.config = config
-        # Create TTL cache with max size
-        max_size = 10000
-        self.cache: TTLCache[str, Any] = TTLCache(
-            maxsize=max_size,
-            ttl=config.cache_ttl,
-        )
-        self._lock = asyncio.Lock()
+        self.max_bytes = config.cache_max_bytes
+        self.max_entries = config.cache_max_entries
+        self.cache: "OrderedDict[str, _Entry]" = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._swept_at = time.monotonic()
+    
+    def _remove(self, key: str) -> Optional[_Entry]:
+        entry = self.cache.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry.size
+        return entry
+    
+    def _purge_expired(self, now: float) -> None:
+        expired = [key for key, entry in self.cache.items() if entry.expires_at <= now]
+        for key in expired:
+            self._remove(key)
+        self.expirations += len(expired)
+    
+    def _make_room(self, incoming: int, now: float) -> None:
+        """Evict until an entry of `incoming` bytes fits in the budget"""
+        if now - self._swept_at >= _SWEEP_INTERVAL:
+            self._swept_at = now
+            self._purge_expired(now)
+        while self.cache and (
+            self.current_bytes + incoming > self.max_bytes or len(self.cache) >= self.max_entries
+        ):
+            _, entry = self.cache.popitem(last=False)
+            self.current_bytes -= entry.size
+            if entry.expires_at <= now:
+                self.expirations += 1
+            else:
+                self.evictions += 1
+    
+    def get_nowait(self, key: str) -> Optional[Any]:
+        """Synchronous lookup, usable from non-async code on the loop thread"""
+        entry = self.cache.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self.cache.move_to_end(key)
+        self.hits += 1
+        return entry.value
     
     async def get_cache(self, key: str) -> Optional[Any]:
         """Get cached value"""
-        async with self._lock:
-            return self.cache.get(key)
+        return self.get_nowait(key)
     
     async def set_cache(self, key: str, value: Any, ttl: int = 900) -> None:
         """Set cached value with TTL"""
-        async with self._lock:
-            # Create temporary cache with custom TTL if needed
-            if ttl != self.config.cache_ttl:
-                # For custom TTL, we'd need a different approach
-                # For now, use default TTL
-                self.cache[key] = value
-            else:
-                self.cache[key] = value
+        size = approximate_size(value)
+        self._remove(key)
+        if size > self.max_bytes:
+            # Would evict everything else and still not fit
+            self.evictions += 1
+            return
+        now = time.monotonic()
+        self._make_room(size, now)
+        self.cache[key] = _Entry(value, now + ttl, size)
+        self.current_bytes += size
     
     async def delete_cache(self, key: str) -> None:
         """Delete cached value"""
-        async with self._lock:
-            self.cache.pop(key, None)
-
+        self._remove(key)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters and memory use"""
+        lookups = self.hits + self.misses
+        return {
+            "type": "memory",
+            "entries": len(self.cache),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
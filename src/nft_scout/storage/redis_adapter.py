@@ -1,7 +1,7 @@
 """Redis storage adapter (optional)"""
 
-import json
-from typing import Any, Optional
+from typing import Any, Optional, Dict, List
+from loguru import logger
 
 try:
     import redis.asyncio as redis
@@ -11,18 +11,36 @@ except ImportError:
     redis = None
 
 from .base import StorageAdapter
+from .codecs import get_codec
 from ..config import Config
 
 
 class RedisStorage(StorageAdapter):
-    """Redis-based storage adapter"""
+    """
+    Redis-based storage adapter
+    
+    Values are stored as bytes produced by a pluggable codec (orjson, msgpack
+    or json, compressed above a size threshold). Connections come from a
+    shared pool, and get_many/set_many batch many keys into one round trip.
+    """
     
     def __init__(self, config: Config):
         self.config = config
         self.redis_client: Optional[Any] = None
+        self.pool: Optional[Any] = None
         self._initialized = False
         if not REDIS_AVAILABLE:
             raise ImportError("redis package not installed. Install with: pip install redis")
+        self.codec = get_codec(
+            config.cache_codec,
+            compression=config.cache_compression,
+            compress_threshold=config.cache_compress_threshold,
+        )
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
     
     async def _ensure_connected(self):
         """Ensure Redis connection is established"""
@@ -31,22 +49,31 @@ class RedisStorage(StorageAdapter):
                 raise ValueError("Redis URL not configured")
             if not REDIS_AVAILABLE:
                 raise ImportError("redis package not installed")
-            self.redis_client = await redis.from_url(
+            # Raw bytes in and out: the codec does the decoding, once
+            self.pool = redis.ConnectionPool.from_url(
                 self.config.redis_url,
-                decode_responses=True,
+                max_connections=self.config.redis_max_connections,
+                decode_responses=False,
             )
+            self.redis_client = redis.Redis(connection_pool=self.pool)
             self._initialized = True
     
+    def _decode(self, payload: Optional[bytes]) -> Optional[Any]:
+        if payload is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.bytes_read += len(payload)
+        return self.codec.decode(payload)
+    
     async def get_cache(self, key: str) -> Optional[Any]:
         """Get cached value from Redis"""
         try:
             await self._ensure_connected()
-            value = await self.redis_client.get(key)
-            if value:
-                return json.loads(value)
-            return None
+            return self._decode(await self.redis_client.get(key))
         except Exception as e:
             # Fallback to None if Redis unavailable
+            self.errors += 1
             logger.debug(f"Redis get_cache error: {e}")
             return None
     
@@ -54,12 +81,50 @@ class RedisStorage(StorageAdapter):
         """Set cached value in Redis with TTL"""
         try:
             await self._ensure_connected()
-            serialized = json.dumps(value, default=str)
-            await self.redis_client.setex(key, ttl, serialized)
+            payload = self.codec.encode(value)
+            await self.redis_client.setex(key, ttl, payload)
+            self.bytes_written += len(payload)
         except Exception as e:
             # Silently fail if Redis unavailable
+            self.errors += 1
             logger.debug(f"Redis set_cache error: {e}")
     
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Get several cached values in one round trip (missing keys are left out)"""
+        if not keys:
+            return {}
+        try:
+            await self._ensure_connected()
+            payloads = await self.redis_client.mget(keys)
+            result: Dict[str, Any] = {}
+            for key, payload in zip(keys, payloads):
+                value = self._decode(payload)
+                if value is not None:
+                    result[key] = value
+            return result
+        except Exception as e:
+            self.errors += 1
+            logger.debug(f"Redis get_many error: {e}")
+            return {}
+    
+    async def set_many(self, items: Dict[str, Any], ttl: int = 900) -> None:
+        """Set several cached values in one pipelined round trip"""
+        if not items:
+            return
+        try:
+            await self._ensure_connected()
+            written = 0
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    payload = self.codec.encode(value)
+                    written += len(payload)
+                    pipe.setex(key, ttl, payload)
+                await pipe.execute()
+            self.bytes_written += written
+        except Exception as e:
+            self.errors += 1
+            logger.debug(f"Redis set_many error: {e}")
+    
     async def delete_cache(self, key: str) -> None:
         """Delete cached value from Redis"""
         try:
@@ -69,8 +134,28 @@ class RedisStorage(StorageAdapter):
             # Redis unavailable or error, silently fail
             logger.debug(f"Redis delete_cache error: {e}")
     
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and traffic"""
+        lookups = self.hits + self.misses
+        return {
+            "type": "redis",
+            "codec": self.codec.name,
+            "compression": self.codec.compression,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "errors": self.errors,
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written,
+            "pool_max_connections": self.config.redis_max_connections,
+        }
+    
     async def close(self):
         """Close Redis connection"""
         if self.redis_client:
-            await self.redis_client.close()
-
+            if hasattr(self.redis_client, "aclose"):
+                await self.redis_client.aclose()
+            else:
+                await self.redis_client.close()
+        if self.pool:
+            await self.pool.disconnect()
@@ -0,0 +1,389 @@
+"""Persistent on-disk store of scraped collections (SQLite, WAL mode)"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional, Dict, List, AsyncIterator, Set
+from loguru import logger
+
+from .codecs import get_codec
+from ..models import NormalizedNFT
+from ..utils import normalize_contract_address
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS nfts (
+    chain TEXT NOT NULL,
+    contract TEXT NOT NULL,
+    token_id TEXT NOT NULL,
+    data BLOB NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (chain, contract, token_id)
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    chain TEXT NOT NULL,
+    contract TEXT NOT NULL,
+    last_cursor TEXT,
+    next_cursor TEXT,
+    complete INTEGER NOT NULL DEFAULT 0,
+    total INTEGER,
+    synced_at REAL,
+    walk_started_at REAL,
+    PRIMARY KEY (chain, contract)
+);
+CREATE TABLE IF NOT EXISTS scrape_jobs (
+    job_id TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    params BLOB NOT NULL,
+    progress BLOB NOT NULL,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    token TEXT
+);
+"""
+
+_SYNC_FIELDS = ("last_cursor", "next_cursor", "complete", "total", "synced_at", "walk_started_at")
+_JOB_FIELDS = ("job_id", "state", "params", "progress", "error", "created_at", "updated_at", "token")
+
+
+class CollectionStore:
+    """
+    NormalizedNFT records keyed by (chain, contract, token_id), plus sync state
+    
+    Contract addresses are stored in canonical form (EVM addresses
+    lowercased), so a checksummed and a lowercase request hit the same rows.
+    
+    `sync_state` remembers where the last walk of a collection stopped: the
+    cursor of the last page fetched (`last_cursor`), the cursor after it
+    (`next_cursor`) and whether the walk reached the end. That is enough to
+    resume an interrupted scrape, or to re-check only the tail of a finished
+    one for newly minted tokens. `synced_at` is the time of the last page
+    written; `walk_started_at` is when the last walk from the first page
+    began, i.e. how old the oldest stored row can be once that walk is
+    complete.
+    
+    `scrape_jobs` holds checkpoints of background scrape jobs (parameters,
+    counters, state, owner token) so an interrupted job can be resumed by
+    id; the pages it got through are the collection's stored NFTs and sync
+    state.
+    
+    SQLite calls are blocking, so they run in a worker thread; one connection
+    is shared behind a lock. WAL mode lets readers proceed while a page is
+    being written.
+    """
+    
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.codec = get_codec("auto", compression="none")
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        job_columns = {row[1] for row in self._conn.execute("PRAGMA table_info(scrape_jobs)")}
+        if "token" not in job_columns:
+            # Stores created before jobs had owner tokens
+            self._conn.execute("ALTER TABLE scrape_jobs ADD COLUMN token TEXT")
+        sync_columns = {row[1] for row in self._conn.execute("PRAGMA table_info(sync_state)")}
+        if "walk_started_at" not in sync_columns:
+            # Stores created before full resyncs; their collections count as never fully walked
+            self._conn.execute("ALTER TABLE sync_state ADD COLUMN walk_started_at REAL")
+        self._lock = threading.Lock()
+        logger.debug(f"Collection store opened at {self.path}")
+    
+    def _run(self, fn, *args):
+        def locked():
+            with self._lock:
+                return fn(*args)
+        return asyncio.to_thread(locked)
+    
+    def _encode(self, nft: NormalizedNFT) -> bytes:
+        return self.codec.encode(nft.model_dump(mode="json"))
+    
+    def _decode(self, data: bytes) -> NormalizedNFT:
+        return NormalizedNFT(**self.codec.decode(data))
+    
+    async def upsert_nfts(self, chain: str, contract: str, nfts: List[NormalizedNFT]) -> None:
+        """Insert or update a page of NFTs (first-seen order is kept)"""
+        contract = normalize_contract_address(contract, chain)
+        if not nfts:
+            return
+        now = time.time()
+        rows = [(chain, contract, str(nft.token_id), self._encode(nft), now) for nft in nfts]
+        
+        def write():
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "INSERT INTO nfts (chain, contract, token_id, data, updated_at) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (chain, contract, token_id) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at",
+                    rows,
+                )
+        
+        await self._run(write)
+    
+    async def count_nfts(self, chain: str, contract: str) -> int:
+        """Number of stored NFTs of a collection"""
+        contract = normalize_contract_address(contract, chain)
+        def read():
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM nfts WHERE chain = ? AND contract = ?", (chain, contract)
+            ).fetchone()
+            return row[0]
+        return await self._run(read)
+    
+    async def iter_nfts(self, chain: str, contract: str, batch_size: int = 1000) -> AsyncIterator[List[NormalizedNFT]]:
+        """Stored NFTs of a collection, in batches, in the order they were first seen"""
+        contract = normalize_contract_address(contract, chain)
+        last_rowid = 0
+        while True:
+            def read(after=last_rowid):
+                return self._conn.execute(
+                    "SELECT rowid, data FROM nfts WHERE chain = ? AND contract = ? AND rowid > ? "
+                    "ORDER BY rowid LIMIT ?",
+                    (chain, contract, after, batch_size),
+                ).fetchall()
+            rows = await self._run(read)
+            if not rows:
+                return
+            last_rowid = rows[-1][0]
+            yield [self._decode(data) for _, data in rows]
+            if len(rows) < batch_size:
+                return
+    
+    async def get_nft(self, chain: str, contract: str, token_id: str) -> Optional[NormalizedNFT]:
+        """One stored NFT, or None"""
+        contract = normalize_contract_address(contract, chain)
+        def read():
+            return self._conn.execute(
+                "SELECT data FROM nfts WHERE chain = ? AND contract = ? AND token_id = ?",
+                (chain, contract, str(token_id)),
+            ).fetchone()
+        row = await self._run(read)
+        return self._decode(row[0]) if row else None
+    
+    async def get_nfts(self, chain: str, contract: str, token_ids: List[str]) -> Dict[str, NormalizedNFT]:
+        """Stored NFTs among `token_ids`, by token id"""
+        contract = normalize_contract_address(contract, chain)
+        ids = [str(token_id) for token_id in token_ids]
+        
+        def read():
+            found = []
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                found.extend(self._conn.execute(
+                    "SELECT token_id, data FROM nfts WHERE chain = ? AND contract = ? "
+                    f"AND token_id IN ({', '.join('?' * len(chunk))})",
+                    (chain, contract, *chunk),
+                ).fetchall())
+            return found
+        rows = await self._run(read)
+        return {token_id: self._decode(data) for token_id, data in rows}
+    
+    async def _stored_raw_metadata(self, chain: str, contract: str, token_ids: List[str]) -> Dict[str, Any]:
+        """raw_metadata of stored NFTs among `token_ids` (contract already canonical), by token id"""
+        def read():
+            found = []
+            for start in range(0, len(token_ids), 500):
+                chunk = token_ids[start:start + 500]
+                found.extend(self._conn.execute(
+                    "SELECT token_id, data FROM nfts WHERE chain = ? AND contract = ? "
+                    f"AND token_id IN ({', '.join('?' * len(chunk))})",
+                    (chain, contract, *chunk),
+                ).fetchall())
+            return found
+        rows = await self._run(read)
+        return {token_id: self.codec.decode(data).get("raw_metadata") for token_id, data in rows}
+    
+    async def stored_token_ids(self, chain: str, contract: str, token_ids: List[str]) -> Set[str]:
+        """Which of `token_ids` are already stored for a collection"""
+        contract = normalize_contract_address(contract, chain)
+        ids = [str(token_id) for token_id in token_ids]
+        
+        def read():
+            found = set()
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                rows = self._conn.execute(
+                    "SELECT token_id FROM nfts WHERE chain = ? AND contract = ? "
+                    f"AND token_id IN ({', '.join('?' * len(chunk))})",
+                    (chain, contract, *chunk),
+                ).fetchall()
+                found.update(row[0] for row in rows)
+            return found
+        return await self._run(read)
+    
+    async def get_sync_state(self, chain: str, contract: str) -> Optional[Dict[str, Any]]:
+        """Where the last walk of a collection stopped, if it was ever synced"""
+        contract = normalize_contract_address(contract, chain)
+        def read():
+            return self._conn.execute(
+                f"SELECT {', '.join(_SYNC_FIELDS)} FROM sync_state WHERE chain = ? AND contract = ?",
+                (chain, contract),
+            ).fetchone()
+        row = await self._run(read)
+        if row is None:
+            return None
+        state = dict(zip(_SYNC_FIELDS, row))
+        state["complete"] = bool(state["complete"])
+        return state
+    
+    @staticmethod
+    def _sync_state_statement(chain: str, contract: str, fields: Dict[str, Any]):
+        contract = normalize_contract_address(contract, chain)
+        unknown = set(fields) - set(_SYNC_FIELDS)
+        if unknown or not fields:
+            raise ValueError(f"Invalid sync state fields: {sorted(unknown)}")
+        if "complete" in fields:
+            fields["complete"] = int(bool(fields["complete"]))
+        columns = ", ".join(fields)
+        placeholders = ", ".join("?" for _ in fields)
+        updates = ", ".join(f"{name} = excluded.{name}" for name in fields)
+        sql = (
+            f"INSERT INTO sync_state (chain, contract, {columns}) VALUES (?, ?, {placeholders}) "
+            f"ON CONFLICT (chain, contract) DO UPDATE SET {updates}"
+        )
+        return sql, (chain, contract, *fields.values())
+    
+    async def save_sync_state(self, chain: str, contract: str, **fields: Any) -> None:
+        """Create or update the sync state of a collection"""
+        sql, params = self._sync_state_statement(chain, contract, fields)
+        
+        def write():
+            self._conn.execute(sql, params)
+        
+        await self._run(write)
+    
+    async def commit_page(
+        self,
+        chain: str,
+        contract: str,
+        nfts: List[NormalizedNFT],
+        prune: bool = False,
+        **sync_fields: Any,
+    ) -> int:
+        """
+        Store a fetched page and the sync state it leads to in one transaction
+        
+        After a crash the sync state never points past NFTs that weren't
+        written, so a resumed walk continues from the last committed page.
+        
+        `prune` is for the last page of a walk: stored NFTs not written since
+        the collection's `walk_started_at` were not seen by the walk from the
+        first page (burned or moved out of the collection) and are deleted.
+        Returns how many were.
+        
+        NFTs without raw_metadata (pages replayed from the page cache, which
+        leaves it out) keep the raw_metadata already stored for them.
+        """
+        contract = normalize_contract_address(contract, chain)
+        sql, params = self._sync_state_statement(chain, contract, sync_fields)
+        without_raw = [str(nft.token_id) for nft in nfts if nft.raw_metadata is None]
+        if without_raw:
+            stored_raw = await self._stored_raw_metadata(chain, contract, without_raw)
+            nfts = [
+                nft.model_copy(update={"raw_metadata": stored_raw[str(nft.token_id)]})
+                if nft.raw_metadata is None and stored_raw.get(str(nft.token_id)) is not None else nft
+                for nft in nfts
+            ]
+        now = time.time()
+        rows = [(chain, contract, str(nft.token_id), self._encode(nft), now) for nft in nfts]
+        
+        def write():
+            with self._conn:
+                self._conn.execute("BEGIN")
+                if rows:
+                    self._conn.executemany(
+                        "INSERT INTO nfts (chain, contract, token_id, data, updated_at) VALUES (?, ?, ?, ?, ?) "
+                        "ON CONFLICT (chain, contract, token_id) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at",
+                        rows,
+                    )
+                self._conn.execute(sql, params)
+                if not prune:
+                    return 0
+                # No walk from the first page yet (NULL): nothing is known to be gone
+                cursor = self._conn.execute(
+                    "DELETE FROM nfts WHERE chain = ? AND contract = ? AND updated_at < "
+                    "(SELECT walk_started_at FROM sync_state WHERE chain = ? AND contract = ?)",
+                    (chain, contract, chain, contract),
+                )
+                return cursor.rowcount
+        
+        return await self._run(write)
+    
+    async def delete_collection(self, chain: str, contract: str) -> None:
+        """Forget a collection (forces the next scrape to start from zero)"""
+        contract = normalize_contract_address(contract, chain)
+        def write():
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.execute("DELETE FROM nfts WHERE chain = ? AND contract = ?", (chain, contract))
+                self._conn.execute("DELETE FROM sync_state WHERE chain = ? AND contract = ?", (chain, contract))
+        await self._run(write)
+    
+    async def save_job_checkpoint(
+        self,
+        job_id: str,
+        state: str,
+        params: Dict[str, Any],
+        progress: Dict[str, Any],
+        error: Optional[str] = None,
+        created_at: Optional[float] = None,
+        token: Optional[str] = None,
+    ) -> None:
+        """Create or update the checkpoint of a scrape job"""
+        now = time.time()
+        row = (job_id, state, self.codec.encode(params), self.codec.encode(progress), error, created_at or now, now, token)
+        
+        def write():
+            self._conn.execute(
+                f"INSERT INTO scrape_jobs ({', '.join(_JOB_FIELDS)}) VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (job_id) DO UPDATE SET state = excluded.state, params = excluded.params, "
+                "progress = excluded.progress, error = excluded.error, updated_at = excluded.updated_at",
+                row,
+            )
+        
+        await self._run(write)
+    
+    def _job_row(self, row) -> Dict[str, Any]:
+        checkpoint = dict(zip(_JOB_FIELDS, row))
+        checkpoint["params"] = self.codec.decode(checkpoint["params"])
+        checkpoint["progress"] = self.codec.decode(checkpoint["progress"])
+        return checkpoint
+    
+    async def get_job_checkpoint(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Last checkpoint of a scrape job"""
+        def read():
+            return self._conn.execute(
+                f"SELECT {', '.join(_JOB_FIELDS)} FROM scrape_jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        row = await self._run(read)
+        return self._job_row(row) if row else None
+    
+    async def list_job_checkpoints(self, states: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Checkpoints of scrape jobs (optionally only those in `states`), oldest first"""
+        def read():
+            sql = f"SELECT {', '.join(_JOB_FIELDS)} FROM scrape_jobs"
+            args: tuple = ()
+            if states:
+                sql += f" WHERE state IN ({', '.join('?' for _ in states)})"
+                args = tuple(states)
+            return self._conn.execute(sql + " ORDER BY created_at", args).fetchall()
+        return [self._job_row(row) for row in await self._run(read)]
+    
+    async def delete_job_checkpoints(self, before: float, states: List[str]) -> int:
+        """Drop checkpoints in `states` last updated before `before`; returns how many"""
+        def write():
+            cursor = self._conn.execute(
+                f"DELETE FROM scrape_jobs WHERE updated_at < ? AND state IN ({', '.join('?' for _ in states)})",
+                (before, *states),
+            )
+            return cursor.rowcount
+        return await self._run(write)
+    
+    def close(self) -> None:
+        """Close the database"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,169 @@
+"""Two-tier storage: in-process memory cache in front of Redis"""
+
+import asyncio
+import uuid
+from typing import Any, Optional, Dict, List
+from loguru import logger
+
+from .base import StorageAdapter
+from .memory import MemoryStorage
+from .redis_adapter import RedisStorage
+from ..config import Config
+
+
+class TieredStorage(StorageAdapter):
+    """
+    Small in-process L1 cache in front of a shared Redis L2
+    
+    Reads are served from L1 when possible and fall through to Redis
+    otherwise; Redis hits are copied into L1 for at most `l1_cache_ttl`
+    seconds, which bounds how stale a worker can be. Writes go to both tiers.
+    
+    With `cache_invalidation` enabled, every set/delete is also published on
+    a Redis pub/sub channel and other workers drop the key from their L1, so
+    an update made by one process is seen by the others right away. A
+    message is "<instance id>:<key>", with one line per key for a batch.
+    """
+    
+    CHANNEL = "nft_scout:cache:invalidate"
+    
+    def __init__(self, config: Config):
+        self.config = config
+        self.l1 = MemoryStorage(config)
+        self.l1.max_bytes = config.l1_cache_max_bytes
+        self.l1.max_entries = config.l1_cache_max_entries
+        self.l2 = RedisStorage(config)
+        self.l1_ttl = config.l1_cache_ttl
+        self.invalidation = config.cache_invalidation
+        # Lets a worker recognise (and skip) its own invalidation messages
+        self.instance_id = uuid.uuid4().hex
+        self._listener: Optional[asyncio.Task] = None
+        self._listener_retry_at = 0.0
+        self.invalidations_sent = 0
+        self.invalidations_received = 0
+    
+    def _l1_ttl(self, ttl: int) -> int:
+        return min(ttl, self.l1_ttl)
+    
+    async def _ensure_listener(self) -> None:
+        """Start the pub/sub listener on first use (needs a running loop)"""
+        if not self.invalidation or (self._listener and not self._listener.done()):
+            return
+        loop = asyncio.get_running_loop()
+        if loop.time() < self._listener_retry_at:
+            return
+        self._listener = asyncio.create_task(self._listen())
+    
+    async def _listen(self) -> None:
+        """Drop keys from L1 when another worker changes them"""
+        try:
+            await self.l2._ensure_connected()
+            pubsub = self.l2.redis_client.pubsub(ignore_subscribe_messages=True)
+            await pubsub.subscribe(self.CHANNEL)
+            try:
+                async for message in pubsub.listen():
+                    data = message.get("data")
+                    if isinstance(data, bytes):
+                        data = data.decode()
+                    if not isinstance(data, str):
+                        continue
+                    origin, _, keys = data.partition(":")
+                    if origin == self.instance_id or not keys:
+                        continue
+                    for key in keys.split("\n"):
+                        await self.l1.delete_cache(key)
+                        self.invalidations_received += 1
+            finally:
+                await pubsub.unsubscribe(self.CHANNEL)
+                if hasattr(pubsub, "aclose"):
+                    await pubsub.aclose()
+                else:
+                    await pubsub.close()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Without the listener L1 entries still expire after l1_cache_ttl
+            logger.warning(f"Cache invalidation listener stopped: {e}")
+            self._listener_retry_at = asyncio.get_running_loop().time() + 30
+    
+    async def _publish_invalidation(self, *keys: str) -> None:
+        """Tell the other workers to drop `keys` from L1, in one message"""
+        if not self.invalidation or not keys:
+            return
+        try:
+            await self.l2._ensure_connected()
+            await self.l2.redis_client.publish(self.CHANNEL, f"{self.instance_id}:" + "\n".join(keys))
+            self.invalidations_sent += len(keys)
+        except Exception as e:
+            logger.debug(f"Cache invalidation publish error: {e}")
+    
+    async def get_cache(self, key: str) -> Optional[Any]:
+        """Get cached value (L1, then Redis)"""
+        await self._ensure_listener()
+        value = self.l1.get_nowait(key)
+        if value is not None:
+            return value
+        value = await self.l2.get_cache(key)
+        if value is not None:
+            await self.l1.set_cache(key, value, ttl=self.l1_ttl)
+        return value
+    
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Get several cached values, only asking Redis for L1 misses"""
+        await self._ensure_listener()
+        result: Dict[str, Any] = {}
+        missing: List[str] = []
+        for key in keys:
+            value = self.l1.get_nowait(key)
+            if value is None:
+                missing.append(key)
+            else:
+                result[key] = value
+        if missing:
+            found = await self.l2.get_many(missing)
+            for key, value in found.items():
+                await self.l1.set_cache(key, value, ttl=self.l1_ttl)
+            result.update(found)
+        return result
+    
+    async def set_cache(self, key: str, value: Any, ttl: int = 900) -> None:
+        """Set cached value in both tiers"""
+        await self._ensure_listener()
+        await self.l1.set_cache(key, value, ttl=self._l1_ttl(ttl))
+        await self.l2.set_cache(key, value, ttl=ttl)
+        await self._publish_invalidation(key)
+    
+    async def set_many(self, items: Dict[str, Any], ttl: int = 900) -> None:
+        """Set several cached values in both tiers"""
+        await self._ensure_listener()
+        for key, value in items.items():
+            await self.l1.set_cache(key, value, ttl=self._l1_ttl(ttl))
+        await self.l2.set_many(items, ttl=ttl)
+        await self._publish_invalidation(*items)
+    
+    async def delete_cache(self, key: str) -> None:
+        """Delete cached value from both tiers and from other workers' L1"""
+        await self.l1.delete_cache(key)
+        await self.l2.delete_cache(key)
+        await self._publish_invalidation(key)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters of both tiers"""
+        return {
+            "type": "tiered",
+            "l1": self.l1.get_stats(),
+            "l2": self.l2.get_stats(),
+            "invalidation": self.invalidation,
+            "invalidations_sent": self.invalidations_sent,
+            "invalidations_received": self.invalidations_received,
+        }
+    
+    async def close(self):
+        """Stop the invalidation listener and close Redis"""
+        if self._listener and not self._listener.done():
+            self._listener.cancel()
+            try:
+                await self._listener
+            except (asyncio.CancelledError, Exception):
+                pass
+        await self.l2.close()
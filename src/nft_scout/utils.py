@@ -1,6 +1,7 @@
 """Utility functions for validation and security"""
 
 import re
+import time
 from typing import Optional, Tuple
 import base58
 from loguru import logger
@@ -130,6 +131,31 @@ def validate_contract_address(address: str, chain: str) -> Tuple[bool, Optional[
         return False, None
 
 
+def normalize_contract_address(address: str, chain: str) -> str:
+    """
+    Canonical form of a contract address, for keys and storage rows
+    
+    EVM addresses are case-insensitive (checksums only change the case), so
+    they are lowercased; Solana and Bitcoin addresses are case-sensitive and
+    only stripped.
+    """
+    address = address.strip()
+    if chain.lower() in ['solana', 'sol', 'bitcoin', 'btc']:
+        return address
+    return address.lower()
+
+
+def format_age(timestamp: Optional[float]) -> str:
+    """How long ago a unix timestamp was, for log and status lines ("3h ago", or "never" for None)"""
+    if timestamp is None:
+        return "never"
+    seconds = max(0, int(time.time() - timestamp))
+    for unit, size in (("d", 86400), ("h", 3600), ("m", 60)):
+        if seconds >= size:
+            return f"{seconds // size}{unit} ago"
+    return f"{seconds}s ago"
+
+
 def sanitize_input(text: str, max_length: int = 1000) -> str:
     """
     Sanitize user input to prevent injection attacks
@@ -0,0 +1,8 @@
+"""Shared test setup"""
+
+import os
+import tempfile
+
+# web_server opens the collection store at import; keep it out of the working tree
+os.environ["COLLECTION_STORE_PATH"] = os.path.join(tempfile.mkdtemp(prefix="nft_scout_tests_"), "collections.db")
+os.environ["PAGE_CACHE_TTL"] = "0"
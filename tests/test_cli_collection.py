@@ -0,0 +1,105 @@
+"""`main.py collection --all`: streaming a whole collection through _stream_collection"""
+
+import asyncio
+from dataclasses import replace
+
+import pytest
+
+from main import _stream_collection
+from src.nft_scout.config import Config
+from src.nft_scout.models import Chain
+from src.nft_scout.scraper import NFTScout
+
+CONTRACT = "0xbc4ca0eda7647a8ab7c2061c2e118a18a936f13d"
+
+
+class FakeProvider:
+    """`pages[cursor] = (token_ids, next_cursor)`, served the way _fetch_collection_page returns them"""
+
+    provider_name = "alchemy"
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = []
+
+    async def fetch(self, client, contract_address, chain, cursor, page_size):
+        self.calls.append(cursor)
+        token_ids, next_cursor = self.pages[cursor]
+        items = [{"id": {"tokenId": str(token_id)}, "contract": {"address": contract_address}} for token_id in token_ids]
+        return "alchemy", items, {"pageKey": next_cursor}
+
+
+class ListWriter:
+    """Keeps the pages it is handed"""
+
+    def __init__(self):
+        self.pages = []
+
+    def write(self, nfts):
+        self.pages.append([nft.token_id for nft in nfts])
+
+
+@pytest.fixture
+def scout(tmp_path):
+    instance = NFTScout(replace(
+        Config.from_env(),
+        collection_store_path=str(tmp_path / "collections.db"),
+        page_cache_ttl=0,
+        cache_type="memory",
+    ))
+    provider = FakeProvider({
+        None: (range(0, 60), "1"),
+        "1": (range(60, 120), "2"),
+        "2": (range(120, 150), None),
+    })
+    instance._get_client_for_chain = lambda chain: provider
+    instance._fetch_collection_page = provider.fetch
+    instance.provider = provider
+    yield instance
+    asyncio.run(instance.close())
+
+
+def stream(scout, writer, max_items=None, **kwargs):
+    return asyncio.run(_stream_collection(scout, CONTRACT, Chain.ETHEREUM, writer, max_items, 1, **kwargs))
+
+
+def test_every_page_is_written_and_only_a_sample_kept(scout):
+    writer = ListWriter()
+    sample, count, pages = stream(scout, writer)
+    assert [len(page) for page in writer.pages] == [60, 60, 30]
+    assert [token_id for page in writer.pages for token_id in page] == [str(i) for i in range(150)]
+    assert (count, pages) == (150, 3)
+    assert [nft.token_id for nft in sample] == [str(i) for i in range(20)]
+
+
+def test_max_items_cuts_the_last_page_and_stops_the_walk(scout):
+    writer = ListWriter()
+    sample, count, pages = stream(scout, writer, max_items=100)
+    assert [len(page) for page in writer.pages] == [60, 40]
+    assert writer.pages[-1][-1] == "99"
+    assert (count, pages) == (100, 2)
+    assert len(sample) == 20
+
+
+def test_no_store_walks_the_provider_and_leaves_the_store_alone(scout):
+    async def no_store(*args, **kwargs):
+        raise AssertionError("the collection store was used")
+        yield
+
+    scout.iter_collection_synced = no_store
+    writer = ListWriter()
+    sample, count, pages = stream(scout, writer, use_store=False)
+    assert (count, pages) == (150, 3)
+    assert scout.provider.calls == [None, "1", "2"]
+    assert asyncio.run(scout.collection_store.get_sync_state("ethereum", CONTRACT)) is None
+
+
+def test_stored_pages_are_written_again_without_the_provider(scout):
+    stream(scout, ListWriter())
+    scout.provider.calls.clear()
+    writer = ListWriter()
+    sample, count, pages = stream(scout, writer)
+    assert count == 150
+    # Only the stored last page is re-read, and its tokens aren't written twice
+    assert scout.provider.calls == ["2"]
+    assert len(sample) == 20
@@ -0,0 +1,347 @@
+"""Resumable collection syncs through NFTScout.iter_collection_synced"""
+
+import asyncio
+import os
+from dataclasses import replace
+
+import pytest
+
+from src.nft_scout.clients.alchemy import AlchemyClient
+from src.nft_scout.config import Config
+from src.nft_scout.models import Chain
+from src.nft_scout.scraper import MORALIS_CURSOR_PREFIX, NFTScout
+
+CONTRACT = "0xbc4ca0eda7647a8ab7c2061c2e118a18a936f13d"
+
+
+class FakeProvider:
+    """A collection of pages keyed by cursor; `pages[cursor] = (token_ids, next_cursor)`"""
+    
+    provider_name = "alchemy"
+    
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = []
+        self.rejected = set()
+    
+    async def fetch(self, client, contract_address, chain, cursor, page_size):
+        self.calls.append(cursor)
+        if cursor in self.rejected:
+            raise ValueError(f"cursor {cursor} expired")
+        token_ids, next_cursor = self.pages[cursor]
+        items = [{"id": {"tokenId": str(token_id)}, "contract": {"address": contract_address}} for token_id in token_ids]
+        return "alchemy", items, {"pageKey": next_cursor}
+
+
+@pytest.fixture
+def scout(tmp_path):
+    instance = NFTScout(replace(
+        Config.from_env(),
+        collection_store_path=str(tmp_path / "collections.db"),
+        page_cache_ttl=0,
+        cache_type="memory",
+    ))
+    yield instance
+    asyncio.run(instance.close())
+
+
+def use_provider(scout, provider):
+    scout._get_client_for_chain = lambda chain: provider
+    scout._fetch_collection_page = provider.fetch
+
+
+async def walk(scout, **kwargs):
+    """Token ids the way web_server and main.py consume the walk: an empty page ends it"""
+    token_ids = []
+    async for page in scout.iter_collection_synced(CONTRACT, Chain.ETHEREUM, page_size=3, prefetch=1, **kwargs):
+        if not page.nfts:
+            break
+        token_ids.extend(nft.token_id for nft in page.nfts)
+    return token_ids
+
+
+def test_finished_sync_picks_up_tokens_minted_after_it(scout):
+    provider = FakeProvider({None: ([0, 1, 2], "1"), "1": ([3, 4, 5], None)})
+    use_provider(scout, provider)
+    assert asyncio.run(walk(scout)) == ["0", "1", "2", "3", "4", "5"]
+    
+    # Minted upstream: the old last page (stored in full) now has a next cursor
+    provider.pages["1"] = ([3, 4, 5], "2")
+    provider.pages["2"] = ([6, 7], None)
+    provider.calls.clear()
+    
+    assert asyncio.run(walk(scout)) == ["0", "1", "2", "3", "4", "5", "6", "7"]
+    assert provider.calls == ["1", "2"]
+
+
+def test_partially_filled_last_page_only_yields_its_new_tokens(scout):
+    provider = FakeProvider({None: ([0, 1, 2], "1"), "1": ([3], None)})
+    use_provider(scout, provider)
+    asyncio.run(walk(scout))
+    
+    provider.pages["1"] = ([3, 4, 5], None)
+    assert asyncio.run(walk(scout)) == ["0", "1", "2", "3", "4", "5"]
+
+
+def test_interrupted_sync_resumes_from_its_next_cursor(scout):
+    provider = FakeProvider({None: ([0, 1, 2], "1"), "1": ([3, 4, 5], "2"), "2": ([6], None)})
+    use_provider(scout, provider)
+    assert asyncio.run(walk(scout, max_pages=1)) == ["0", "1", "2"]
+    provider.calls.clear()
+    
+    assert asyncio.run(walk(scout)) == ["0", "1", "2", "3", "4", "5", "6"]
+    assert provider.calls == ["1", "2"]
+
+
+def test_rejected_stored_cursor_rewalks_without_duplicates(scout):
+    provider = FakeProvider({None: ([0, 1, 2], "1"), "1": ([3, 4, 5], None)})
+    use_provider(scout, provider)
+    asyncio.run(walk(scout))
+    
+    provider.rejected.add("1")
+    provider.pages.update({None: ([0, 1, 2], "a"), "a": ([3, 4, 5], "b"), "b": ([6], None)})
+    assert asyncio.run(walk(scout)) == ["0", "1", "2", "3", "4", "5", "6"]
+    assert provider.calls[-3:] == [None, "a", "b"]
+
+
+def stored_ids(scout):
+    async def read():
+        return [nft.token_id async for batch in scout.collection_store.iter_nfts("ethereum", CONTRACT) for nft in batch]
+    return asyncio.run(read())
+
+
+def test_full_resync_walks_from_the_start_and_drops_burned_tokens(scout):
+    provider = FakeProvider({None: ([0, 1, 2], "1"), "1": ([3, 4, 5], None)})
+    use_provider(scout, provider)
+    asyncio.run(walk(scout))
+    
+    # Token 4 burned upstream
+    provider.pages["1"] = ([3, 5], None)
+    provider.calls.clear()
+    assert asyncio.run(walk(scout, full_resync=True)) == ["0", "1", "2", "3", "5"]
+    assert provider.calls == [None, "1"]
+    assert stored_ids(scout) == ["0", "1", "2", "3", "5"]
+
+
+def test_resyncs_and_last_page_rereads_skip_the_page_cache(scout):
+    scout.config = replace(scout.config, page_cache_ttl=900)
+    provider = FakeProvider({None: ([0, 1, 2], "1"), "1": ([3, 4, 5], None)})
+    use_provider(scout, provider)
+    asyncio.run(walk(scout))
+    
+    # Minted upstream within the page cache TTL: the cached last page still has no next cursor
+    provider.pages["1"] = ([3, 4, 5], "2")
+    provider.pages["2"] = ([6], None)
+    provider.calls.clear()
+    assert asyncio.run(walk(scout)) == ["0", "1", "2", "3", "4", "5", "6"]
+    assert provider.calls == ["1", "2"]
+    
+    # Token 4 burned upstream, also within the TTL
+    provider.pages["1"] = ([3, 5], "2")
+    provider.calls.clear()
+    assert asyncio.run(walk(scout, full_resync=True)) == ["0", "1", "2", "3", "5", "6"]
+    assert provider.calls == [None, "1", "2"]
+    assert stored_ids(scout) == ["0", "1", "2", "3", "5", "6"]
+
+
+def test_sync_older_than_the_resync_age_is_walked_again(scout):
+    provider = FakeProvider({None: ([0, 1, 2], "1"), "1": ([3, 4, 5], None)})
+    use_provider(scout, provider)
+    asyncio.run(walk(scout))
+    
+    async def age_sync(seconds):
+        state = await scout.collection_store.get_sync_state("ethereum", CONTRACT)
+        await scout.collection_store.save_sync_state(
+            "ethereum", CONTRACT, walk_started_at=state["walk_started_at"] - seconds
+        )
+    
+    provider.calls.clear()
+    asyncio.run(walk(scout))
+    assert provider.calls == ["1"]
+    
+    asyncio.run(age_sync(scout.config.collection_resync_age + 1))
+    provider.pages[None] = ([1, 2], "1")
+    provider.calls.clear()
+    assert asyncio.run(walk(scout)) == ["1", "2", "3", "4", "5"]
+    assert provider.calls == [None, "1"]
+    assert stored_ids(scout) == ["1", "2", "3", "4", "5"]
+
+
+def test_interrupted_full_resync_prunes_once_it_completes(scout):
+    provider = FakeProvider({None: ([0, 1, 2], "1"), "1": ([3, 4, 5], None)})
+    use_provider(scout, provider)
+    asyncio.run(walk(scout))
+    
+    provider.pages["1"] = ([3], None)
+    asyncio.run(walk(scout, full_resync=True, max_pages=1))
+    assert stored_ids(scout) == ["0", "1", "2", "3", "4", "5"]
+    
+    # The resume serves what is stored, then finishes the walk and forgets what it didn't see
+    asyncio.run(walk(scout))
+    assert stored_ids(scout) == ["0", "1", "2", "3"]
+
+
+def test_store_without_walk_start_is_resynced_in_full(scout):
+    provider = FakeProvider({None: ([0, 1, 2], "1"), "1": ([3], None)})
+    use_provider(scout, provider)
+    
+    async def legacy_sync():
+        # A store written before full walks were tracked
+        await scout.collection_store.save_sync_state("ethereum", CONTRACT, last_cursor="1", complete=True)
+    
+    asyncio.run(legacy_sync())
+    asyncio.run(walk(scout))
+    assert provider.calls == [None, "1"]
+
+
+class FakeAlchemy(AlchemyClient):
+    """Alchemy serving `pages[cursor] = (token_ids, next_cursor)`"""
+    
+    def __init__(self, pages):
+        super().__init__(["key"])
+        self.pages = pages
+        self.calls = []
+    
+    async def get_contract_nfts(self, contract_address, chain, cursor=None, page_size=100):
+        self.calls.append(cursor)
+        token_ids, next_cursor = self.pages[cursor]
+        nfts = [{"id": {"tokenId": str(token_id)}, "contract": {"address": contract_address}} for token_id in token_ids]
+        return {"nfts": nfts, "pageKey": next_cursor}
+
+
+def test_fresh_page_skips_the_page_cache_and_refreshes_it(scout):
+    scout.config = replace(scout.config, page_cache_ttl=60)
+    provider = FakeProvider({None: ([0, 1, 2], "1")})
+    use_provider(scout, provider)
+    
+    async def first_page(**kwargs):
+        page = await scout.get_collection_nfts(CONTRACT, Chain.ETHEREUM, page_size=3, **kwargs)
+        return [nft.token_id for nft in page.nfts]
+    
+    assert asyncio.run(first_page()) == ["0", "1", "2"]
+    provider.pages[None] = ([0, 1, 2, 3], "1")
+    assert asyncio.run(first_page()) == ["0", "1", "2"]
+    assert asyncio.run(first_page(fresh=True)) == ["0", "1", "2", "3"]
+    assert asyncio.run(first_page()) == ["0", "1", "2", "3"]
+    assert provider.calls == [None, None]
+
+
+def test_page_cache_leaves_out_raw_metadata_unless_asked(scout):
+    scout.config = replace(scout.config, page_cache_ttl=60)
+    provider = FakeProvider({None: ([0, 1], None)})
+    
+    async def fetch(client, contract_address, chain, cursor, page_size):
+        _, items, extra = await FakeProvider.fetch(provider, client, contract_address, chain, cursor, page_size)
+        items[0]["metadata"] = {"image": "https://example.com/0.png", "name": "Zero"}
+        items[1]["metadata"] = {"image": "not a url", "name": "One"}
+        return "alchemy", items, extra
+    
+    scout._get_client_for_chain = lambda chain: provider
+    scout._fetch_collection_page = fetch
+    
+    async def raw_by_token(**kwargs):
+        page = await scout.get_collection_nfts(CONTRACT, Chain.ETHEREUM, page_size=2, **kwargs)
+        return {nft.token_id: nft.raw_metadata for nft in page.nfts}
+    
+    assert asyncio.run(raw_by_token())["0"] == {"image": "https://example.com/0.png", "name": "Zero"}
+    # Cached: only the NFT without a usable image keeps its raw metadata (the event image fallback)
+    assert asyncio.run(raw_by_token()) == {"0": None, "1": {"image": "not a url", "name": "One"}}
+    
+    scout.config = replace(scout.config, page_cache_raw_metadata=True)
+    asyncio.run(raw_by_token(fresh=True))
+    assert asyncio.run(raw_by_token())["0"] == {"image": "https://example.com/0.png", "name": "Zero"}
+
+
+def test_committed_page_without_raw_metadata_keeps_the_stored_one(scout):
+    provider = FakeProvider({None: ([0, 1], None)})
+    use_provider(scout, provider)
+    asyncio.run(walk(scout))
+    store = scout.collection_store
+    
+    async def replay():
+        stored = await store.get_nfts("ethereum", CONTRACT, ["0", "1"])
+        await store.commit_page("ethereum", CONTRACT, [
+            stored["0"].model_copy(update={"raw_metadata": None, "name": "Renamed"}),
+            stored["1"].model_copy(update={"raw_metadata": {"fresh": True}}),
+        ], synced_at=0)
+        return await store.get_nfts("ethereum", CONTRACT, ["0", "1"])
+    
+    before = asyncio.run(store.get_nfts("ethereum", CONTRACT, ["0"]))["0"].raw_metadata
+    assert before is not None
+    after = asyncio.run(replay())
+    assert after["0"].name == "Renamed"
+    assert after["0"].raw_metadata == before
+    assert after["1"].raw_metadata == {"fresh": True}
+
+
+def test_hedging_is_opt_in(monkeypatch):
+    monkeypatch.delenv("HEDGE_REQUESTS", raising=False)
+    assert Config.from_env().hedge_requests is False
+
+
+def test_moralis_cursor_without_moralis_restarts_the_sync(scout):
+    alchemy = FakeAlchemy({None: ([0, 1, 2], "1"), "1": ([3, 4], None)})
+    scout._get_client_for_chain = lambda chain: alchemy
+    scout.moralis = None
+    
+    async def scenario():
+        # A walk the Moralis hedge had won, interrupted before the key was removed
+        await scout.collection_store.save_sync_state(
+            "ethereum", CONTRACT, last_cursor=None, next_cursor=f"{MORALIS_CURSOR_PREFIX}abc", complete=False
+        )
+        with pytest.raises(ValueError, match="Moralis"):
+            await scout._fetch_collection_page(alchemy, CONTRACT, Chain.ETHEREUM, f"{MORALIS_CURSOR_PREFIX}abc", 3)
+        return await walk(scout)
+    
+    assert asyncio.run(scenario()) == ["0", "1", "2", "3", "4"]
+    # Alchemy never saw the Moralis cursor
+    assert alchemy.calls == [None, "1"]
+
+
+def test_cancelled_alchemy_page_still_counts_towards_the_hedge_deadline(scout):
+    class SlowAlchemy(FakeAlchemy):
+        async def get_contract_nfts(self, contract_address, chain, cursor=None, page_size=100):
+            if cursor is None:
+                await asyncio.sleep(5)
+            return await super().get_contract_nfts(contract_address, chain, cursor, page_size)
+    
+    class FastMoralis:
+        async def get_contract_nfts(self, contract_address, chain, cursor=None, page_size=100):
+            return {"result": [], "nfts": [{"token_id": "0", "token_address": contract_address}], "cursor": None}
+    
+    scout.config = replace(scout.config, hedge_requests=True, hedge_default_delay=0.1)
+    scout.alchemy = SlowAlchemy({None: ([0], "1"), "1": ([1], None)})
+    scout.moralis = FastMoralis()
+    
+    async def scenario():
+        source, _, _ = await scout._fetch_collection_page(scout.alchemy, CONTRACT, Chain.ETHEREUM, None, 3)
+        await scout._fetch_collection_page(scout.alchemy, CONTRACT, Chain.ETHEREUM, "1", 3)
+        return source
+    
+    assert asyncio.run(scenario()) == "moralis"
+    first_page = list(scout.alchemy_first_page_latency._samples)
+    assert len(first_page) == 1 and first_page[0] >= 0.1
+    # Cursor pages are timed on their own and don't move the hedge deadline
+    assert len(scout.alchemy_page_latency._samples) == 1
+
+
+def test_selenium_stats_are_cached_as_long_as_metadata(scout):
+    ttls = {}
+    
+    async def set_cache(key, value, ttl=None):
+        ttls[key.split(":")[1]] = ttl
+    
+    async def fetch():
+        return {"name": "Apes"}
+    
+    scout.storage.set_cache = set_cache
+    for source in ("selenium", "reservoir"):
+        asyncio.run(scout._cached_stats_source(source, CONTRACT, Chain.ETHEREUM, fetch))
+    assert ttls == {"selenium": scout.config.stats_metadata_ttl, "reservoir": scout.config.stats_market_ttl}
+
+
+def test_store_path_does_not_depend_on_the_working_directory(monkeypatch):
+    monkeypatch.delenv("COLLECTION_STORE_PATH", raising=False)
+    assert Config.from_env().collection_store_path == os.path.join(os.path.expanduser("~"), ".nft_scout", "collections.db")
+    monkeypatch.setenv("COLLECTION_STORE_PATH", "~/scout/collections.db")
+    assert Config.from_env().collection_store_path == os.path.join(os.path.expanduser("~"), "scout", "collections.db")
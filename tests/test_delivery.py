@@ -0,0 +1,96 @@
+"""BatchedSender: NFT batches, status coalescing and ordering"""
+
+import asyncio
+import json
+
+from src.nft_scout.delivery import BatchedSender
+
+
+class Client:
+    """A fake WebSocket: the decoded frames it was sent"""
+    
+    def __init__(self):
+        self.frames = []
+    
+    async def send_text(self, text):
+        self.frames.append(json.loads(text))
+    
+    def kinds(self):
+        return [frame["type"] for frame in self.frames]
+
+
+def test_nft_batches_are_bounded_by_size():
+    client = Client()
+    
+    async def scenario():
+        sender = BatchedSender(client.send_text, batch_size=3, max_delay=60)
+        for token_id in range(7):
+            await sender.add_nft({"token_id": str(token_id)}, total_scraped=token_id + 1)
+        sent_before_close = len(client.frames)
+        await sender.close()
+        return sent_before_close
+    
+    assert asyncio.run(scenario()) == 2
+    assert [frame["count"] for frame in client.frames] == [3, 3, 1]
+    assert [nft["token_id"] for frame in client.frames for nft in frame["nfts"]] == [str(i) for i in range(7)]
+    # The fields of a batch's last NFT travel with it
+    assert [frame["total_scraped"] for frame in client.frames] == [3, 6, 7]
+
+
+def test_nft_batches_are_bounded_by_time():
+    client = Client()
+    
+    async def scenario():
+        sender = BatchedSender(client.send_text, batch_size=100, max_delay=0.02)
+        await sender.add_nft({"token_id": "1"})
+        await sender.add_nft({"token_id": "2"})
+        assert client.frames == []
+        await asyncio.sleep(0.1)
+        sent_by_timer = list(client.frames)
+        await sender.add_nft({"token_id": "3"})
+        await sender.close()
+        return sent_by_timer
+    
+    sent_by_timer = asyncio.run(scenario())
+    assert [frame["count"] for frame in sent_by_timer] == [2]
+    assert [frame["count"] for frame in client.frames] == [2, 1]
+
+
+def test_statuses_coalesce_to_the_latest_per_interval():
+    client = Client()
+    
+    async def scenario():
+        sender = BatchedSender(client.send_text, status_rate=20)  # one status per 50ms
+        for step in range(5):
+            await sender.status({"type": "status", "message": f"step {step}"})
+        await sender.status({"type": "progress", "progress_pct": 10})
+        await sender.status({"type": "progress", "progress_pct": 20})
+        # The timer sends the pending ones once their interval is over
+        await asyncio.sleep(0.15)
+        await sender.close()
+        return sender.stats
+    
+    stats = asyncio.run(scenario())
+    statuses = [frame["message"] for frame in client.frames if frame["type"] == "status"]
+    progress = [frame["progress_pct"] for frame in client.frames if frame["type"] == "progress"]
+    assert statuses == ["step 0", "step 4"]
+    assert progress == [10, 20]
+    assert stats["coalesced"] == 3
+
+
+def test_send_goes_out_after_buffered_nfts_and_statuses():
+    client = Client()
+    
+    async def scenario():
+        sender = BatchedSender(client.send_text, batch_size=100, max_delay=60, status_rate=1)
+        await sender.status({"type": "status", "message": "first"})
+        await sender.add_nft({"token_id": "1"})
+        await sender.status({"type": "status", "message": "pending"})
+        await sender.add_nft({"token_id": "2"})
+        await sender.send({"type": "complete"})
+        await sender.close()
+    
+    asyncio.run(scenario())
+    assert client.kinds() == ["status", "nft_batch", "status", "complete"]
+    assert client.frames[1]["count"] == 2
+    assert client.frames[2]["message"] == "pending"
@@ -0,0 +1,105 @@
+"""Streaming NFT writers in nft_scout.export"""
+
+import gzip
+import json
+
+import pytest
+
+from src.nft_scout.export import JSONNFTWriter, NDJSONNFTWriter, guess_format, open_nft_writer
+from src.nft_scout.models import Chain, NormalizedNFT, Trait
+
+CONTRACT = "0xbc4ca0eda7647a8ab7c2061c2e118a18a936f13d"
+
+
+def make_nft(token_id):
+    return NormalizedNFT(
+        token_id=str(token_id),
+        contract_address=CONTRACT,
+        chain=Chain.ETHEREUM,
+        name=f"Ape #{token_id}",
+        attributes=[Trait(trait_type="Background", value="Blue"), Trait(trait_type="Level", value=token_id)],
+        raw_metadata={"tokenId": str(token_id)},
+    )
+
+
+def read_json(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_empty_json_dump_is_a_valid_array(tmp_path):
+    path = str(tmp_path / "nfts.json")
+    with JSONNFTWriter(path):
+        pass
+    assert read_json(path) == []
+
+
+def test_json_dump_writes_every_page_and_keeps_raw_metadata(tmp_path):
+    path = str(tmp_path / "nfts.json")
+    with open_nft_writer(path) as writer:
+        writer.write([make_nft(1), make_nft(2)])
+        writer.write([make_nft(3)])
+    rows = read_json(path)
+    assert [row["token_id"] for row in rows] == ["1", "2", "3"]
+    assert rows[0]["raw_metadata"] == {"tokenId": "1"}
+    assert writer.rows_written == 3
+
+
+def test_raw_metadata_can_be_left_out_of_json(tmp_path):
+    path = str(tmp_path / "nfts.json")
+    with open_nft_writer(path, include_raw_metadata=False) as writer:
+        writer.write([make_nft(1)])
+    assert "raw_metadata" not in read_json(path)[0]
+
+
+@pytest.mark.parametrize("name, fmt", [
+    ("nfts.json", "json"),
+    ("nfts.json.gz", "json"),
+    ("nfts.ndjson", "ndjson"),
+    ("nfts.jsonl.gz", "ndjson"),
+    ("NFTS.PARQUET", "parquet"),
+    ("nfts.pq", "parquet"),
+    ("nfts.csv", "json"),
+])
+def test_format_is_guessed_from_the_extension(name, fmt):
+    assert guess_format(name) == fmt
+
+
+def test_gzipped_ndjson_dump(tmp_path):
+    path = str(tmp_path / "nfts.ndjson.gz")
+    writer = open_nft_writer(path)
+    assert isinstance(writer, NDJSONNFTWriter)
+    with writer:
+        writer.write([make_nft(1), make_nft(2)])
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        assert [json.loads(line)["token_id"] for line in f] == ["1", "2"]
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="Unknown export format"):
+        open_nft_writer(str(tmp_path / "nfts.json"), fmt="csv")
+
+
+def test_parquet_dump_is_written_in_row_groups(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "nfts.parquet")
+    with open_nft_writer(path, row_group_size=2) as writer:
+        writer.write([make_nft(1), make_nft(2), make_nft(3)])
+        writer.write([make_nft(4), make_nft(5)])
+    assert (writer.rows_written, writer.row_groups) == (5, 3)
+
+    parquet = pq.ParquetFile(path)
+    assert parquet.metadata.num_row_groups == 3
+    assert "raw_metadata" not in parquet.schema_arrow.names
+    rows = parquet.read().to_pylist()
+    assert [row["token_id"] for row in rows] == ["1", "2", "3", "4", "5"]
+    assert [(trait["value"], trait["value_number"]) for trait in rows[2]["attributes"]] == [("Blue", None), ("3", 3.0)]
+
+
+def test_parquet_dump_keeps_raw_metadata_when_asked(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "nfts.parquet")
+    with open_nft_writer(path, include_raw_metadata=True) as writer:
+        writer.write([make_nft(1)])
+    rows = pq.read_table(path).to_pylist()
+    assert json.loads(rows[0]["raw_metadata"]) == {"tokenId": "1"}
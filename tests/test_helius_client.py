@@ -0,0 +1,56 @@
+"""Helius collection paging on a client shared by concurrent scrapes"""
+
+import asyncio
+
+from src.nft_scout.clients.helius import HeliusClient
+
+ADDRESS = "A" * 32
+RESOLVED = "C" * 32
+
+
+class FakeHelius(HeliusClient):
+    """RPC pages come from `groups`; `ADDRESS` answers only once `gate` is set"""
+    
+    def __init__(self, groups):
+        super().__init__(["key"])
+        self.groups = groups
+        self.gate = asyncio.Event()
+    
+    async def _make_rpc_request(self, method, params):
+        if params["groupValue"] == ADDRESS:
+            await self.gate.wait()
+        items = self.groups[params["groupValue"]]
+        return {"items": items, "total": len(items)}
+    
+    async def _make_das_request(self, method, params):
+        # Name search used to resolve a marketplace symbol
+        return {"items": [{
+            "content": {"metadata": {"name": "Frogs #1", "symbol": "FROGS"}},
+            "grouping": [{"group_key": "collection", "group_value": RESOLVED}],
+        }]}
+    
+    def _session_request(self, method, url, **kwargs):
+        raise ConnectionError("marketplaces unreachable")
+    
+    async def _enrich_nft_metadata_batch(self, items):
+        return items
+
+
+def test_concurrent_collections_keep_their_own_total_and_address():
+    client = FakeHelius({
+        ADDRESS: [{"id": f"a{i}"} for i in range(3)],
+        RESOLVED: [{"id": f"c{i}"} for i in range(7)],
+    })
+    
+    async def scenario():
+        first = asyncio.create_task(client.get_collection_nfts(ADDRESS))
+        await asyncio.sleep(0)
+        # A symbol lookup completes while the first page is still pending
+        second = await client.get_collection_nfts("frogs")
+        client.gate.set()
+        return await first, second
+    
+    first, second = asyncio.run(scenario())
+    assert (first["total"], first["collection_address"]) == (3, ADDRESS)
+    assert (second["total"], second["collection_address"]) == (7, RESOLVED)
+    assert not hasattr(client, "_collection_total")
@@ -0,0 +1,64 @@
+"""MemoryStorage expiry and eviction"""
+
+import asyncio
+from dataclasses import replace
+
+from src.nft_scout.config import Config
+from src.nft_scout.storage import memory
+from src.nft_scout.storage.memory import MemoryStorage
+
+
+def make_storage(**overrides) -> MemoryStorage:
+    return MemoryStorage(replace(Config.from_env(), **{"cache_max_entries": 3, **overrides}))
+
+
+def test_expired_entry_is_dropped_on_read():
+    storage = make_storage()
+    asyncio.run(storage.set_cache("a", 1, ttl=-1))
+    assert storage.get_nowait("a") is None
+    assert storage.get_stats()["expirations"] == 1
+    assert storage.current_bytes == 0
+
+
+def test_full_cache_evicts_lru_head_without_a_full_scan(monkeypatch):
+    storage = make_storage()
+    scans = []
+    monkeypatch.setattr(storage, "_purge_expired", lambda now: scans.append(now))
+
+    async def fill():
+        for key in "abcdef":
+            await storage.set_cache(key, key)
+    asyncio.run(fill())
+
+    assert not scans
+    assert list(storage.cache) == ["d", "e", "f"]
+    assert storage.get_stats()["evictions"] == 3
+
+
+def test_expired_head_counts_as_expiration():
+    storage = make_storage()
+
+    async def fill():
+        await storage.set_cache("old", 1, ttl=-1)
+        await storage.set_cache("b", 2)
+        await storage.set_cache("c", 3)
+        await storage.set_cache("d", 4)
+    asyncio.run(fill())
+
+    stats = storage.get_stats()
+    assert "old" not in storage.cache
+    assert (stats["expirations"], stats["evictions"]) == (1, 0)
+
+
+def test_periodic_sweep_drops_expired_entries(monkeypatch):
+    storage = make_storage(cache_max_entries=100)
+
+    async def fill():
+        await storage.set_cache("a", 1, ttl=-1)
+        await storage.set_cache("b", 2, ttl=-1)
+        storage._swept_at -= memory._SWEEP_INTERVAL
+        await storage.set_cache("c", 3)
+    asyncio.run(fill())
+
+    assert list(storage.cache) == ["c"]
+    assert storage.get_stats()["expirations"] == 2
@@ -0,0 +1,203 @@
+"""Fast normalizer path against the fully validated one"""
+
+import asyncio
+import json
+from datetime import datetime, timezone
+from concurrent.futures import Executor, Future
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import replace
+
+import pytest
+from pydantic import ValidationError
+
+from src.nft_scout.config import Config
+from src.nft_scout.models import Chain
+from src.nft_scout.compact import CompactNFT
+from src.nft_scout.normalizer import Normalizer, build_trusted_nft
+from src.nft_scout.scraper import NFTScout
+
+
+def traits(i):
+    return [
+        {"trait_type": "Background", "value": f"Blue {i % 2}"},
+        {"trait_type": "Level", "value": i % 3, "display_type": "number"},
+    ]
+
+
+ITEMS = {
+    "alchemy": (Chain.ETHEREUM, lambda i: {
+        "contract": {"address": "0xbc4ca0eda7647a8ab7c2061c2e118a18a936f13d", "name": "Apes"},
+        "id": {"tokenId": hex(i), "tokenMetadata": {"tokenType": "ERC721"}},
+        "metadata": {
+            "name": f"Ape #{i}",
+            "image": f"ipfs://QmeSjSinHpPnmXmspMjwiXyN6zS4E9zccariGR3jxcaWtq/{i}.png",
+            "external_url": f"https://example.com/apes/{i}",
+            "attributes": traits(i),
+        },
+        "owners": [f"0x{i:040x}"],
+    }),
+    "helius": (Chain.SOLANA, lambda i: {
+        "id": f"Asset{i:040d}",
+        "interface": "V1_NFT",
+        "content": {
+            "metadata": {"name": f"Sol Ape #{i}", "attributes": traits(i)},
+            "files": [{"uri": f"https://arweave.net/{i}", "cdn_uri": f"https://cdn.example.com/{i}.png"}] if i % 2 else [],
+            "links": {"image": f"ipfs://QmeSjSinHpPnmXmspMjwiXyN6zS4E9zccariGR3jxcaWtq/{i}.png"},
+        },
+        "grouping": [{"group_key": "collection", "group_value": "SolApes1111111111111111111111111111"}],
+        "ownership": {"owner": f"Owner{i:039d}"},
+    }),
+    "moralis": (Chain.ETHEREUM, lambda i: {
+        "token_address": "0xbc4ca0eda7647a8ab7c2061c2e118a18a936f13d",
+        "token_id": str(i),
+        "contract_type": "ERC721",
+        "name": "Apes",
+        "metadata": json.dumps({
+            "name": f"Ape #{i}",
+            "image": f"https://example.com/{i}.png" if i % 2 else f"ipfs://QmeSjSinHpPnmXmspMjwiXyN6zS4E9zccariGR3jxcaWtq/{i}.png",
+            "animation_url": "QmeSjSinHpPnmXmspMjwiXyN6zS4E9zccariGR3jxcaWtq/anim.mp4",
+            "attributes": traits(i),
+        }),
+    }),
+}
+
+
+@pytest.mark.parametrize("source", sorted(ITEMS))
+def test_fast_path_builds_the_same_models(source):
+    chain, make_item = ITEMS[source]
+    for i in range(4):
+        item = make_item(i)
+        fast = Normalizer.normalize_nft_from_source(item, source, chain, fast=True)
+        validated = Normalizer.normalize_nft_from_source(item, source, chain, fast=False)
+        assert fast == validated
+        assert fast.model_dump_json() == validated.model_dump_json()
+        if i % 2 == 0:
+            # IPFS media goes through the gateway on both paths
+            assert str(validated.image_url).startswith("https://cloudflare-ipfs.com/ipfs/")
+
+
+def test_validated_path_is_the_default():
+    chain, make_item = ITEMS["alchemy"]
+    item = make_item(1)
+    item["metadata"]["attributes"].append({"trait_type": "Bad", "value": ["not", "a", "value"]})
+    with pytest.raises(ValidationError):
+        Normalizer.normalize_nft_from_source(item, "alchemy", chain)
+
+
+def test_fast_path_drops_what_the_validated_path_rejects():
+    chain, make_item = ITEMS["helius"]
+    item = make_item(1)
+    metadata = item["content"]["metadata"]
+    metadata["attributes"] += [{"trait_type": "Bad", "value": {"nested": 1}}, "not a dict", {"value": None}]
+    item["content"]["files"] = [{"uri": "not a url"}]
+    with pytest.raises(ValidationError):
+        Normalizer.normalize_nft_from_source(item, "helius", chain, fast=False)
+    
+    nft = Normalizer.normalize_nft_from_source(item, "helius", chain, fast=True)
+    # Only the attributes that fit Trait are kept, the invalid image becomes None
+    assert [(trait.trait_type, trait.value) for trait in nft.attributes] == [("Background", "Blue 1"), ("Level", 1)]
+    assert nft.image_url is None
+
+
+def test_shared_traits_cannot_be_changed_through_one_nft():
+    chain, make_item = ITEMS["alchemy"]
+    first, second = (Normalizer.normalize_nft_from_source(make_item(i), "alchemy", chain, fast=True) for i in (1, 3))
+    assert first.attributes[0] is second.attributes[0]
+    with pytest.raises(ValidationError):
+        first.attributes[0].value = "Red"
+    assert second.attributes[0].value == "Blue 1"
+
+
+@pytest.mark.parametrize("source", sorted(ITEMS))
+def test_cached_nfts_are_rebuilt_without_revalidation_to_the_same_model(source, monkeypatch):
+    chain, make_item = ITEMS[source]
+    nft = Normalizer.normalize_nft_from_source(make_item(2), source, chain)
+    nft = nft.model_copy(update={"minted_at": datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc), "rarity_rank": 7})
+    compact = CompactNFT.from_nft(nft, keep_raw=True)
+    dumped = nft.model_dump(mode="json")
+    
+    def no_validation(*args, **kwargs):
+        raise AssertionError("NormalizedNFT validated again")
+    
+    monkeypatch.setattr("src.nft_scout.models.NormalizedNFT.__init__", no_validation)
+    # From the memory cache (CompactNFT) and from Redis (its JSON form)
+    assert compact.to_trusted_nft() == nft
+    assert build_trusted_nft(dumped) == nft
+
+
+
+def test_compact_nft_keeps_zero_prices_and_ranks():
+    chain, make_item = ITEMS["alchemy"]
+    nft = Normalizer.normalize_nft_from_source(make_item(1), "alchemy", chain)
+    nft = nft.model_copy(update={"floor_price": 0.0, "last_sale_price": 0, "rarity_rank": 0, "rarity_score": 0.0})
+    restored = CompactNFT.from_nft(nft).to_nft()
+    assert (restored.floor_price, restored.last_sale_price) == (0.0, 0)
+    assert (restored.rarity_rank, restored.rarity_score) == (0, 0.0)
+
+class InlinePool(Executor):
+    """Runs tasks in the calling thread; `broken` makes every task fail like a dead worker"""
+    
+    def __init__(self, broken=False):
+        self.broken = broken
+        self.shut_down = False
+    
+    def submit(self, fn, *args):
+        future = Future()
+        if self.broken:
+            future.set_exception(BrokenProcessPool("a worker died"))
+            return future
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+    
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+
+def normalize_with_pool(pool, items, fast):
+    """(NFTs or the error raised, the scout's pool after the page, its normalize_stats)"""
+    scout = NFTScout(replace(
+        Config.from_env(),
+        normalize_workers=1,
+        normalize_pool_threshold=2,
+        normalize_chunk_size=2,
+        fast_normalizer=fast,
+        collection_store_enabled=False,
+    ))
+    scout._normalize_pool = pool
+    
+    async def run():
+        try:
+            result = await scout._normalize_page(items, "alchemy", Chain.ETHEREUM)
+        except Exception as e:
+            result = e
+        pool_after = scout._normalize_pool
+        scout._normalize_pool = None
+        await scout.close()
+        return result, pool_after, scout.normalize_stats
+    
+    return asyncio.run(run())
+
+
+def test_broken_pool_is_dropped_and_the_page_normalized_inline():
+    chain, make_item = ITEMS["alchemy"]
+    pool = InlinePool(broken=True)
+    nfts, pool_after, stats = normalize_with_pool(pool, [make_item(i) for i in range(4)], fast=True)
+    assert [nft.name for nft in nfts] == [f"Ape #{i}" for i in range(4)]
+    assert pool.shut_down
+    assert stats["pool_errors"] == 1
+    # Not handed the dead pool again: the next large page gets a new one
+    assert pool_after is None
+
+
+def test_normalizer_errors_in_a_worker_are_not_retried_inline():
+    chain, make_item = ITEMS["alchemy"]
+    items = [make_item(i) for i in range(4)]
+    items[3]["metadata"]["attributes"].append({"trait_type": "Bad", "value": ["not", "a", "value"]})
+    pool = InlinePool()
+    error, pool_after, stats = normalize_with_pool(pool, items, fast=False)
+    assert isinstance(error, ValidationError)
+    assert stats == {"inline_pages": 0, "pool_pages": 0, "pool_errors": 0}
+    assert pool_after is pool
@@ -0,0 +1,117 @@
+"""KeyedRateLimiter key health, on its own and behind a client's retries"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.nft_scout.clients.alchemy import AlchemyClient
+from src.nft_scout.clients.helius import HeliusClient
+from src.nft_scout.clients.rate_limit import KeyedRateLimiter
+
+URL = "https://eth-mainnet.g.alchemy.com/nft/v3/getNFTsForContract"
+
+
+def test_rate_limited_key_cools_down_alone():
+    limiter = KeyedRateLimiter(rate=100)
+    limiter.record_rate_limited("a", retry_after=30)
+    now = time.monotonic()
+    assert limiter.health("a").state(now) == "cooling"
+    assert limiter.health("b").state(now) == "healthy"
+    assert limiter.healthy_keys(["a", "b"]) == 1
+    # Even as the client's current key, "a" is passed over while it cools down
+    assert limiter.reserve(["a", "b"], start=0) == ("b", 0.0)
+
+
+def test_rejected_key_opens_its_circuit():
+    limiter = KeyedRateLimiter(rate=100, failure_threshold=3)
+    limiter.record_rejected("a")
+    now = time.monotonic()
+    assert limiter.health("a").state(now) == "open"
+    assert limiter.health("a").circuit_open_until > now
+    assert limiter.reserve(["a", "b"], start=0)[0] == "b"
+
+
+
+def test_stats_keep_keys_with_the_same_mask_apart():
+    limiter = KeyedRateLimiter(rate=100)
+    limiter.reserve(["alch_first_xy"])
+    limiter.reserve(["alch_other_xy"])
+    limiter.record_rate_limited("alch_other_xy", retry_after=30)
+    # Labelled by position in the configured keys, not by which key was used first
+    stats = limiter.get_stats(["alch_other_xy", "alch_first_xy"])
+    assert stats["0:alch…xy"]["state"] == "cooling"
+    assert stats["1:alch…xy"]["state"] == "healthy"
+
+class FakeResponse:
+    def __init__(self, status, body=b"{}", headers=None):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+        self.request_info = SimpleNamespace(real_url=URL)
+        self.history = ()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        return False
+    
+    def raise_for_status(self):
+        pass
+    
+    async def read(self):
+        return self.body
+
+
+class FakeAlchemy(AlchemyClient):
+    """Answers every request signed with a key by the status `statuses[key]`"""
+    
+    def __init__(self, statuses):
+        super().__init__(list(statuses))
+        self.statuses = statuses
+        self.keys_used = []
+    
+    def _session_request(self, method, url, **kwargs):
+        key = url.rsplit("/", 1)[-1]
+        self.keys_used.append(key)
+        status = self.statuses[key]
+        return FakeResponse(status, headers={"Retry-After": "30"} if status == 429 else None)
+
+
+def send(client):
+    return asyncio.run(client._send("GET", URL, sign=lambda key, url, headers: (f"{url}/{key}", headers), coalesce=False))
+
+
+def test_429_cools_down_that_key_and_retries_on_another():
+    client = FakeAlchemy({"key-a": 429, "key-b": 200})
+    assert send(client) == {}
+    assert client.keys_used == ["key-a", "key-b"]
+    now = time.monotonic()
+    assert client.rate_limiter.health("key-a").state(now) == "cooling"
+    assert client.rate_limiter.health("key-a").cooldown_until - now > 25
+    assert client.rate_limiter.health("key-b").state(now) == "healthy"
+    # Later requests stay off the cooling key
+    send(client)
+    assert client.keys_used[-1] == "key-b"
+
+
+def test_401_and_403_open_the_rejected_keys_circuit():
+    for status in (401, 403):
+        client = FakeAlchemy({"key-a": status, "key-b": 200})
+        assert send(client) == {}
+        assert client.keys_used == ["key-a", "key-b"]
+        now = time.monotonic()
+        assert client.rate_limiter.health("key-a").state(now) == "open"
+        assert client.rate_limiter.health("key-b").state(now) == "healthy"
+
+
+def test_clients_without_keys_fail_before_sending():
+    for client, request in (
+        (FakeAlchemy({}), lambda client: client._make_request("GET", "getNFTsForContract", "ethereum")),
+        (HeliusClient([]), lambda client: client._make_rpc_request("getAsset", {"id": "A"})),
+    ):
+        client._session_request = lambda *args, **kwargs: pytest.fail("request sent without an API key")
+        with pytest.raises(ValueError, match="No API keys configured"):
+            asyncio.run(request(client))
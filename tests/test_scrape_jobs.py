@@ -0,0 +1,198 @@
+"""ScrapeJobManager: cancel, leave, ownership and checkpoints"""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from src.nft_scout.jobs import JobState, ScrapeJobManager
+from src.nft_scout.models import Chain, NormalizedNFT
+from src.nft_scout.storage.sqlite_store import CollectionStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    instance = CollectionStore(str(tmp_path / "jobs.db"))
+    yield instance
+    instance.close()
+
+
+async def stuck(job):
+    """A runner waiting on an upstream request that never answers"""
+    job.add_nft({"token_id": "1"}, total_scraped=1)
+    await asyncio.sleep(60)
+
+
+async def discard(text):
+    pass
+
+
+async def running(job):
+    """Wait until `job` holds a worker slot (its first checkpoint is written in a thread)"""
+    while job.state != JobState.RUNNING:
+        await asyncio.sleep(0.001)
+
+
+def test_cancel_stops_the_job_promptly_and_frees_its_slot(store):
+    async def scenario():
+        manager = ScrapeJobManager(max_jobs=1, store=store)
+        job = manager.submit(stuck, key="ethereum:0xabc")
+        waiting = manager.submit(stuck)
+        await running(job)
+        await asyncio.sleep(0.01)
+        assert waiting.state == JobState.QUEUED
+        started = time.perf_counter()
+        await manager.cancel(job.id)
+        elapsed = time.perf_counter() - started
+        await running(waiting)
+        checkpoint = await manager.get_checkpoint(job.id)
+        next_state = waiting.state
+        await manager.shutdown()
+        return job, elapsed, checkpoint, next_state, manager
+    
+    job, elapsed, checkpoint, next_state, manager = asyncio.run(scenario())
+    assert job.state == JobState.CANCELLED and job.done
+    assert elapsed < 0.1
+    assert checkpoint["state"] == JobState.CANCELLED.value
+    assert next_state == JobState.RUNNING
+    assert manager.active_job("ethereum:0xabc") is None
+
+
+def test_shutdown_leaves_jobs_resumable_as_interrupted(store):
+    async def scenario():
+        manager = ScrapeJobManager(store=store)
+        job = manager.submit(stuck)
+        await running(job)
+        await manager.shutdown()
+        restarted = ScrapeJobManager(store=store)
+        return job, await restarted.recover_interrupted()
+    
+    job, recovered = asyncio.run(scenario())
+    assert [checkpoint["job_id"] for checkpoint in recovered] == [job.id]
+    assert recovered[0]["state"] == JobState.INTERRUPTED.value
+    # The owner token survives the restart, so the owner can still resume
+    assert recovered[0]["token"] == job.token
+
+
+def test_rekeyed_job_is_found_and_resumed_under_its_new_key(store):
+    async def scenario():
+        manager = ScrapeJobManager(store=store)
+        job = manager.submit(stuck, key="ethereum:0xabc", contract_address="0xabc", chain="ethereum")
+        await running(job)
+        await manager.rekey(job, "polygon:0xabc", chain="polygon")
+        found = (manager.active_job("ethereum:0xabc"), manager.active_job("polygon:0xabc"))
+        checkpoint = await manager.get_checkpoint(job.id)
+        await manager.shutdown()
+        return job, found, checkpoint
+    
+    job, (old_key, new_key), checkpoint = asyncio.run(scenario())
+    assert old_key is None and new_key is job
+    assert job.key == "polygon:0xabc"
+    assert checkpoint["params"] == {"contract_address": "0xabc", "chain": "polygon"}
+
+
+def test_leaving_viewer_only_stops_the_job_when_it_was_the_last(store):
+    async def scenario():
+        manager = ScrapeJobManager(store=store)
+        job = manager.submit(stuck)
+        first = manager.subscribe(job, discard)
+        second = manager.subscribe(job, discard)
+        await running(job)
+        first_cancelled = await manager.leave(first)
+        state_after_first = job.state
+        second_cancelled = await manager.leave(second)
+        return job, first_cancelled, state_after_first, second_cancelled
+    
+    job, first_cancelled, state_after_first, second_cancelled = asyncio.run(scenario())
+    assert not first_cancelled and state_after_first == JobState.RUNNING
+    assert second_cancelled and job.state == JobState.CANCELLED
+
+
+def test_jobs_are_only_listed_to_their_viewers_and_owner():
+    async def scenario():
+        manager = ScrapeJobManager()
+        mine = manager.submit(stuck)
+        other = manager.submit(stuck)
+        listings = (
+            manager.list_jobs(),
+            manager.list_jobs(tokens=[mine.token]),
+            manager.list_jobs(job_ids=[other.id], tokens=["forged", None]),
+        )
+        await manager.shutdown()
+        return mine, other, listings
+    
+    mine, other, (anyone, owner, viewer) = asyncio.run(scenario())
+    assert anyone == []
+    assert [job["job_id"] for job in owner] == [mine.id]
+    assert [job["job_id"] for job in viewer] == [other.id]
+    # Summaries are broadcast to every viewer, so they never carry the token
+    assert all("token" not in job and mine.token not in str(job) for job in owner)
+    assert mine.owned_by(mine.token) and not mine.owned_by(other.token) and not mine.owned_by(None)
+
+
+def test_trimmed_nfts_are_replayed_from_where_they_are_stored(store):
+    published = [("ethereum", "0xaaa", "1"), ("polygon", "0xbbb", "1"), ("ethereum", "0xaaa", "2"), (None, None, "3")]
+    
+    async def publish(job):
+        for chain, contract, token_id in published:
+            job.add_nft({"token_id": token_id}, stored_as=chain and (chain, contract))
+            job.publish({"type": "status", "message": token_id})
+    
+    async def scenario():
+        for chain, contract, token_id in published[:3]:
+            nft = NormalizedNFT(token_id=token_id, contract_address=contract, chain=Chain(chain), name=f"{chain} {token_id}")
+            await store.upsert_nfts(chain, contract, [nft])
+        manager = ScrapeJobManager(store=store, buffer_size=2, replay_size=0)
+        job = manager.submit(publish)
+        frames = []
+        
+        async def collect(text):
+            frames.append(json.loads(text))
+        # Attached from the start, but only reading once the job has run past the buffer: the
+        # trimmed NFTs are kept for it even without a replay history
+        subscription = manager.subscribe(job, collect)
+        await job.task
+        await subscription.task
+        return job, frames
+    
+    job, frames = asyncio.run(scenario())
+    nfts = [nft for frame in frames if frame["type"] == "nft_batch" for nft in frame["nfts"]]
+    # In publish order, each from its own collection; the unstored one is reported missing
+    assert [nft["name"] for nft in nfts] == ["ethereum 1", "polygon 1", "ethereum 2"]
+    warnings = [frame["message"] for frame in frames if frame["type"] == "warning"]
+    assert len(warnings) == 1 and "1 earlier NFTs" in warnings[0]
+
+
+def test_trimmed_nfts_past_the_replay_size_are_forgotten_once_read(store):
+    async def publish(job):
+        await store.upsert_nfts("ethereum", "0xaaa", [
+            NormalizedNFT(token_id=str(token_id), contract_address="0xaaa", chain=Chain.ETHEREUM) for token_id in range(100)
+        ])
+        for token_id in range(100):
+            job.add_nft({"token_id": str(token_id)}, stored_as=("ethereum", "0xaaa"))
+            await asyncio.sleep(0)
+    
+    async def scenario():
+        manager = ScrapeJobManager(store=store, buffer_size=10, replay_size=20)
+        job = manager.submit(publish)
+        following = manager.subscribe(job, discard)
+        await job.task
+        await following.task
+        frames = []
+        
+        async def collect(text):
+            frames.append(json.loads(text))
+        late = manager.subscribe(job, collect)
+        await late.task
+        return job, frames
+    
+    job, frames = asyncio.run(scenario())
+    # Only the last replay_size trimmed NFTs are kept once nobody is behind them
+    assert len(job._trimmed) <= 20 and job._trimmed_offset + len(job._trimmed) > 80
+    nfts = [nft for frame in frames if frame["type"] == "nft_batch" for nft in frame["nfts"]]
+    # The late subscriber gets those back from the store, then the buffer
+    assert 20 < len(nfts) <= 30
+    assert [nft["token_id"] for nft in nfts] == [str(token_id) for token_id in range(100 - len(nfts), 100)]
+    warnings = [frame["message"] for frame in frames if frame["type"] == "warning"]
+    assert warnings == [f"⚠️ Earlier NFTs of job {job.id} are no longer available"]
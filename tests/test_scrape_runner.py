@@ -0,0 +1,324 @@
+"""web_server.scrape_collection_pages as a background job"""
+
+import asyncio
+import json
+from functools import partial
+
+import pytest
+from fastapi import HTTPException
+
+import web_server
+from src.nft_scout.jobs import JobState, ScrapeJobManager, nft_event
+from src.nft_scout.models import Chain, NormalizedNFT
+
+
+class Viewer:
+    """A WebSocket stand-in that keeps every frame it is sent"""
+    
+    def __init__(self):
+        self.frames = []
+    
+    async def send_text(self, text):
+        self.frames.append(json.loads(text))
+    
+    def of_type(self, kind):
+        return [frame for frame in self.frames if frame["type"] == kind]
+    
+    def nfts(self):
+        return [nft for frame in self.of_type("nft_batch") for nft in frame["nfts"]]
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    """
+    `pages` pages of 100 NFTs with raw metadata; set `error` to make page 2 on fail,
+    `blocked_at` to make that page hang until `release` is set
+    """
+    class Provider:
+        provider_name = "alchemy"
+        pages = 2
+        error = None
+        blocked_at = None
+        
+        def __init__(self):
+            self.calls = []
+            self.release = None
+        
+        async def fetch(self, client, contract_address, chain, cursor, page_size):
+            self.calls.append(cursor)
+            if cursor and self.error:
+                raise self.error
+            page = int(cursor or 0)
+            if page == self.blocked_at:
+                await self.release.wait()
+            start = page * 100
+            items = [
+                {
+                    "id": {"tokenId": str(token_id)},
+                    "contract": {"address": contract_address},
+                    "metadata": {"name": f"#{token_id}", "image": f"https://example.com/{token_id}.png", "blob": "x" * 500},
+                }
+                for token_id in (range(start, start + 100) if page < self.pages else ())
+            ]
+            await asyncio.sleep(0)
+            return "alchemy", items, {"pageKey": str(page + 1) if page + 1 < self.pages else None}
+    
+    instance = Provider()
+    monkeypatch.setattr(web_server.scout, "_get_client_for_chain", lambda chain: instance)
+    monkeypatch.setattr(web_server.scout, "_fetch_collection_page", instance.fetch)
+    return instance
+
+
+def submit(manager, contract, collection_total=200):
+    key = web_server.collection_job_key(Chain.ETHEREUM, contract)
+    job = manager.active_job(key)
+    if job:
+        return job
+    contract = web_server.normalize_contract_address(contract, Chain.ETHEREUM.value)
+    return manager.submit(
+        partial(web_server.scrape_collection_pages, contract_address=contract, chain=Chain.ETHEREUM, collection_total=collection_total),
+        key=key,
+        contract_address=contract,
+        chain=Chain.ETHEREUM.value,
+    )
+
+
+async def run_job(contract):
+    manager = ScrapeJobManager(store=web_server.scout.collection_store)
+    job = submit(manager, contract)
+    viewer = Viewer()
+    subscription = manager.subscribe(job, viewer.send_text)
+    await job.task
+    await subscription.task
+    return manager, job, viewer
+
+
+def test_nft_events_leave_raw_metadata_out(provider):
+    contract = "0x00000000000000000000000000000000000000a1"
+    manager, job, viewer = asyncio.run(run_job(contract))
+    nfts = viewer.nfts()
+    assert len(nfts) == 200 and job.state == JobState.COMPLETED
+    assert all("raw_metadata" not in nft for nft in nfts)
+    assert nfts[0]["image_url"] == "https://example.com/0.png"
+    
+    # Still available on demand
+    stored = asyncio.run(web_server.get_nft("ethereum", contract, "0"))
+    assert "x" * 500 in json.dumps(stored["raw_metadata"])
+
+
+def test_nft_events_carry_the_raw_image_fallback():
+    nft = NormalizedNFT(
+        token_id="7",
+        contract_address="So1ana",
+        chain=Chain.SOLANA,
+        raw_metadata={"content": {"files": [{"uri": "ar://image-7"}]}, "blob": "x" * 500},
+    )
+    event = nft_event(nft)
+    assert event["image_url"] == "ar://image-7" and "raw_metadata" not in event
+    # A normalized image wins, and NFTs without raw metadata are left alone
+    with_image = NormalizedNFT(**{**nft.model_dump(), "image_url": "https://example.com/7.png"})
+    assert nft_event(with_image)["image_url"] == "https://example.com/7.png"
+    assert nft_event(NormalizedNFT(token_id="8", contract_address="So1ana", chain=Chain.SOLANA))["image_url"] is None
+
+
+def test_failed_walk_fails_the_job_and_its_checkpoint(provider):
+    provider.error = RuntimeError("upstream exploded")
+    contract = "0x00000000000000000000000000000000000000a2"
+    manager, job, viewer = asyncio.run(run_job(contract))
+    assert job.state == JobState.FAILED
+    assert "upstream exploded" in job.error
+    # Published once, by the runner (with its api_source), not again by the manager
+    errors = viewer.of_type("error")
+    assert len(errors) == 1 and errors[0]["message"] == job.error
+    assert not viewer.of_type("complete")
+    checkpoint = asyncio.run(manager.get_checkpoint(job.id))
+    assert checkpoint["state"] == JobState.FAILED.value
+    assert checkpoint["progress"]["total_scraped"] == 100
+
+
+def test_collection_without_nfts_fails_the_job(provider):
+    provider.pages = 0
+    contract = "0x00000000000000000000000000000000000000a9"
+    manager, job, viewer = asyncio.run(run_job(contract))
+    assert job.state == JobState.FAILED
+    assert "No NFTs found" in job.error
+    errors = viewer.of_type("error")
+    assert len(errors) == 1 and errors[0]["message"] == job.error
+    assert not viewer.of_type("complete")
+    checkpoint = asyncio.run(manager.get_checkpoint(job.id))
+    assert checkpoint["state"] == JobState.FAILED.value and checkpoint["error"] == job.error
+
+
+def test_late_joiner_past_the_buffer_gets_every_nft_once(provider):
+    provider.pages = 6
+    contract = "0x00000000000000000000000000000000000000a3"
+    
+    async def scenario():
+        manager = ScrapeJobManager(store=web_server.scout.collection_store, buffer_size=100)
+        job = submit(manager, contract, collection_total=600)
+        first = Viewer()
+        manager.subscribe(job, first.send_text)
+        while job.nfts_published < 350:
+            await asyncio.sleep(0)
+        # Hundreds of events have been trimmed from the buffer by now
+        assert job._first_seq > 0 and len(job._trimmed) > 100
+        late = Viewer()
+        subscription = manager.subscribe(job, late.send_text)
+        await job.task
+        await subscription.task
+        return job, first, late
+    
+    job, first, late = asyncio.run(scenario())
+    expected = [str(token_id) for token_id in range(600)]
+    assert [nft["token_id"] for nft in late.nfts()] == expected
+    assert not late.of_type("warning") and late.of_type("complete")
+    # The late joiner's counters run on from the replayed NFTs
+    assert late.of_type("nft_batch")[-1]["total_scraped"] == 600
+
+
+def test_late_joiner_follows_publish_order_not_store_order(provider):
+    provider.pages = 3
+    contract = "0x00000000000000000000000000000000000000a6"
+    
+    async def scenario():
+        store = web_server.scout.collection_store
+        # An earlier partial scrape left the last page's rows first in the table
+        await store.upsert_nfts("ethereum", contract, [
+            NormalizedNFT(token_id=str(token_id), contract_address=contract, chain=Chain.ETHEREUM)
+            for token_id in range(200, 300)
+        ])
+        manager = ScrapeJobManager(store=store, buffer_size=50)
+        job = submit(manager, contract, collection_total=300)
+        await job.task
+        late = Viewer()
+        subscription = manager.subscribe(job, late.send_text)
+        await subscription.task
+        return late
+    
+    late = asyncio.run(scenario())
+    assert [nft["token_id"] for nft in late.nfts()] == [str(token_id) for token_id in range(300)]
+    assert not late.of_type("warning")
+
+
+def test_mixed_case_requests_share_one_job_and_one_sync_row(provider):
+    checksummed = "0x00000000000000000000000000000000000000Aa"
+    
+    async def scenario():
+        manager = ScrapeJobManager(store=web_server.scout.collection_store)
+        job = submit(manager, checksummed)
+        joined = submit(manager, checksummed.lower())
+        await job.task
+        store = web_server.scout.collection_store
+        return job, joined, await store.get_sync_state("ethereum", checksummed.lower()), await store.count_nfts("ethereum", checksummed)
+    
+    job, joined, state, stored = asyncio.run(scenario())
+    assert joined is job
+    assert job.params["contract_address"] == checksummed.lower()
+    assert state["complete"] and stored == 200
+
+
+def test_interrupted_job_resumes_from_its_checkpoint(provider, monkeypatch):
+    provider.pages = 6
+    provider.blocked_at = 3
+    contract = "0x00000000000000000000000000000000000000a4"
+    
+    async def scenario():
+        provider.release = asyncio.Event()
+        store = web_server.scout.collection_store
+        manager = ScrapeJobManager(store=store)
+        job = submit(manager, contract, collection_total=600)
+        while job.nfts_published < 300:
+            await asyncio.sleep(0.001)
+        await job.checkpoint(force=True)
+        # Redeploy: the process goes away mid-page, the next one finds the job interrupted
+        await manager.shutdown()
+        restarted = ScrapeJobManager(store=store)
+        monkeypatch.setattr(web_server, "jobs", restarted)
+        [checkpoint] = await restarted.recover_interrupted()
+        provider.calls.clear()
+        provider.release.set()
+        resumed = web_server.resume_scrape_job(checkpoint)
+        viewer = Viewer()
+        subscription = restarted.subscribe(resumed, viewer.send_text)
+        await resumed.task
+        await subscription.task
+        return job, checkpoint, resumed, viewer
+    
+    job, checkpoint, resumed, viewer = asyncio.run(scenario())
+    assert checkpoint["state"] == JobState.INTERRUPTED.value
+    assert resumed.id == job.id and resumed.token == job.token
+    assert resumed.state == JobState.COMPLETED
+    # Pages 0-2 come from the store; only the uncommitted ones are fetched again
+    assert provider.calls == ["3", "4", "5"]
+    assert [nft["token_id"] for nft in viewer.nfts()] == [str(token_id) for token_id in range(600)]
+
+
+def test_job_routes_need_the_owner_token(provider):
+    provider.blocked_at = 1
+    contract = "0x00000000000000000000000000000000000000a5"
+    
+    async def scenario(monkeypatch_jobs):
+        provider.release = asyncio.Event()
+        manager = ScrapeJobManager(store=web_server.scout.collection_store)
+        monkeypatch_jobs(manager)
+        job = submit(manager, contract)
+        while job.state != JobState.RUNNING:
+            await asyncio.sleep(0.001)
+        refused = []
+        for call in (
+            web_server.cancel_job(job.id, x_job_token=None),
+            web_server.cancel_job(job.id, x_job_token="forged"),
+        ):
+            with pytest.raises(HTTPException) as error:
+                await call
+            refused.append(error.value.status_code)
+        listed_without = await web_server.list_jobs(x_job_token=None)
+        listed_with = await web_server.list_jobs(x_job_token=f"other,{job.token}")
+        state_before = job.state
+        cancelled = await web_server.cancel_job(job.id, x_job_token=job.token)
+        with pytest.raises(HTTPException) as error:
+            await web_server.resume_job(job.id, x_job_token="forged")
+        resume_refused = error.value.status_code
+        return refused, listed_without, listed_with, state_before, cancelled, resume_refused, job
+    
+    with pytest.MonkeyPatch.context() as patch:
+        result = asyncio.run(scenario(lambda manager: patch.setattr(web_server, "jobs", manager)))
+    refused, listed_without, listed_with, state_before, cancelled, resume_refused, job = result
+    assert refused == [403, 403] and state_before == JobState.RUNNING
+    assert listed_without == {"jobs": []}
+    assert [listed["job_id"] for listed in listed_with["jobs"]] == [job.id]
+    assert cancelled["state"] == JobState.CANCELLED.value
+    assert resume_refused == 403
+
+
+def test_job_summary_needs_the_owner_or_read_token(provider):
+    provider.blocked_at = 1
+    contract = "0x00000000000000000000000000000000000000a6"
+    
+    async def read(job_id, *tokens):
+        answers = []
+        for token in tokens:
+            try:
+                answers.append((await web_server.get_job(job_id, x_job_token=token))["state"])
+            except HTTPException as error:
+                answers.append(error.status_code)
+        return answers
+    
+    async def scenario(monkeypatch_jobs):
+        provider.release = asyncio.Event()
+        manager = ScrapeJobManager(store=web_server.scout.collection_store)
+        monkeypatch_jobs(manager)
+        job = submit(manager, contract)
+        while job.state != JobState.RUNNING:
+            await asyncio.sleep(0.001)
+        live = await read(job.id, None, "forged", job.view_token, job.token)
+        await manager.shutdown()
+        # After a restart only the checkpoint is left, and only its owner sees it
+        monkeypatch_jobs(ScrapeJobManager(store=web_server.scout.collection_store))
+        interrupted = await read(job.id, job.view_token, job.token)
+        return live, interrupted
+    
+    with pytest.MonkeyPatch.context() as patch:
+        live, interrupted = asyncio.run(scenario(lambda manager: patch.setattr(web_server, "jobs", manager)))
+    assert live == [404, 404, "running", "running"]
+    assert interrupted == [404, "running"]
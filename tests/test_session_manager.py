@@ -0,0 +1,41 @@
+"""Pooled sessions across event loops and who closes them"""
+
+import asyncio
+
+from src.nft_scout.clients.magiceden import MagicEdenClient
+from src.nft_scout.clients.session import SessionManager
+
+
+def test_session_of_a_finished_loop_is_closed_when_replaced():
+    manager = SessionManager()
+    
+    async def open_session():
+        return manager.get_session("alchemy")
+    
+    async def reopen_and_close():
+        replacement = manager.get_session("alchemy")
+        await manager.close()
+        return replacement
+    
+    first = asyncio.run(open_session())
+    second = asyncio.run(reopen_and_close())
+    assert second is not first
+    assert first.closed and second.closed
+    assert manager._stale == []
+
+
+def test_client_closes_only_the_pool_it_created():
+    shared = SessionManager()
+    
+    async def scenario():
+        standalone = MagicEdenClient()
+        pooled = MagicEdenClient(session_manager=shared)
+        private_session = standalone.session_manager.get_session("magiceden")
+        shared_session = shared.get_session("magiceden")
+        await standalone.close()
+        await pooled.close()
+        closed = (private_session.closed, shared_session.closed)
+        await shared.close()
+        return closed
+    
+    assert asyncio.run(scenario()) == (True, False)
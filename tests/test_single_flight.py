@@ -0,0 +1,103 @@
+"""Single-flight request sharing in BaseAPIClient._send"""
+
+import asyncio
+
+from src.nft_scout.clients.base import BaseAPIClient
+
+
+class FakeClient(BaseAPIClient):
+    """Every fetch waits for `release` and records whether it was cancelled"""
+    
+    def __init__(self):
+        super().__init__(["key"], "https://api.example")
+        self.release = asyncio.Event()
+        self.started = 0
+        self.aborted = 0
+    
+    async def _fetch_body(self, method, url, params, json_data, headers, sign, allow_not_found=False):
+        self.started += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.aborted += 1
+            raise
+        return b'{"ok": true}'
+    
+    async def get_wallet_nfts(self, *args, **kwargs):
+        pass
+    
+    async def get_collection_metadata(self, *args, **kwargs):
+        pass
+    
+    async def get_token_metadata(self, *args, **kwargs):
+        pass
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_identical_requests_share_one_fetch():
+    async def scenario():
+        client = FakeClient()
+        callers = [asyncio.create_task(client._send("GET", "https://api.example/a")) for _ in range(3)]
+        await settle()
+        client.release.set()
+        results = await asyncio.gather(*callers)
+        assert results == [{"ok": True}] * 3
+        assert client.started == 1
+        assert client.transport_stats["coalesced"] == 2
+        assert not client._in_flight and not client._flight_waiters
+    asyncio.run(scenario())
+
+
+def test_one_cancelled_waiter_keeps_the_fetch_for_the_others():
+    async def scenario():
+        client = FakeClient()
+        first = asyncio.create_task(client._send("GET", "https://api.example/a"))
+        second = asyncio.create_task(client._send("GET", "https://api.example/a"))
+        await settle()
+        first.cancel()
+        await settle()
+        assert client.aborted == 0 and len(client._in_flight) == 1
+        client.release.set()
+        assert await second == {"ok": True}
+        assert first.cancelled()
+    asyncio.run(scenario())
+
+
+def test_last_cancelled_waiter_aborts_the_fetch():
+    async def scenario():
+        client = FakeClient()
+        callers = [asyncio.create_task(client._send("GET", "https://api.example/a")) for _ in range(2)]
+        await settle()
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await settle()
+        assert client.aborted == 1
+        assert client.transport_stats["cancelled"] == 1
+        assert not client._in_flight and not client._flight_waiters
+    asyncio.run(scenario())
+
+
+def test_request_after_cancel_gets_a_fresh_flight_that_stays_registered():
+    async def scenario():
+        client = FakeClient()
+        old = asyncio.create_task(client._send("GET", "https://api.example/a"))
+        await settle()
+        old.cancel()
+        # Registered before the cancelled flight has unwound
+        new = asyncio.create_task(client._send("GET", "https://api.example/a"))
+        await settle()
+        assert client.started == 2 and client.aborted == 1
+        assert len(client._in_flight) == 1
+        # The old flight's done-callback must not evict the new one
+        joiner = asyncio.create_task(client._send("GET", "https://api.example/a"))
+        await settle()
+        assert client.started == 2 and client.transport_stats["coalesced"] == 1
+        client.release.set()
+        assert await asyncio.gather(new, joiner) == [{"ok": True}] * 2
+        assert not client._in_flight
+    asyncio.run(scenario())
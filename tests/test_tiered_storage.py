@@ -0,0 +1,77 @@
+"""TieredStorage cache invalidation between workers"""
+
+import asyncio
+from dataclasses import replace
+
+from src.nft_scout.config import Config
+from src.nft_scout.storage.tiered import TieredStorage
+
+
+class FakePubSub:
+    def __init__(self, messages):
+        self.messages = messages
+    
+    async def subscribe(self, channel):
+        pass
+    
+    async def unsubscribe(self, channel):
+        pass
+    
+    async def listen(self):
+        for data in self.messages:
+            yield {"type": "message", "data": data}
+    
+    async def aclose(self):
+        pass
+
+
+class FakeRedis:
+    """Records publishes; a pubsub replays `messages`"""
+    
+    def __init__(self, messages=()):
+        self.published = []
+        self.messages = list(messages)
+    
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+    
+    def pubsub(self, ignore_subscribe_messages=False):
+        return FakePubSub(self.messages)
+
+
+def make_storage(redis_client) -> TieredStorage:
+    storage = TieredStorage(replace(Config.from_env(), redis_url="redis://localhost:6379", cache_invalidation=True))
+    storage.l2.redis_client = redis_client
+    storage.l2._initialized = True
+    
+    async def set_many(items, ttl=900):
+        pass
+    storage.l2.set_many = set_many
+    storage._ensure_listener = lambda: asyncio.sleep(0)
+    return storage
+
+
+def test_set_many_publishes_one_invalidation_for_all_keys():
+    redis_client = FakeRedis()
+    storage = make_storage(redis_client)
+    asyncio.run(storage.set_many({"page:a:1": 1, "page:a:2": 2, "page:a:3": 3}))
+    assert redis_client.published == [(TieredStorage.CHANNEL, f"{storage.instance_id}:page:a:1\npage:a:2\npage:a:3")]
+    assert storage.invalidations_sent == 3
+
+
+def test_listener_drops_every_key_of_a_batch_but_skips_its_own():
+    storage = make_storage(None)
+    storage.l2.redis_client = FakeRedis([
+        f"{storage.instance_id}:mine".encode(),
+        b"other-worker:page:a:1\npage:a:2",
+        b"other-worker:single",
+    ])
+    
+    async def scenario():
+        for key in ("mine", "page:a:1", "page:a:2", "single", "kept"):
+            await storage.l1.set_cache(key, key)
+        await storage._listen()
+        return {key for key in ("mine", "page:a:1", "page:a:2", "single", "kept") if storage.l1.get_nowait(key)}
+    
+    assert asyncio.run(scenario()) == {"mine", "kept"}
+    assert storage.invalidations_received == 3
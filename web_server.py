@@ -6,7 +6,9 @@ Web UI server for NFT Scout with live scraping
 import asyncio
 import re
 import json
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Request
+import secrets
+from functools import partial
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Request, Header
 from fastapi.responses import HTMLResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
@@ -18,11 +20,14 @@ import os
 
 from src.nft_scout import NFTScout, Chain
 from src.nft_scout.models import NormalizedNFT
+from src.nft_scout.jobs import JobError, ScrapeJob, ScrapeJobManager, nft_event
 from src.nft_scout.utils import (
     validate_contract_address,
     sanitize_input,
     validate_url,
-    validate_chain
+    validate_chain,
+    normalize_contract_address,
+    format_age,
 )
 from src.nft_scout.security import (
     sanitize_blockchain_address,
@@ -115,6 +120,36 @@ manager = ConnectionManager()
 # Initialize NFT Scout
 scout = NFTScout()
 
+# Collection scrapes run as background jobs; WebSocket connections subscribe to them
+jobs = ScrapeJobManager(
+    max_jobs=scout.config.scrape_max_jobs,
+    buffer_size=scout.config.scrape_job_buffer,
+    replay_size=scout.config.scrape_job_replay,
+    retention=scout.config.scrape_job_retention,
+    store=scout.collection_store,  # checkpoints, so interrupted scrapes can be resumed
+    checkpoint_interval=scout.config.scrape_checkpoint_interval,
+    sender_options={
+        "batch_size": scout.config.ws_batch_size,
+        "max_delay": scout.config.ws_batch_interval,
+        "status_rate": scout.config.ws_status_rate,
+    },
+)
+
+
+@app.on_event("startup")
+async def recover_scrape_jobs():
+    """Mark scrapes cut short by the last shutdown as interrupted (and resume them if configured)"""
+    for checkpoint in await jobs.recover_interrupted():
+        if scout.config.scrape_auto_resume:
+            resume_scrape_job(checkpoint)
+
+
+@app.on_event("shutdown")
+async def shutdown_scout():
+    """Stop background scrapes and close pooled upstream connections on shutdown"""
+    await jobs.shutdown()
+    await scout.close()
+
 
 async def fetch_nintondo_contract_address(url: str) -> Optional[str]:
     """Fetch contract address from Nintondo page using multiple methods (with SSRF protection)"""
@@ -532,6 +567,85 @@ async def favicon():
     return Response(status_code=204)
 
 
+@app.get("/api/stats")
+async def get_stats():
+    """Runtime stats (connection pool occupancy and reuse per provider, scrape jobs)"""
+    stats = scout.get_stats()
+    stats["scrape_jobs"] = jobs.get_stats()
+    return stats
+
+
+@app.get("/api/jobs")
+async def list_jobs(x_job_token: Optional[str] = Header(None)):
+    """Scrape jobs owned by the caller (X-Job-Token: one or more comma-separated owner tokens)"""
+    return {"jobs": jobs.list_jobs(tokens=(x_job_token or "").split(","))}
+
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str, x_job_token: Optional[str] = Header(None)):
+    """
+    State and progress of one scrape job (also of interrupted jobs from before a restart)
+    
+    X-Job-Token must hold the job's owner or read token; an interrupted job
+    is only shown to its owner. Without one the job is reported as not found.
+    """
+    job = jobs.get(job_id)
+    if job and job.readable_by(x_job_token):
+        return job.summary()
+    checkpoint = None if job else await jobs.get_checkpoint(job_id)
+    if not checkpoint or not checkpoint_owned_by(checkpoint, x_job_token):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return checkpoint_summary(checkpoint)
+
+
+@app.post("/api/jobs/{job_id}/resume")
+async def resume_job(job_id: str, x_job_token: Optional[str] = Header(None)):
+    """Resume an interrupted scrape from its last checkpoint (owner token in X-Job-Token)"""
+    job = jobs.get(job_id)
+    if job and not job.done:
+        if not job.readable_by(x_job_token):
+            raise HTTPException(status_code=404, detail="Job not found")
+        return job.summary()
+    checkpoint = await jobs.get_checkpoint(job_id)
+    if not checkpoint:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if not checkpoint_owned_by(checkpoint, x_job_token):
+        raise HTTPException(status_code=403, detail="Only the job's owner can resume it")
+    return resume_scrape_job(checkpoint).summary()
+
+
+@app.post("/api/jobs/{job_id}/cancel")
+async def cancel_job(job_id: str, x_job_token: Optional[str] = Header(None)):
+    """Stop a scrape job for everyone following it (owner token in X-Job-Token; what it saved stays)"""
+    job = jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if not job.owned_by(x_job_token):
+        raise HTTPException(status_code=403, detail="Only the job's owner can cancel it")
+    await jobs.cancel(job_id)
+    return job.summary()
+
+
+@app.get("/api/nfts/{chain}/{contract_address}/{token_id}")
+async def get_nft(chain: str, contract_address: str, token_id: str):
+    """
+    One scraped NFT from the collection store, including its raw provider metadata
+    
+    The store is world-readable: it outlives the jobs that filled it and only
+    holds public provider data, so no X-Job-Token is needed (unlike /api/jobs).
+    """
+    try:
+        chain_enum = Chain(chain)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Unknown chain: {chain}")
+    if scout.collection_store is None:
+        raise HTTPException(status_code=404, detail="Collection store is disabled")
+    nft = await scout.collection_store.get_nft(chain_enum.value, contract_address, token_id)
+    if nft is None:
+        raise HTTPException(status_code=404, detail="NFT not found")
+    return nft.model_dump(mode="json")
+
+
 @app.post("/api/scrape/collection")
 async def scrape_collection(collection_url: str):
     """Start scraping a collection with input validation"""
@@ -573,17 +687,976 @@ async def scrape_collection(collection_url: str):
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+async def run_collection_scrape(
+    job: ScrapeJob,
+    collection_url: str,
+    contract_address: str,
+    chain: Chain,
+    full_resync: bool = False,
+):
+    """
+    Scrape a whole collection as a background job
+    
+    Everything the browser sees (collection info, status, NFTs, progress) is
+    published to `job`; WebSocket connections subscribe to it and may come
+    and go while it runs. `full_resync` walks the whole collection again
+    instead of serving the stored copy (see NFTScout.iter_collection_synced).
+    """
+    collection_total = None  # Will be fetched BEFORE scraping starts
+    collection_name = None
+    page_count = 0
+    
+    # Clear previous results
+    job.publish({
+        "type": "clear",
+        "message": "Starting new scrape...",
+    })
+    
+    # Say where the rows will come from: the collection store, the provider, or both
+    sync = await scout.get_sync_info(contract_address, chain)
+    if scout.collection_store is None:
+        store_message = f"Collection store is disabled, every page of {contract_address} is fetched from the provider"
+    elif not sync:
+        store_message = f"📥 {contract_address} is not in the collection store yet, fetching every page from the provider"
+    elif full_resync or sync["stale"]:
+        store_message = (
+            f"🔄 Stored copy of {contract_address} was last walked in full {format_age(sync['walk_started_at'])}, "
+            f"walking the whole collection again and updating the store"
+        )
+    else:
+        store_message = (
+            f"📦 {sync['stored']:,} NFTs are served from the collection store (last synced "
+            f"{format_age(sync['synced_at'])}, last full walk {format_age(sync['walk_started_at'])}); "
+            f"only pages after the last sync are fetched"
+        )
+    job.publish({
+        "type": "status",
+        "message": store_message,
+        "api_source": "Backend",
+        "chain": chain.value,
+    })
+    
+    # STEP 1: Fetch collection info FIRST before scraping
+    job.publish({
+        "type": "status",
+        "message": f"Fetching collection information...",
+        "chain": chain.value,
+    })
+    
+    # Extract Magic Eden symbol if it's a Magic Eden URL
+    magic_eden_symbol = None
+    if chain == Chain.SOLANA and "magiceden" in collection_url.lower():
+        # If contract_address looks like a symbol (not a Solana address)
+        if len(contract_address) < 32:
+            magic_eden_symbol = contract_address
+    
+    collection_stats = None
+    
+    # For Solana/Helius, get total from a small query first
+    if chain == Chain.SOLANA and scout.helius:
+        try:
+            # Use large page_size to get accurate total (Helius returns total based on items in response)
+            # With page_size=1000, if collection < 1000, we get exact total
+            logger.info(f"Fetching collection total for {contract_address} on {chain.value}...")
+            job.publish({
+                "type": "status",
+                "message": f"🔍 Querying Helius API for collection total...",
+                "api_source": "Helius",
+                "chain": chain.value,
+            })
+            response = await scout.get_collection_nfts(
+                contract_address,
+                chain,
+                cursor=None,
+                page_size=1000,  # Use large page size to get accurate total
+            )
+            
+            # After first query, get the resolved address if available
+            if response.resolved_address:
+                logger.info(f"Resolved collection address: {response.resolved_address}")
+                # Update contract_address to use resolved address for scraping
+                contract_address = response.resolved_address
+            
+            # Detailed logging - show what we got from Helius
+            job.publish({
+                "type": "status",
+                "message": f"📊 Helius Response: total={response.total if hasattr(response, 'total') else 'None'}, total_count={response.total_count}, nfts={len(response.nfts)}, has_more={response.has_more}, cursor={'Yes' if response.cursor else 'None'}",
+                "api_source": "Helius",
+                "chain": chain.value,
+            })
+            
+            # Helius reports the total with the first page
+            if hasattr(response, 'total') and response.total:
+                collection_total = response.total
+                job.publish({
+                    "type": "status",
+                    "message": f"✅ Using response.total: {collection_total:,} NFTs",
+                    "api_source": "Helius",
+                    "chain": chain.value,
+                })
+            else:
+                job.publish({
+                    "type": "status",
+                    "message": f"⚠️ Helius total is None - response.total={response.total if hasattr(response, 'total') else 'None'}",
+                    "api_source": "Helius",
+                    "chain": chain.value,
+                })
+            
+            # Get full collection stats with marketplace data (Magic Eden)
+            try:
+                job.publish({
+                    "type": "status",
+                    "message": f"🔍 Fetching collection stats from multiple APIs (Helius, Magic Eden, Moralis)...",
+                    "api_source": "Multi-API",
+                    "chain": chain.value,
+                })
+                collection_stats = await scout.get_collection_stats(
+                    contract_address,
+                    chain,
+                    magic_eden_symbol=magic_eden_symbol,
+                    collection_url=collection_url
+                )
+                
+                # Detailed logging - show what we got from stats
+                job.publish({
+                    "type": "status",
+                    "message": f"📊 CollectionStats: name={collection_stats.name}, total_supply={collection_stats.total_supply}, floor_price={collection_stats.floor_price}, volume_24h={collection_stats.volume_24h}, owners={collection_stats.total_owners}",
+                    "api_source": "Multi-API",
+                    "chain": chain.value,
+                })
+                
+                collection_name = collection_stats.name
+                # Use stats total_supply if available (more accurate)
+                if collection_stats.total_supply:
+                    old_total = collection_total
+                    collection_total = collection_stats.total_supply
+                    job.publish({
+                        "type": "status",
+                        "message": f"✅ Magic Eden: Using total_supply={collection_total:,} (was {old_total if old_total else 'None'})",
+                        "api_source": "Magic Eden",
+                        "chain": chain.value,
+                    })
+                else:
+                    job.publish({
+                        "type": "status",
+                        "message": f"⚠️ Magic Eden: total_supply is None. Checking other fields...",
+                        "api_source": "Magic Eden",
+                        "chain": chain.value,
+                    })
+            except Exception as e:
+                logger.debug(f"Error getting collection stats: {e}")
+        except Exception as e:
+            logger.warning(f"Error fetching collection info: {e}")
+            # Continue anyway - we'll try to get total during scraping
+    
+    # For EVM chains, try to get stats which may include supply and marketplace data
+    else:
+        try:
+            job.publish({
+                "type": "status",
+                "message": f"🔍 Fetching collection stats from multiple APIs (Alchemy, Reservoir, Moralis)...",
+                "api_source": "Multi-API",
+                "chain": chain.value,
+            })
+            collection_stats = await scout.get_collection_stats(
+                contract_address, 
+                chain,
+                collection_url=collection_url
+            )
+            
+            # Extract collection name - prioritize Reservoir data
+            collection_name = collection_stats.name
+            logger.info(f"📊 CollectionStats received: name='{collection_name}', total_supply={collection_stats.total_supply}, contract={contract_address}")
+            
+            # Detailed logging - show what we got
+            job.publish({
+                "type": "status",
+                "message": f"📊 CollectionStats: name={collection_name or 'None'}, total_supply={collection_stats.total_supply or 'None'}, floor_price={collection_stats.floor_price}, owners={collection_stats.total_owners}, volume_24h={collection_stats.volume_24h}",
+                "api_source": "Multi-API",
+                "chain": chain.value,
+            })
+            
+            # Check if stats has total_supply
+            if collection_stats.total_supply:
+                collection_total = collection_stats.total_supply
+                logger.info(f"✅ Collection total from stats.total_supply: {collection_total:,}")
+                job.publish({
+                    "type": "status",
+                    "message": f"✅ Reservoir/Alchemy: Using total_supply={collection_total:,} NFTs",
+                    "api_source": "Reservoir/Alchemy",
+                    "chain": chain.value,
+                })
+            else:
+                logger.warning(f"⚠️ collection_stats.total_supply is None for {contract_address}")
+                job.publish({
+                    "type": "status",
+                    "message": f"⚠️ Reservoir/Alchemy: total_supply is None. Will determine during scraping.",
+                    "api_source": "Reservoir/Alchemy",
+                    "chain": chain.value,
+                })
+            
+            # Log final collection name
+            if collection_name and collection_name != contract_address:
+                logger.info(f"✅ Collection name extracted: '{collection_name}'")
+            else:
+                logger.warning(f"⚠️ Collection name is missing or same as contract address: '{collection_name}'")
+        except Exception as e:
+            logger.debug(f"Error getting collection stats: {e}")
+            # Continue anyway - we'll try to get total during scraping
+    
+    # CRITICAL: If collection_total is still None, COUNT BY PAGINATING
+    # This is essential for Ethereum collections where APIs don't provide total
+    # BUT: Skip counting if we already have a valid total from get_collection_info
+    logger.info(f"🔍 [scrape_collection] After collection_stats: collection_total={collection_total}, chain={chain.value}, is_solana={chain == Chain.SOLANA}")
+    
+    should_count = False
+    
+    # Skip counting if we already have a valid total (likely from get_collection_info)
+    # Only count if total is None, suspiciously low, or equals page size
+    if collection_total and collection_total > 100 and collection_total != 100:
+        logger.info(f"✅ [scrape_collection] Skipping count - already have valid total: {collection_total:,} (likely from get_collection_info)")
+        should_count = False
+    # Always count for Ethereum if total is None (Alchemy doesn't provide it)
+    elif chain != Chain.SOLANA and not collection_total:
+        should_count = True
+        logger.info(f"🔍 [Ethereum] Collection total is None. Will count NFTs by paginating through all pages...")
+        logger.warning(f"⚠️ [Ethereum] APIs did not provide total_supply. Counting NFTs by paginating...")
+    elif not collection_total:
+        # For other chains too
+        should_count = True
+        logger.info(f"🔍 Collection total is None. Will count NFTs by paginating through all pages...")
+        logger.warning(f"⚠️ APIs did not provide total_supply. Counting NFTs by paginating...")
+    elif (chain != Chain.SOLANA and collection_total == 100) or (chain == Chain.SOLANA and collection_total == 1000):
+        # For Ethereum, 100 is page size; for Solana, 1000 is page size
+        should_count = True
+        logger.info(f"🔍 Collection total ({collection_total}) equals page size limit. Counting NFTs by paginating...")
+    elif chain != Chain.SOLANA and collection_total and collection_total <= 100:
+        # For Ethereum, any total <= 100 is suspicious (could be page size)
+        should_count = True
+        logger.info(f"🔍 [Ethereum] Collection total ({collection_total}) seems suspiciously low. Counting NFTs by paginating...")
+    
+    logger.info(f"🔍 [scrape_collection] should_count={should_count}, collection_total={collection_total}")
+    
+    if should_count:
+        logger.info(f"🚀 [scrape_collection] Starting NFT counting process for {contract_address} on {chain.value}...")
+        try:
+            job.publish({
+                "type": "status",
+                "message": f"🔢 Counting total NFTs in collection (this may take a moment)...",
+                "api_source": "Backend",
+            })
+            
+            # Paginate through collection to count all NFTs
+            total_counted = 0
+            current_cursor = None
+            page_count = 0
+            max_count_pages = 200 if chain != Chain.SOLANA else 100  # Safety limit
+            consecutive_empty_pages = 0
+            page_size = 100 if chain != Chain.SOLANA else 1000  # Alchemy max is 100, Helius is 1000
+            
+            while page_count < max_count_pages:
+                try:
+                    count_response = await scout.get_collection_nfts(
+                        contract_address,
+                        chain,
+                        cursor=current_cursor,
+                        page_size=page_size,
+                    )
+                except Exception as count_err:
+                    logger.error(f"Error counting NFTs on page {page_count + 1}: {count_err}")
+                    break
+                
+                nfts_in_page = len(count_response.nfts)
+                total_counted += nfts_in_page
+                page_count += 1
+                
+                # Update progress every 5 pages for Ethereum
+                update_interval = 5 if chain != Chain.SOLANA else 10
+                if page_count % update_interval == 0 or nfts_in_page == 0:
+                    job.publish({
+                        "type": "status",
+                        "message": f"🔢 Counting... Found {total_counted:,} NFTs so far (page {page_count})...",
+                        "api_source": "Backend",
+                    })
+                
+                logger.info(f"Count page {page_count}: got {nfts_in_page} NFTs, total so far: {total_counted:,}, has_more={count_response.has_more}, cursor={'Yes' if count_response.cursor else 'No'}")
+                
+                # If we got 0 NFTs, check if we should continue
+                if nfts_in_page == 0:
+                    consecutive_empty_pages += 1
+                    if consecutive_empty_pages >= 2:
+                        logger.warning(f"Got {consecutive_empty_pages} consecutive empty pages, stopping count")
+                        break
+                else:
+                    consecutive_empty_pages = 0
+                
+                # CRITICAL: For Ethereum/Alchemy, if we got exactly page_size NFTs, there's almost certainly more
+                # Continue paginating until we get less than a full page OR no cursor
+                # This matches Solana's behavior - keep going until we actually run out
+                
+                # Get cursor for next page - check both cursor and pageKey (Alchemy uses pageKey)
+                next_cursor = count_response.cursor or getattr(count_response, 'pageKey', None)
+                
+                if next_cursor:
+                    # We have a cursor/pageKey - definitely more pages
+                    current_cursor = next_cursor
+                    logger.debug(f"Got cursor/pageKey for next page: {str(current_cursor)[:50]}...")
+                elif nfts_in_page == page_size:
+                    # Got full page but no cursor - for Alchemy, try using last token ID as cursor
+                    # Alchemy accepts startToken which can be any token ID from the collection
+                    if count_response.nfts and len(count_response.nfts) > 0:
+                        last_nft = count_response.nfts[-1]
+                        token_id = None
+                        if hasattr(last_nft, 'token_id') and last_nft.token_id:
+                            token_id = str(last_nft.token_id).strip()
+                        
+                        # If token_id is empty, try to get from raw_metadata (Alchemy format: id.tokenId)
+                        if not token_id or token_id == '' or token_id == 'None':
+                            if hasattr(last_nft, 'raw_metadata') and last_nft.raw_metadata:
+                                raw_meta = last_nft.raw_metadata
+                                if isinstance(raw_meta, dict):
+                                    # Alchemy format: id: { tokenId: "123" }
+                                    id_obj = raw_meta.get('id', {})
+                                    if isinstance(id_obj, dict):
+                                        token_id = str(id_obj.get('tokenId', '')).strip()
+                                    if not token_id or token_id == '':
+                                        token_id = str(raw_meta.get('tokenId') or raw_meta.get('id') or raw_meta.get('token_id', '')).strip()
+                        
+                        if token_id and token_id != '' and token_id != 'None':
+                            logger.info(f"Got exactly {page_size} NFTs but no cursor/pageKey. Using last token ID ({token_id}) as startToken for next page...")
+                            current_cursor = token_id
+                            await asyncio.sleep(0.2)
+                            continue
+                        else:
+                            logger.warning(f"Got full page ({page_size} NFTs) but no cursor/pageKey and couldn't extract valid token_id. Continuing anyway...")
+                            if page_count < max_count_pages - 1:
+                                logger.info(f"Continuing to check next page (count so far: {total_counted:,})...")
+                                await asyncio.sleep(0.2)
+                                continue
+                            else:
+                                logger.warning(f"Reached max pages limit. Stopping count at {total_counted:,} NFTs.")
+                                break
+                    else:
+                        logger.warning(f"Got full page ({page_size} NFTs) but no NFTs in response. Stopping count.")
+                        break
+                elif nfts_in_page < page_size:
+                    # Got less than full page - we're done
+                    logger.info(f"Got partial page ({nfts_in_page} < {page_size}) - reached end of collection")
+                    break
+                else:
+                    # No cursor, no has_more, and we got less than full page - we're done
+                    logger.info(f"No cursor, no has_more, and got {nfts_in_page} NFTs - reached end of collection")
+                    break
+                
+                # Small delay to avoid rate limiting
+                await asyncio.sleep(0.1)
+            
+            if total_counted > 0:
+                old_total = collection_total
+                collection_total = total_counted
+                logger.info(f"✅ Counted {collection_total:,} NFTs by paginating through collection (was: {old_total if old_total else 'None'})")
+                
+                job.publish({
+                    "type": "status",
+                    "message": f"✅ Found {collection_total:,} NFTs in collection",
+                    "api_source": "Backend",
+                })
+            else:
+                logger.warning(f"⚠️ Counted 0 NFTs - collection may be empty or inaccessible")
+                if collection_total is None:
+                    logger.error(f"❌ CRITICAL: Could not determine collection total - counted 0 NFTs and no total from APIs")
+        except Exception as count_error:
+            logger.error(f"❌ ERROR during NFT counting: {count_error}", exc_info=True)
+            job.publish({
+                "type": "status",
+                "message": f"⚠️ Error counting NFTs: {str(count_error)}",
+                "api_source": "Backend",
+            })
+    
+    # Log final values before sending to UI
+    job.publish({
+        "type": "status",
+        "message": f"📋 Final Collection Info: name={collection_name or 'None'}, total={collection_total or 'None'}, contract={contract_address}, chain={chain.value}",
+        "api_source": "Backend",
+        "chain": chain.value,
+    })
+    
+    # Prepare response with all available collection info
+    collection_info_data = {
+        "type": "collection_info",
+        "contract_address": contract_address,
+        "chain": chain.value,
+        "collection_name": collection_name or contract_address,
+        "collection_total": collection_total,
+        "total_supply": collection_total,  # Also send as total_supply for compatibility
+    }
+    
+    if collection_total is None:
+        job.publish({
+            "type": "status",
+            "message": f"⚠️ WARNING: collection_total is None! This means we couldn't determine the collection size. It will be found during scraping.",
+            "api_source": "Backend",
+            "chain": chain.value,
+        })
+    else:
+        logger.info(f"✅ [scrape_collection] Sending collection_info with total: {collection_total:,}")
+    
+    # Add marketplace data if available
+    if collection_stats:
+        if collection_stats.floor_price is not None:
+            collection_info_data["floor_price"] = collection_stats.floor_price
+            collection_info_data["floor_price_currency"] = collection_stats.floor_price_currency
+        if collection_stats.total_volume is not None:
+            collection_info_data["total_volume"] = collection_stats.total_volume
+        if collection_stats.volume_24h is not None:
+            collection_info_data["volume_24h"] = collection_stats.volume_24h
+        if collection_stats.total_owners is not None:
+            collection_info_data["total_owners"] = collection_stats.total_owners
+        if collection_stats.market_cap is not None:
+            collection_info_data["market_cap"] = collection_stats.market_cap
+        # Add image URL if available
+        if hasattr(collection_stats, 'image_url') and collection_stats.image_url:
+            collection_info_data["image_url"] = str(collection_stats.image_url)
+        elif hasattr(collection_stats, 'logo') and collection_stats.logo:
+            collection_info_data["image_url"] = str(collection_stats.logo)
+        elif hasattr(collection_stats, 'banner_image') and collection_stats.banner_image:
+            collection_info_data["image_url"] = str(collection_stats.banner_image)
+        elif hasattr(collection_stats, 'collection_image') and collection_stats.collection_image:
+            collection_info_data["image_url"] = str(collection_stats.collection_image)
+    
+    # Send collection info to UI BEFORE starting to scrape
+    job.publish(collection_info_data)
+    
+    # A resume picks up from here, with the collection info it had
+    await job.checkpoint(
+        force=True,
+        contract_address=contract_address,
+        chain=chain.value,
+        collection_total=collection_total,
+        collection_info=collection_info_data,
+    )
+    await scrape_collection_pages(job, contract_address, chain, collection_total, full_resync=full_resync)
+
+
+async def resume_collection_scrape(job: ScrapeJob, checkpoint: dict):
+    """
+    Continue an interrupted scrape from its checkpoint
+    
+    The collection info lookup and the counting pass are skipped. NFTs the
+    job already got are replayed from the collection store (no provider
+    calls), which also rebuilds the dedup set and counters, and the page
+    walk goes on from the last committed cursor.
+    """
+    params = checkpoint["params"]
+    chain = Chain(params["chain"])
+    contract_address = params["contract_address"]
+    collection_total = params.get("collection_total")
+    job.publish({
+        "type": "clear",
+        "message": "Resuming scrape...",
+    })
+    job.publish({
+        "type": "status",
+        "message": f"♻️ Resuming scrape of {contract_address} on {chain.value} from its last checkpoint "
+                   f"({checkpoint['progress'].get('total_scraped', 0):,} NFTs scraped before the interruption)",
+        "chain": chain.value,
+    }, coalesce=False)
+    if params.get("collection_info"):
+        job.publish(params["collection_info"])
+    # A full resync that committed pages resumes its own walk; one that never got a page starts over
+    full_resync = bool(params.get("full_resync")) and not checkpoint["progress"].get("total_scraped")
+    await scrape_collection_pages(job, contract_address, chain, collection_total, full_resync=full_resync)
+
+
+async def scrape_collection_pages(
+    job: ScrapeJob,
+    contract_address: str,
+    chain: Chain,
+    collection_total: Optional[int],
+    full_resync: bool = False,
+):
+    """Walk a collection's pages and publish its NFTs to `job`"""
+    cursor = None
+    total_scraped = 0
+    seen_nfts = set()  # Track seen NFTs to prevent duplicates: (token_id, contract_address)
+    max_pages = 10000  # Very high limit to ensure full collection scraping (supports collections up to 10M NFTs)
+    
+    # STEP 2: Now start actual scraping
+    if collection_total:
+        job.publish({
+            "type": "status",
+            "message": f"Collection info loaded: {collection_total:,} NFTs. Starting scrape...",
+            "chain": chain.value,
+        })
+    else:
+        job.publish({
+            "type": "status",
+            "message": f"Starting scrape... (total size will be determined during scraping)",
+            "chain": chain.value,
+        })
+    
+    # Determine API source for logging
+    api_source = "Helius" if chain == Chain.SOLANA else ("Alchemy" if scout.alchemy else "Moralis")
+    
+    # For Alchemy/Moralis, use 100 per page (API limit)
+    # For Helius, use 1000 per page
+    page_size = 1000 if chain == Chain.SOLANA else 100
+    page_count = 0
+    
+    # NFTs stored by earlier scrapes come first; new pages are fetched ahead, so the next page is
+    # already in flight while this one is being sent to the browser
+    pages = scout.iter_collection_synced(
+        contract_address,
+        chain,
+        cursor=cursor,
+        page_size=page_size,
+        max_pages=max_pages,
+        full_resync=full_resync,
+    )
+    try:
+        while True:
+            switched_chain = False
+            async for response in pages:
+                if page_count == 0:
+                    job.publish({
+                        "type": "status",
+                        "message": f"🚀 Starting scrape from {api_source} API...",
+                        "api_source": api_source,
+                        "chain": chain.value,
+                    })
+                
+                # Detailed logging during scraping - show what we get from each page
+                job.publish({
+                    "type": "status",
+                    "message": f"📊 Page {page_count + 1} Response: total={response.total if hasattr(response, 'total') else 'None'}, total_count={response.total_count}, nfts={len(response.nfts)}, has_more={response.has_more}, cursor={'Yes' if response.cursor else 'None'}",
+                    "api_source": api_source,
+                    "chain": chain.value,
+                })
+                
+                # Track collection total size from first response if not already set
+                # (We already fetched it before scraping, but if we didn't, try to get it now)
+                if collection_total is None:
+                    # Try to get total from response if available (Helius sometimes returns this)
+                    if hasattr(response, 'total') and response.total:
+                        collection_total = response.total
+                        job.publish({
+                            "type": "status",
+                            "message": f"✅ Found total from response.total: {collection_total:,}",
+                            "api_source": api_source,
+                            "chain": chain.value,
+                        })
+                    elif hasattr(response, 'total_count') and response.total_count > len(response.nfts):
+                        collection_total = response.total_count
+                        job.publish({
+                            "type": "status",
+                            "message": f"✅ Found total from response.total_count: {collection_total:,}",
+                            "api_source": api_source,
+                            "chain": chain.value,
+                        })
+                    
+                    # If we got the total now, update the UI
+                    if collection_total:
+                        job.publish({
+                            "type": "collection_info",
+                            "collection_total": collection_total,
+                        })
+                
+                if not response.nfts:
+                    # No NFTs found, might be wrong chain or address
+                    if page_count == 0:
+                        error_msg = f"No NFTs found on {chain.value}."
+                        
+                        # For Solana with Magic Eden symbols, provide helpful error
+                        if chain == Chain.SOLANA and not contract_address.startswith("0x") and len(contract_address) < 32:
+                            error_msg = f"Magic Eden collection symbol '{contract_address}' cannot be used directly. "
+                            error_msg += "Please provide the Solana collection address. "
+                            error_msg += "You can find it on Magic Eden by viewing the collection details."
+                            job.publish({
+                                "type": "error",
+                                "message": error_msg,
+                            })
+                            # Fails the job (and its checkpoint) with this message instead of completing it empty
+                            raise JobError(error_msg)
+                        
+                        if chain == Chain.SOLANA:
+                            # For Solana, can't try other chains
+                            error_msg = "❌ No NFTs found. Please verify the collection address is correct."
+                            job.publish({
+                                "type": "error",
+                                "message": error_msg,
+                                "api_source": api_source,
+                                "chain": chain.value,
+                            })
+                            raise JobError(error_msg)
+                        
+                        # Try other chains if first attempt fails
+                        job.publish({
+                            "type": "warning",
+                            "message": f"{error_msg} Trying other chains...",
+                            "api_source": api_source,
+                            "chain": chain.value,
+                        })
+                        
+                        # Try all EVM chains if it's an Ethereum address
+                        if chain == Chain.ETHEREUM and contract_address.startswith("0x"):
+                            chains_to_try = [Chain.POLYGON, Chain.ARBITRUM, Chain.OPTIMISM, Chain.BASE]
+                            for alt_chain in chains_to_try:
+                                try:
+                                    alt_response = await scout.get_collection_nfts(
+                                        contract_address,
+                                        alt_chain,
+                                        cursor=None,
+                                        page_size=10,
+                                    )
+                                    if alt_response.nfts:
+                                        chain = alt_chain
+                                        api_source = "Alchemy" if scout.alchemy else "Moralis"
+                                        job.publish({
+                                            "type": "status",
+                                            "message": f"✅ Found collection on {alt_chain.value} via {api_source} API!",
+                                            "api_source": api_source,
+                                            "chain": alt_chain.value,
+                                        }, coalesce=False)
+                                        switched_chain = True
+                                        break
+                                except Exception:
+                                    # Error trying alternative chain, continue to next
+                                    continue
+                        if not switched_chain:
+                            error_msg = f"❌ {error_msg} Please verify the collection address and chain."
+                            if chain == Chain.ETHEREUM and contract_address.startswith("0x"):
+                                error_msg = f"❌ No NFTs found on {chain.value} or on Polygon, Arbitrum, Optimism and Base. Please verify the collection address."
+                            job.publish({
+                                "type": "error",
+                                "message": error_msg,
+                                "api_source": api_source,
+                                "chain": chain.value,
+                            })
+                            raise JobError(error_msg)
+                    break
+                
+                # NFTs go out in batches (WS_BATCH_SIZE items or WS_BATCH_INTERVAL seconds), so the upstream pages,
+                # not per-NFT sleeps or frame overhead, set the pace
+                job.publish({
+                    "type": "status",
+                    "message": f"📦 Processing {len(response.nfts)} NFTs from page {page_count + 1}...",
+                    "api_source": api_source,
+                    "chain": chain.value,
+                })
+                
+                for i, nft in enumerate(response.nfts):
+                    # Create unique identifier for duplicate checking
+                    nft_id = (str(nft.token_id), str(nft.contract_address))
+                    
+                    # Skip if we've already seen this NFT
+                    if nft_id in seen_nfts:
+                        logger.debug(f"⏭️ Skipping duplicate NFT: token_id={nft.token_id}, contract={nft.contract_address}")
+                        continue
+                    
+                    # Mark as seen
+                    seen_nfts.add(nft_id)
+                    total_scraped += 1
+                    
+                    # JSON mode turns HttpUrl and datetime fields into strings. Events are buffered for the
+                    # whole job retention, so raw_metadata stays out (GET /api/nfts/... has it)
+                    try:
+                        nft_dict = nft_event(nft)
+                    except Exception as e:
+                        logger.warning(f"Error converting NFT to dict: {e}")
+                        nft_dict = {"token_id": str(nft.token_id), "contract_address": str(nft.contract_address)}
+                    
+                    if i % 50 == 0 or i == len(response.nfts) - 1:  # Log every 50th NFT or last one
+                        nft_name = nft_dict.get("name") or nft_dict.get("token_id") or f"#{i+1}"
+                        image_url = nft_dict.get("image_url") or "None"
+                        job.publish({
+                            "type": "status",
+                            "message": f"✅ Scraping NFT {total_scraped}: {nft_name} (image: {str(image_url)[:50]}...)",
+                            "api_source": api_source,
+                            "chain": chain.value,
+                        })
+                    
+                    # Stored (by iter_collection_synced) under this chain and contract, where late joiners read it back
+                    job.add_nft(
+                        nft_dict,
+                        stored_as=(chain.value, contract_address),
+                        total_scraped=total_scraped,
+                        api_source=api_source,
+                    )
+                    
+                    # Update collection name from first NFT if not set
+                    if total_scraped == 1:
+                        job.publish({
+                            "type": "collection_info",
+                            "collection_name": nft.collection_name or contract_address,
+                            "chain": chain.value,
+                        })
+                
+                job.publish({
+                    "type": "status",
+                    "message": f"✅ Completed page {page_count + 1}: {len(response.nfts)} NFTs scraped (total: {total_scraped})",
+                    "api_source": api_source,
+                    "chain": chain.value,
+                })
+                
+                # Calculate remaining and progress
+                remaining = None
+                progress_pct = 0
+                if collection_total and collection_total > 0:
+                    remaining = max(0, collection_total - total_scraped)
+                    progress_pct = min(100, round((total_scraped / collection_total) * 100, 1))
+                
+                # Update progress
+                job.publish({
+                    "type": "progress",
+                    "total_scraped": total_scraped,
+                    "collection_total": collection_total,
+                    "remaining": remaining,
+                    "progress_pct": progress_pct,
+                    "has_more": response.has_more,
+                    "message": f"Scraped {total_scraped} NFTs so far...",
+                })
+                
+                page_count += 1
+                logger.info(f"🔄 Page {page_count} done (scraped: {total_scraped}/{collection_total or '?'}), next page already prefetching")
+                # The page itself is already committed to the collection store; this keeps the job's counters
+                await job.checkpoint(chain=chain.value, collection_total=collection_total)
+            
+            await pages.aclose()
+            if not switched_chain:
+                break
+            # Viewers asking for the collection on its real chain join this job, and a resume walks that chain
+            switched_params = {"chain": chain.value}
+            if job.params.get("collection_info"):
+                switched_params["collection_info"] = {**job.params["collection_info"], "chain": chain.value}
+            await jobs.rekey(job, collection_job_key(chain, contract_address), **switched_params)
+            # Restart the page walk on the chain the collection was found on
+            pages = scout.iter_collection_synced(
+                contract_address,
+                chain,
+                page_size=page_size,
+                max_pages=max_pages,
+                full_resync=full_resync,
+            )
+        
+        if collection_total and total_scraped < collection_total:
+            job.publish({
+                "type": "warning",
+                "message": f"⚠️ {api_source} API: Scraped {total_scraped}/{collection_total} NFTs. Pagination may have been limited.",
+                "api_source": api_source,
+                "chain": chain.value,
+            })
+        else:
+            logger.info(f"✅ Completed scraping. Total: {total_scraped} NFTs")
+    except JobError:
+        # Already published
+        raise
+    except Exception as e:
+        logger.error(f"Error scraping page: {e}")
+        # If it's a chain-specific error, try other chains
+        if "No client available" in str(e) or "not available" in str(e).lower():
+            message = f"❌ Chain {chain.value} not available. Please ensure API keys are configured."
+        else:
+            message = f"❌ Error: {str(e)}"
+        job.publish({
+            "type": "error",
+            "message": message,
+            "api_source": api_source,
+            "chain": chain.value,
+        })
+        # The job (and its checkpoint) ends up failed, so it can be resumed
+        raise JobError(message) from e
+    finally:
+        await pages.aclose()
+    
+    
+    # Final progress update
+    remaining = None
+    progress_pct = 0
+    if collection_total and collection_total > 0:
+        remaining = max(0, collection_total - total_scraped)
+        progress_pct = min(100, round((total_scraped / collection_total) * 100, 1))
+    
+    job.publish({
+        "type": "complete",
+        "total_scraped": total_scraped,
+        "collection_total": collection_total,
+        "remaining": remaining,
+        "progress_pct": progress_pct,
+        "message": f"✅ Completed scraping {total_scraped} NFTs from {api_source} API",
+        "api_source": api_source,
+        "chain": chain.value,
+    })
+
+
+
+async def close_subscriptions(subscriptions: dict):
+    """Detach a connection from the jobs it follows (the jobs keep running)"""
+    for subscription in subscriptions.values():
+        await subscription.close()
+    subscriptions.clear()
+
+
+def checkpoint_summary(checkpoint: dict) -> dict:
+    """Job summary built from a saved checkpoint"""
+    return {
+        "job_id": checkpoint["job_id"],
+        "state": checkpoint["state"],
+        "error": checkpoint["error"],
+        "params": checkpoint["params"],
+        "progress": checkpoint["progress"],
+        "created_at": checkpoint["created_at"],
+        "updated_at": checkpoint["updated_at"],
+        "resumable": True,
+    }
+
+
+def checkpoint_owned_by(checkpoint: dict, token: Optional[str]) -> bool:
+    """Whether `token` is the owner token saved with a job checkpoint"""
+    return bool(token and checkpoint.get("token")) and secrets.compare_digest(str(token), checkpoint["token"])
+
+
+def collection_job_key(chain: Chain, contract_address: str) -> str:
+    """Scrape jobs with the same key share one upstream walk (and one collection store row)"""
+    return f"{chain.value}:{normalize_contract_address(contract_address, chain.value)}"
+
+
+def resume_scrape_job(checkpoint: dict) -> ScrapeJob:
+    """
+    Start a job that continues a checkpointed scrape, under the same job id
+    
+    If the collection is being scraped already, that job is returned instead.
+    """
+    params = dict(checkpoint["params"])
+    key = collection_job_key(Chain(params["chain"]), params["contract_address"])
+    job = jobs.active_job(key)
+    if job:
+        logger.info(f"Scrape job {checkpoint['job_id']} not resumed, {key} is being scraped by job {job.id}")
+        return job
+    logger.info(f"Resuming scrape job {checkpoint['job_id']} from its checkpoint")
+    params["resumed_from"] = checkpoint["progress"].get("total_scraped", 0)
+    return jobs.submit(
+        partial(resume_collection_scrape, checkpoint=checkpoint),
+        job_id=checkpoint["job_id"],
+        key=key,
+        token=checkpoint.get("token"),
+        **params,
+    )
+
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for live updates"""
     await manager.connect(websocket)
+    subscriptions = {}  # job_id -> JobSubscription of this connection
     
     try:
         while True:
             data = await websocket.receive_json()
             action = data.get("action")
             
-            if action == "scrape_collection":
+            if action == "subscribe_job":
+                # Reattach to a running (or recently finished) scrape, e.g. after a reconnect.
+                # Needs the job's owner or read token; anyone else is told the job is missing
+                job = jobs.get(data.get("job_id"))
+                if not job or not job.readable_by(data.get("token")):
+                    # Not running in this process; a checkpoint means its owner can resume it
+                    checkpoint = None if job else await jobs.get_checkpoint(data.get("job_id"))
+                    if checkpoint and not checkpoint_owned_by(checkpoint, data.get("token")):
+                        checkpoint = None
+                    await manager.send_personal_message(
+                        {"type": "job", **checkpoint_summary(checkpoint)} if checkpoint else {
+                            "type": "job",
+                            "job_id": data.get("job_id"),
+                            "state": "missing",
+                        },
+                        websocket,
+                    )
+                    continue
+                await close_subscriptions(subscriptions)
+                after = data.get("after")
+                subscriptions[job.id] = jobs.subscribe(job, websocket.send_text, after=after if isinstance(after, int) else -1)
+            
+            elif action == "resume_scrape":
+                # Continue an interrupted scrape from its last committed page
+                job = jobs.get(data.get("job_id"))
+                if job and not job.done and not job.readable_by(data.get("token")):
+                    # Still running, but not for this connection to follow
+                    await manager.send_personal_message({
+                        "type": "job",
+                        "job_id": data.get("job_id"),
+                        "state": "missing",
+                    }, websocket)
+                    continue
+                if not job or job.done:
+                    checkpoint = await jobs.get_checkpoint(data.get("job_id"))
+                    if not checkpoint:
+                        await manager.send_personal_message({
+                            "type": "job",
+                            "job_id": data.get("job_id"),
+                            "state": "missing",
+                        }, websocket)
+                        continue
+                    if not checkpoint_owned_by(checkpoint, data.get("token")):
+                        await manager.send_personal_message({
+                            "type": "error",
+                            "message": "Only the browser that started this scrape can resume it",
+                            "job_id": checkpoint["job_id"],
+                        }, websocket)
+                        continue
+                    job = resume_scrape_job(checkpoint)
+                await close_subscriptions(subscriptions)
+                subscriptions[job.id] = jobs.subscribe(job, websocket.send_text)
+            
+            elif action == "cancel_scrape":
+                # Stop button. The owner (token) stops the job for everyone; a viewer only detaches,
+                # and the job stops when the last viewer leaves this way
+                job_id = data.get("job_id") or next(iter(subscriptions), None)
+                subscription = subscriptions.pop(job_id, None)
+                job = jobs.get(job_id)
+                if job and not job.done and job.owned_by(data.get("token")):
+                    if subscription:
+                        await subscription.close()
+                    await jobs.cancel(job.id)
+                elif job and not job.done and subscription:
+                    if not await jobs.leave(subscription):
+                        await manager.send_personal_message({
+                            "type": "job",
+                            **job.summary(),
+                            "detached": True,
+                            "message": f"⏹️ Stopped following the scrape, {len(job.subscribers)} other viewer(s) still on it",
+                        }, websocket)
+                        continue
+                elif job and not job.done:
+                    await manager.send_personal_message({
+                        "type": "error",
+                        "message": "Only viewers of a scrape can stop it",
+                        "job_id": job.id,
+                    }, websocket)
+                    continue
+                elif subscription:
+                    await subscription.close()
+                await manager.send_personal_message(
+                    {"type": "job", **job.summary()} if job else {
+                        "type": "job",
+                        "job_id": job_id,
+                        "state": "missing",
+                    },
+                    websocket,
+                )
+            
+            elif action == "unsubscribe_job":
+                subscription = subscriptions.pop(data.get("job_id"), None)
+                if subscription:
+                    await subscription.close()
+            
+            elif action == "list_jobs":
+                # Only the jobs this connection follows or owns
+                await manager.send_personal_message({
+                    "type": "jobs",
+                    "jobs": jobs.list_jobs(job_ids=subscriptions, tokens=[data.get("token")]),
+                }, websocket)
+            
+            elif action == "scrape_collection":
                 collection_url = data.get("collection_url")
                 
                 # Validate and sanitize collection URL
@@ -674,943 +1747,58 @@ async def websocket_endpoint(websocket: WebSocket):
                     "api_source": "Detection",
                 }, websocket)
                 
-                # Start scraping
-                try:
-                    cursor = None
-                    total_scraped = 0
-                    seen_nfts = set()  # Track seen NFTs to prevent duplicates: (token_id, contract_address)
-                    collection_total = None  # Will be fetched BEFORE scraping starts
-                    collection_name = None
-                    max_pages = 10000  # Very high limit to ensure full collection scraping (supports collections up to 10M NFTs)
-                    page_count = 0
-                    
-                    # CRITICAL: Clear cache before scraping to ensure fresh data and proper pagination
-                    cache_key = f"collection:{contract_address}:{chain.value}"
-                    await scout.storage.delete_cache(cache_key)
-                    logger.info(f"Cleared cache for {cache_key} before scraping")
-                    
-                    # For Solana, ensure we're using the resolved address
-                    if chain == Chain.SOLANA and scout.helius:
-                        if hasattr(scout.helius, '_current_collection') and scout.helius._current_collection:
-                            resolved_address = scout.helius._current_collection
-                            logger.info(f"Using resolved collection address for scraping: {resolved_address}")
-                            contract_address = resolved_address
-                    
-                    # Clear previous results and cache for fresh scrape
-                    await manager.send_personal_message({
-                        "type": "clear",
-                        "message": "Starting new scrape...",
-                    }, websocket)
-                    
-                    # Clear cache for this collection to ensure fresh data
-                    cache_key = f"collection:{contract_address}:{chain.value}"
-                    await scout.storage.delete_cache(cache_key)
+                # The scrape runs as a background job; this connection follows it and can detach/reattach.
+                # If the collection is already being scraped, share that upstream walk instead of starting another
+                await close_subscriptions(subscriptions)
+                # Canonical form, so the job, its checkpoint and the stored collection all use the same address
+                contract_address = normalize_contract_address(contract_address, chain.value)
+                key = collection_job_key(chain, contract_address)
+                job = jobs.active_job(key)
+                if job:
+                    logger.info(f"Joining scrape job {job.id} for {key} ({len(job.subscribers)} other viewer(s))")
                     await manager.send_personal_message({
                         "type": "status",
-                        "message": f"🗑️ Cleared cache for fresh scrape of {contract_address}",
-                        "api_source": "Backend",
+                        "message": f"👥 This collection is already being scraped - joining it "
+                                   f"({job.progress['total_scraped']:,} NFTs so far are replayed first)",
                         "chain": chain.value,
                     }, websocket)
-                    
-                    # STEP 1: Fetch collection info FIRST before scraping
+                    # A viewer gets the read token only, to reattach after a reconnect
+                    await manager.send_personal_message({"type": "job", **job.summary(), "view_token": job.view_token}, websocket)
+                else:
+                    # full_resync: walk the whole collection again rather than serving the stored copy
+                    full_resync = data.get("full_resync") is True
+                    job = jobs.submit(
+                        partial(
+                            run_collection_scrape,
+                            collection_url=collection_url,
+                            contract_address=contract_address,
+                            chain=chain,
+                            full_resync=full_resync,
+                        ),
+                        key=key,
+                        collection_url=collection_url,
+                        contract_address=contract_address,
+                        chain=chain.value,
+                        full_resync=full_resync,
+                    )
+                    # The owner token goes to this connection only; it can stop or resume the job
+                    await manager.send_personal_message(
+                        {"type": "job", **job.summary(), "token": job.token, "view_token": job.view_token},
+                        websocket,
+                    )
+                subscriptions[job.id] = jobs.subscribe(job, websocket.send_text)
+            
+            elif action == "get_collection_info":
+                collection_url = data.get("collection_url")
+                if not collection_url:
                     await manager.send_personal_message({
-                        "type": "status",
-                        "message": f"Fetching collection information...",
-                        "chain": chain.value,
+                        "type": "error",
+                        "message": "No collection URL provided",
                     }, websocket)
-                    
-                    # Extract Magic Eden symbol if it's a Magic Eden URL
-                    magic_eden_symbol = None
-                    if chain == Chain.SOLANA and "magiceden" in collection_url.lower():
-                        # If contract_address looks like a symbol (not a Solana address)
-                        if len(contract_address) < 32:
-                            magic_eden_symbol = contract_address
-                    
-                    collection_stats = None
-                    
-                    # For Solana/Helius, get total from a small query first
-                    if chain == Chain.SOLANA and scout.helius:
-                        try:
-                            # Reset helius client state for new collection
-                            scout.helius._current_collection = None
-                            scout.helius._collection_total = None
-                            scout.helius._last_total = None
-                            
-                            # Clear cache to ensure fresh data
-                            cache_key = f"collection:{contract_address}:{chain.value}"
-                            await scout.storage.delete_cache(cache_key)
-                            logger.info(f"Cleared cache for {cache_key} before fetching collection info")
-                            
-                            # Use large page_size to get accurate total (Helius returns total based on items in response)
-                            # With page_size=1000, if collection < 1000, we get exact total
-                            logger.info(f"Fetching collection total for {contract_address} on {chain.value}...")
-                            await manager.send_personal_message({
-                                "type": "status",
-                                "message": f"🔍 Querying Helius API for collection total...",
-                                "api_source": "Helius",
-                                "chain": chain.value,
-                            }, websocket)
-                            response = await scout.get_collection_nfts(
-                                contract_address,
-                                chain,
-                                cursor=None,
-                                page_size=1000,  # Use large page size to get accurate total
-                            )
-                            
-                            # After first query, get the resolved address if available
-                            if hasattr(scout.helius, '_current_collection') and scout.helius._current_collection:
-                                resolved_address = scout.helius._current_collection
-                                logger.info(f"Resolved collection address: {resolved_address}")
-                                # Update contract_address to use resolved address for scraping
-                                contract_address = resolved_address
-                            
-                            # Detailed logging - show what we got from Helius
-                            await manager.send_personal_message({
-                                "type": "status",
-                                "message": f"📊 Helius Response: total={response.total if hasattr(response, 'total') else 'None'}, total_count={response.total_count}, nfts={len(response.nfts)}, has_more={response.has_more}, cursor={'Yes' if response.cursor else 'None'}",
-                                "api_source": "Helius",
-                                "chain": chain.value,
-                            }, websocket)
-                            
-                            # Check multiple sources for total
-                            helius_last_total = getattr(scout.helius, '_last_total', None)
-                            helius_collection_total = getattr(scout.helius, '_collection_total', None)
-                            
-                            await manager.send_personal_message({
-                                "type": "status",
-                                "message": f"🔍 Checking Helius totals: response.total={response.total if hasattr(response, 'total') else 'None'}, _last_total={helius_last_total}, _collection_total={helius_collection_total}",
-                                "api_source": "Helius",
-                                "chain": chain.value,
-                            }, websocket)
-                            
-                            # The total should be set in helius client after first call
-                            if hasattr(response, 'total') and response.total:
-                                collection_total = response.total
-                                await manager.send_personal_message({
-                                    "type": "status",
-                                    "message": f"✅ Using response.total: {collection_total:,} NFTs",
-                                    "api_source": "Helius",
-                                    "chain": chain.value,
-                                }, websocket)
-                            elif hasattr(scout.helius, '_last_total') and scout.helius._last_total and scout.helius._last_total > 0:
-                                collection_total = scout.helius._last_total
-                                logger.info(f"Collection total fetched: {collection_total}")
-                                await manager.send_personal_message({
-                                    "type": "status",
-                                    "message": f"✅ Using Helius _last_total: {collection_total:,} NFTs",
-                                    "api_source": "Helius",
-                                    "chain": chain.value,
-                                }, websocket)
-                            else:
-                                await manager.send_personal_message({
-                                    "type": "status",
-                                    "message": f"⚠️ Helius total is None - response.total={response.total if hasattr(response, 'total') else 'None'}, _last_total={helius_last_total}",
-                                    "api_source": "Helius",
-                                    "chain": chain.value,
-                                }, websocket)
-                            
-                            # Get full collection stats with marketplace data (Magic Eden)
-                            try:
-                                await manager.send_personal_message({
-                                    "type": "status",
-                                    "message": f"🔍 Fetching collection stats from multiple APIs (Helius, Magic Eden, Moralis)...",
-                                    "api_source": "Multi-API",
-                                    "chain": chain.value,
-                                }, websocket)
-                                collection_stats = await scout.get_collection_stats(
-                                    contract_address,
-                                    chain,
-                                    magic_eden_symbol=magic_eden_symbol,
-                                    collection_url=collection_url
-                                )
-                                
-                                # Detailed logging - show what we got from stats
-                                await manager.send_personal_message({
-                                    "type": "status",
-                                    "message": f"📊 CollectionStats: name={collection_stats.name}, total_supply={collection_stats.total_supply}, floor_price={collection_stats.floor_price}, volume_24h={collection_stats.volume_24h}, owners={collection_stats.total_owners}",
-                                    "api_source": "Multi-API",
-                                    "chain": chain.value,
-                                }, websocket)
-                                
-                                collection_name = collection_stats.name
-                                # Use stats total_supply if available (more accurate)
-                                if collection_stats.total_supply:
-                                    old_total = collection_total
-                                    collection_total = collection_stats.total_supply
-                                    await manager.send_personal_message({
-                                        "type": "status",
-                                        "message": f"✅ Magic Eden: Using total_supply={collection_total:,} (was {old_total if old_total else 'None'})",
-                                        "api_source": "Magic Eden",
-                                        "chain": chain.value,
-                                    }, websocket)
-                                else:
-                                    await manager.send_personal_message({
-                                        "type": "status",
-                                        "message": f"⚠️ Magic Eden: total_supply is None. Checking other fields...",
-                                        "api_source": "Magic Eden",
-                                        "chain": chain.value,
-                                    }, websocket)
-                            except Exception as e:
-                                logger.debug(f"Error getting collection stats: {e}")
-                        except Exception as e:
-                            logger.warning(f"Error fetching collection info: {e}")
-                            # Continue anyway - we'll try to get total during scraping
-                    
-                    # For EVM chains, try to get stats which may include supply and marketplace data
-                    else:
-                        try:
-                            await manager.send_personal_message({
-                                "type": "status",
-                                "message": f"🔍 Fetching collection stats from multiple APIs (Alchemy, Reservoir, Moralis)...",
-                                "api_source": "Multi-API",
-                                "chain": chain.value,
-                            }, websocket)
-                            collection_stats = await scout.get_collection_stats(
-                                contract_address, 
-                                chain,
-                                collection_url=collection_url
-                            )
-                            
-                            # Extract collection name - prioritize Reservoir data
-                            collection_name = collection_stats.name
-                            logger.info(f"📊 CollectionStats received: name='{collection_name}', total_supply={collection_stats.total_supply}, contract={contract_address}")
-                            
-                            # Detailed logging - show what we got
-                            await manager.send_personal_message({
-                                "type": "status",
-                                "message": f"📊 CollectionStats: name={collection_name or 'None'}, total_supply={collection_stats.total_supply or 'None'}, floor_price={collection_stats.floor_price}, owners={collection_stats.total_owners}, volume_24h={collection_stats.volume_24h}",
-                                "api_source": "Multi-API",
-                                "chain": chain.value,
-                            }, websocket)
-                            
-                            # Check if stats has total_supply
-                            if collection_stats.total_supply:
-                                collection_total = collection_stats.total_supply
-                                logger.info(f"✅ Collection total from stats.total_supply: {collection_total:,}")
-                                await manager.send_personal_message({
-                                    "type": "status",
-                                    "message": f"✅ Reservoir/Alchemy: Using total_supply={collection_total:,} NFTs",
-                                    "api_source": "Reservoir/Alchemy",
-                                    "chain": chain.value,
-                                }, websocket)
-                            else:
-                                logger.warning(f"⚠️ collection_stats.total_supply is None for {contract_address}")
-                                await manager.send_personal_message({
-                                    "type": "status",
-                                    "message": f"⚠️ Reservoir/Alchemy: total_supply is None. Will determine during scraping.",
-                                    "api_source": "Reservoir/Alchemy",
-                                    "chain": chain.value,
-                                }, websocket)
-                            
-                            # Log final collection name
-                            if collection_name and collection_name != contract_address:
-                                logger.info(f"✅ Collection name extracted: '{collection_name}'")
-                            else:
-                                logger.warning(f"⚠️ Collection name is missing or same as contract address: '{collection_name}'")
-                        except Exception as e:
-                            logger.debug(f"Error getting collection stats: {e}")
-                            # Continue anyway - we'll try to get total during scraping
-                    
-                    # CRITICAL: If collection_total is still None, COUNT BY PAGINATING
-                    # This is essential for Ethereum collections where APIs don't provide total
-                    # BUT: Skip counting if we already have a valid total from get_collection_info
-                    logger.info(f"🔍 [scrape_collection] After collection_stats: collection_total={collection_total}, chain={chain.value}, is_solana={chain == Chain.SOLANA}")
-                    
-                    should_count = False
-                    
-                    # Skip counting if we already have a valid total (likely from get_collection_info)
-                    # Only count if total is None, suspiciously low, or equals page size
-                    if collection_total and collection_total > 100 and collection_total != 100:
-                        logger.info(f"✅ [scrape_collection] Skipping count - already have valid total: {collection_total:,} (likely from get_collection_info)")
-                        should_count = False
-                    # Always count for Ethereum if total is None (Alchemy doesn't provide it)
-                    elif chain != Chain.SOLANA and not collection_total:
-                        should_count = True
-                        logger.info(f"🔍 [Ethereum] Collection total is None. Will count NFTs by paginating through all pages...")
-                        logger.warning(f"⚠️ [Ethereum] APIs did not provide total_supply. Counting NFTs by paginating...")
-                    elif not collection_total:
-                        # For other chains too
-                        should_count = True
-                        logger.info(f"🔍 Collection total is None. Will count NFTs by paginating through all pages...")
-                        logger.warning(f"⚠️ APIs did not provide total_supply. Counting NFTs by paginating...")
-                    elif (chain != Chain.SOLANA and collection_total == 100) or (chain == Chain.SOLANA and collection_total == 1000):
-                        # For Ethereum, 100 is page size; for Solana, 1000 is page size
-                        should_count = True
-                        logger.info(f"🔍 Collection total ({collection_total}) equals page size limit. Counting NFTs by paginating...")
-                    elif chain != Chain.SOLANA and collection_total and collection_total <= 100:
-                        # For Ethereum, any total <= 100 is suspicious (could be page size)
-                        should_count = True
-                        logger.info(f"🔍 [Ethereum] Collection total ({collection_total}) seems suspiciously low. Counting NFTs by paginating...")
-                    
-                    logger.info(f"🔍 [scrape_collection] should_count={should_count}, collection_total={collection_total}")
-                    
-                    if should_count:
-                        logger.info(f"🚀 [scrape_collection] Starting NFT counting process for {contract_address} on {chain.value}...")
-                        try:
-                            await manager.send_personal_message({
-                                "type": "status",
-                                "message": f"🔢 Counting total NFTs in collection (this may take a moment)...",
-                                "api_source": "Backend",
-                            }, websocket)
-                            
-                            # Clear cache before counting
-                            cache_key = f"collection:{contract_address}:{chain.value}"
-                            await scout.storage.delete_cache(cache_key)
-                            logger.info(f"Cleared cache for {cache_key} before counting")
-                            
-                            # Paginate through collection to count all NFTs
-                            total_counted = 0
-                            current_cursor = None
-                            page_count = 0
-                            max_count_pages = 200 if chain != Chain.SOLANA else 100  # Safety limit
-                            consecutive_empty_pages = 0
-                            page_size = 100 if chain != Chain.SOLANA else 1000  # Alchemy max is 100, Helius is 1000
-                            
-                            while page_count < max_count_pages:
-                                try:
-                                    count_response = await scout.get_collection_nfts(
-                                        contract_address,
-                                        chain,
-                                        cursor=current_cursor,
-                                        page_size=page_size,
-                                    )
-                                except Exception as count_err:
-                                    logger.error(f"Error counting NFTs on page {page_count + 1}: {count_err}")
-                                    break
-                                
-                                nfts_in_page = len(count_response.nfts)
-                                total_counted += nfts_in_page
-                                page_count += 1
-                                
-                                # Update progress every 5 pages for Ethereum
-                                update_interval = 5 if chain != Chain.SOLANA else 10
-                                if page_count % update_interval == 0 or nfts_in_page == 0:
-                                    await manager.send_personal_message({
-                                        "type": "status",
-                                        "message": f"🔢 Counting... Found {total_counted:,} NFTs so far (page {page_count})...",
-                                        "api_source": "Backend",
-                                    }, websocket)
-                                
-                                logger.info(f"Count page {page_count}: got {nfts_in_page} NFTs, total so far: {total_counted:,}, has_more={count_response.has_more}, cursor={'Yes' if count_response.cursor else 'No'}")
-                                
-                                # If we got 0 NFTs, check if we should continue
-                                if nfts_in_page == 0:
-                                    consecutive_empty_pages += 1
-                                    if consecutive_empty_pages >= 2:
-                                        logger.warning(f"Got {consecutive_empty_pages} consecutive empty pages, stopping count")
-                                        break
-                                else:
-                                    consecutive_empty_pages = 0
-                                
-                                # CRITICAL: For Ethereum/Alchemy, if we got exactly page_size NFTs, there's almost certainly more
-                                # Continue paginating until we get less than a full page OR no cursor
-                                # This matches Solana's behavior - keep going until we actually run out
-                                
-                                # Get cursor for next page - check both cursor and pageKey (Alchemy uses pageKey)
-                                next_cursor = count_response.cursor or getattr(count_response, 'pageKey', None)
-                                
-                                if next_cursor:
-                                    # We have a cursor/pageKey - definitely more pages
-                                    current_cursor = next_cursor
-                                    logger.debug(f"Got cursor/pageKey for next page: {str(current_cursor)[:50]}...")
-                                elif nfts_in_page == page_size:
-                                    # Got full page but no cursor - for Alchemy, try using last token ID as cursor
-                                    # Alchemy accepts startToken which can be any token ID from the collection
-                                    if count_response.nfts and len(count_response.nfts) > 0:
-                                        last_nft = count_response.nfts[-1]
-                                        token_id = None
-                                        if hasattr(last_nft, 'token_id') and last_nft.token_id:
-                                            token_id = str(last_nft.token_id).strip()
-                                        
-                                        # If token_id is empty, try to get from raw_metadata (Alchemy format: id.tokenId)
-                                        if not token_id or token_id == '' or token_id == 'None':
-                                            if hasattr(last_nft, 'raw_metadata') and last_nft.raw_metadata:
-                                                raw_meta = last_nft.raw_metadata
-                                                if isinstance(raw_meta, dict):
-                                                    # Alchemy format: id: { tokenId: "123" }
-                                                    id_obj = raw_meta.get('id', {})
-                                                    if isinstance(id_obj, dict):
-                                                        token_id = str(id_obj.get('tokenId', '')).strip()
-                                                    if not token_id or token_id == '':
-                                                        token_id = str(raw_meta.get('tokenId') or raw_meta.get('id') or raw_meta.get('token_id', '')).strip()
-                                        
-                                        if token_id and token_id != '' and token_id != 'None':
-                                            logger.info(f"Got exactly {page_size} NFTs but no cursor/pageKey. Using last token ID ({token_id}) as startToken for next page...")
-                                            current_cursor = token_id
-                                            await asyncio.sleep(0.2)
-                                            continue
-                                        else:
-                                            logger.warning(f"Got full page ({page_size} NFTs) but no cursor/pageKey and couldn't extract valid token_id. Continuing anyway...")
-                                            if page_count < max_count_pages - 1:
-                                                logger.info(f"Continuing to check next page (count so far: {total_counted:,})...")
-                                                await asyncio.sleep(0.2)
-                                                continue
-                                            else:
-                                                logger.warning(f"Reached max pages limit. Stopping count at {total_counted:,} NFTs.")
-                                                break
-                                    else:
-                                        logger.warning(f"Got full page ({page_size} NFTs) but no NFTs in response. Stopping count.")
-                                        break
-                                elif nfts_in_page < page_size:
-                                    # Got less than full page - we're done
-                                    logger.info(f"Got partial page ({nfts_in_page} < {page_size}) - reached end of collection")
-                                    break
-                                else:
-                                    # No cursor, no has_more, and we got less than full page - we're done
-                                    logger.info(f"No cursor, no has_more, and got {nfts_in_page} NFTs - reached end of collection")
-                                    break
-                                
-                                # Small delay to avoid rate limiting
-                                await asyncio.sleep(0.1)
-                            
-                            if total_counted > 0:
-                                old_total = collection_total
-                                collection_total = total_counted
-                                logger.info(f"✅ Counted {collection_total:,} NFTs by paginating through collection (was: {old_total if old_total else 'None'})")
-                                
-                                await manager.send_personal_message({
-                                    "type": "status",
-                                    "message": f"✅ Found {collection_total:,} NFTs in collection",
-                                    "api_source": "Backend",
-                                }, websocket)
-                            else:
-                                logger.warning(f"⚠️ Counted 0 NFTs - collection may be empty or inaccessible")
-                                if collection_total is None:
-                                    logger.error(f"❌ CRITICAL: Could not determine collection total - counted 0 NFTs and no total from APIs")
-                        except Exception as count_error:
-                            logger.error(f"❌ ERROR during NFT counting: {count_error}", exc_info=True)
-                            await manager.send_personal_message({
-                                "type": "status",
-                                "message": f"⚠️ Error counting NFTs: {str(count_error)}",
-                                "api_source": "Backend",
-                            }, websocket)
-                    
-                    # Log final values before sending to UI
-                    await manager.send_personal_message({
-                        "type": "status",
-                        "message": f"📋 Final Collection Info: name={collection_name or 'None'}, total={collection_total or 'None'}, contract={contract_address}, chain={chain.value}",
-                        "api_source": "Backend",
-                        "chain": chain.value,
-                    }, websocket)
-                    
-                    # Prepare response with all available collection info
-                    collection_info_data = {
-                        "type": "collection_info",
-                        "contract_address": contract_address,
-                        "chain": chain.value,
-                        "collection_name": collection_name or contract_address,
-                        "collection_total": collection_total,
-                        "total_supply": collection_total,  # Also send as total_supply for compatibility
-                    }
-                    
-                    if collection_total is None:
-                        await manager.send_personal_message({
-                            "type": "status",
-                            "message": f"⚠️ WARNING: collection_total is None! This means we couldn't determine the collection size. It will be found during scraping.",
-                            "api_source": "Backend",
-                            "chain": chain.value,
-                        }, websocket)
-                    else:
-                        logger.info(f"✅ [scrape_collection] Sending collection_info with total: {collection_total:,}")
-                    
-                    # Add marketplace data if available
-                    if collection_stats:
-                        if collection_stats.floor_price is not None:
-                            collection_info_data["floor_price"] = collection_stats.floor_price
-                            collection_info_data["floor_price_currency"] = collection_stats.floor_price_currency
-                        if collection_stats.total_volume is not None:
-                            collection_info_data["total_volume"] = collection_stats.total_volume
-                        if collection_stats.volume_24h is not None:
-                            collection_info_data["volume_24h"] = collection_stats.volume_24h
-                        if collection_stats.total_owners is not None:
-                            collection_info_data["total_owners"] = collection_stats.total_owners
-                        if collection_stats.market_cap is not None:
-                            collection_info_data["market_cap"] = collection_stats.market_cap
-                        # Add image URL if available
-                        if hasattr(collection_stats, 'image_url') and collection_stats.image_url:
-                            collection_info_data["image_url"] = str(collection_stats.image_url)
-                        elif hasattr(collection_stats, 'logo') and collection_stats.logo:
-                            collection_info_data["image_url"] = str(collection_stats.logo)
-                        elif hasattr(collection_stats, 'banner_image') and collection_stats.banner_image:
-                            collection_info_data["image_url"] = str(collection_stats.banner_image)
-                        elif hasattr(collection_stats, 'collection_image') and collection_stats.collection_image:
-                            collection_info_data["image_url"] = str(collection_stats.collection_image)
-                    
-                    # Send collection info to UI BEFORE starting to scrape
-                    await manager.send_personal_message(collection_info_data, websocket)
-                    
-                    # STEP 2: Now start actual scraping
-                    if collection_total:
-                        await manager.send_personal_message({
-                            "type": "status",
-                            "message": f"Collection info loaded: {collection_total:,} NFTs. Starting scrape...",
-                            "chain": chain.value,
-                        }, websocket)
-                    else:
-                        await manager.send_personal_message({
-                            "type": "status",
-                            "message": f"Starting scrape... (total size will be determined during scraping)",
-                            "chain": chain.value,
-                        }, websocket)
-                    
-                    # Determine API source for logging
-                    api_source = "Helius" if chain == Chain.SOLANA else ("Alchemy" if scout.alchemy else "Moralis")
-                    
-                    while page_count < max_pages:
-                        try:
-                            if page_count == 0:
-                                await manager.send_personal_message({
-                                    "type": "status",
-                                    "message": f"🚀 Starting scrape from {api_source} API...",
-                                    "api_source": api_source,
-                                    "chain": chain.value,
-                                }, websocket)
-                            
-                            # For Alchemy/Moralis, use 100 per page (API limit)
-                            # For Helius, use 1000 per page
-                            if chain == Chain.SOLANA:
-                                page_size = 1000
-                            else:
-                                page_size = 100  # Alchemy/Moralis max
-                            
-                            response = await scout.get_collection_nfts(
-                                contract_address,
-                                chain,
-                                cursor=cursor,
-                                page_size=page_size,
-                            )
-                            
-                            # Detailed logging during scraping - show what we get from each page
-                            await manager.send_personal_message({
-                                "type": "status",
-                                "message": f"📊 Page {page_count + 1} Response: total={response.total if hasattr(response, 'total') else 'None'}, total_count={response.total_count}, nfts={len(response.nfts)}, has_more={response.has_more}, cursor={'Yes' if response.cursor else 'None'}",
-                                "api_source": api_source,
-                                "chain": chain.value,
-                            }, websocket)
-                            
-                            # Track collection total size from first response if not already set
-                            # (We already fetched it before scraping, but if we didn't, try to get it now)
-                            if collection_total is None:
-                                await manager.send_personal_message({
-                                    "type": "status",
-                                    "message": f"🔍 collection_total is None - Checking response for total...",
-                                    "api_source": api_source,
-                                    "chain": chain.value,
-                                }, websocket)
-                                
-                                # Try to get total from response if available (Helius sometimes returns this)
-                                if hasattr(response, 'total') and response.total:
-                                    collection_total = response.total
-                                    await manager.send_personal_message({
-                                        "type": "status",
-                                        "message": f"✅ Found total from response.total: {collection_total:,}",
-                                        "api_source": api_source,
-                                        "chain": chain.value,
-                                    }, websocket)
-                                elif hasattr(response, 'total_count') and response.total_count > len(response.nfts):
-                                    collection_total = response.total_count
-                                    await manager.send_personal_message({
-                                        "type": "status",
-                                        "message": f"✅ Found total from response.total_count: {collection_total:,}",
-                                        "api_source": api_source,
-                                        "chain": chain.value,
-                                    }, websocket)
-                                
-                                # Also check the raw response from Helius client
-                                if chain == Chain.SOLANA and hasattr(scout.helius, '_last_total'):
-                                    helius_last = getattr(scout.helius, '_last_total', None)
-                                    helius_collection = getattr(scout.helius, '_collection_total', None)
-                                    await manager.send_personal_message({
-                                        "type": "status",
-                                        "message": f"🔍 Checking Helius client during scrape: _last_total={helius_last}, _collection_total={helius_collection}",
-                                        "api_source": api_source,
-                                        "chain": chain.value,
-                                    }, websocket)
-                                    
-                                    if scout.helius._last_total:
-                                        collection_total = scout.helius._last_total
-                                        await manager.send_personal_message({
-                                            "type": "status",
-                                            "message": f"✅ Found total from Helius _last_total during scrape: {collection_total:,}",
-                                            "api_source": api_source,
-                                            "chain": chain.value,
-                                        }, websocket)
-                                    elif hasattr(scout.helius, '_collection_total') and scout.helius._collection_total:
-                                        collection_total = scout.helius._collection_total
-                                        await manager.send_personal_message({
-                                            "type": "status",
-                                            "message": f"✅ Found total from Helius _collection_total during scrape: {collection_total:,}",
-                                            "api_source": api_source,
-                                            "chain": chain.value,
-                                        }, websocket)
-                                
-                                # If we got the total now, update the UI
-                                if collection_total:
-                                    await manager.send_personal_message({
-                                        "type": "collection_info",
-                                        "collection_total": collection_total,
-                                    }, websocket)
-                                else:
-                                    await manager.send_personal_message({
-                                        "type": "status",
-                                        "message": f"⚠️ Still no total found - response.total={response.total if hasattr(response, 'total') else 'None'}, response.total_count={response.total_count}",
-                                        "api_source": api_source,
-                                        "chain": chain.value,
-                                    }, websocket)
-                            
-                            if not response.nfts:
-                                # No NFTs found, might be wrong chain or address
-                                if page_count == 0:
-                                    error_msg = f"No NFTs found on {chain.value}."
-                                    
-                                    # For Solana with Magic Eden symbols, provide helpful error
-                                    if chain == Chain.SOLANA and not contract_address.startswith("0x") and len(contract_address) < 32:
-                                        error_msg = f"Magic Eden collection symbol '{contract_address}' cannot be used directly. "
-                                        error_msg += "Please provide the Solana collection address. "
-                                        error_msg += "You can find it on Magic Eden by viewing the collection details."
-                                        await manager.send_personal_message({
-                                            "type": "error",
-                                            "message": error_msg,
-                                        }, websocket)
-                                        break
-                                    
-                                    # Try other chains if first attempt fails
-                                    await manager.send_personal_message({
-                                        "type": "warning",
-                                        "message": f"{error_msg} Trying other chains...",
-                                        "api_source": api_source,
-                                        "chain": chain.value,
-                                    }, websocket)
-                                    
-                                    # Try all EVM chains if it's an Ethereum address
-                                    if chain == Chain.ETHEREUM and contract_address.startswith("0x"):
-                                        chains_to_try = [Chain.POLYGON, Chain.ARBITRUM, Chain.OPTIMISM, Chain.BASE]
-                                        found = False
-                                        for alt_chain in chains_to_try:
-                                            try:
-                                                alt_response = await scout.get_collection_nfts(
-                                                    contract_address,
-                                                    alt_chain,
-                                                    cursor=None,
-                                                    page_size=10,
-                                                )
-                                                if alt_response.nfts:
-                                                    chain = alt_chain
-                                                    alt_api_source = "Alchemy" if scout.alchemy else "Moralis"
-                                                    await manager.send_personal_message({
-                                                        "type": "status",
-                                                        "message": f"✅ Found collection on {alt_chain.value} via {alt_api_source} API!",
-                                                        "api_source": alt_api_source,
-                                                        "chain": alt_chain.value,
-                                                    }, websocket)
-                                                    found = True
-                                                    break
-                                            except Exception:
-                                                # Error trying alternative chain, continue to next
-                                                continue
-                                        if not found:
-                                            break
-                                    elif chain == Chain.SOLANA:
-                                        # For Solana, can't try other chains
-                                        await manager.send_personal_message({
-                                            "type": "error",
-                                            "message": "❌ No NFTs found. Please verify the collection address is correct.",
-                                            "api_source": api_source,
-                                            "chain": chain.value,
-                                        }, websocket)
-                                        break
-                                    else:
-                                        break
-                                else:
-                                    break
-                            
-                            # Send NFTs one by one for live display with a slight delay for smooth animation
-                            await manager.send_personal_message({
-                                "type": "status",
-                                "message": f"📦 Processing {len(response.nfts)} NFTs from page {page_count + 1}...",
-                                "api_source": api_source,
-                                "chain": chain.value,
-                            }, websocket)
-                            
-                            for i, nft in enumerate(response.nfts):
-                                # Create unique identifier for duplicate checking
-                                nft_id = (str(nft.token_id), str(nft.contract_address))
-                                
-                                # Skip if we've already seen this NFT
-                                if nft_id in seen_nfts:
-                                    logger.debug(f"⏭️ Skipping duplicate NFT: token_id={nft.token_id}, contract={nft.contract_address}")
-                                    continue
-                                
-                                # Mark as seen
-                                seen_nfts.add(nft_id)
-                                total_scraped += 1
-                                
-                                # Convert NFT to dict and ensure HttpUrl fields are strings
-                                nft_dict = None
-                                try:
-                                    if hasattr(nft, 'dict'):
-                                        nft_dict = nft.dict()
-                                    elif hasattr(nft, 'model_dump'):
-                                        nft_dict = nft.model_dump()
-                                    else:
-                                        nft_dict = {"token_id": str(nft.token_id), "contract_address": str(nft.contract_address)}
-                                except Exception:
-                                    try:
-                                        if hasattr(nft, 'model_dump'):
-                                            nft_dict = nft.model_dump()
-                                        elif hasattr(nft, 'dict'):
-                                            nft_dict = nft.dict()
-                                        else:
-                                            nft_dict = {"token_id": str(nft.token_id), "contract_address": str(nft.contract_address)}
-                                    except Exception as e:
-                                        logger.warning(f"Error converting NFT to dict: {e}")
-                                        nft_dict = {"token_id": str(nft.token_id), "contract_address": str(nft.contract_address)}
-                                
-                                # Ensure HttpUrl fields are strings (double check)
-                                url_fields = ["image_url", "animation_url", "external_url"]
-                                for field in url_fields:
-                                    if field in nft_dict and nft_dict[field] is not None:
-                                        if not isinstance(nft_dict[field], str):
-                                            nft_dict[field] = str(nft_dict[field])
-                                
-                                # Show what NFT is being scraped
-                                nft_name = nft_dict.get("name") or nft_dict.get("token_id") or f"#{i+1}"
-                                image_url = nft_dict.get("image_url") or "None"
-                                
-                                if i % 50 == 0 or i == len(response.nfts) - 1:  # Log every 50th NFT or last one
-                                    await manager.send_personal_message({
-                                        "type": "status",
-                                        "message": f"✅ Scraping NFT {total_scraped}: {nft_name} (image: {str(image_url)[:50]}...)",
-                                        "api_source": api_source,
-                                        "chain": chain.value,
-                                    }, websocket)
-                                
-                                # Debug: Log image URL details for first few NFTs
-                                if i < 5:
-                                    await manager.send_personal_message({
-                                        "type": "status",
-                                        "message": f"🔍 NFT {total_scraped} image_url: {image_url}",
-                                        "api_source": api_source,
-                                        "chain": chain.value,
-                                    }, websocket)
-                                
-                                # Send NFT immediately for live display
-                                await manager.send_personal_message({
-                                    "type": "nft",
-                                    "nft": nft_dict,
-                                    "total_scraped": total_scraped,
-                                    "api_source": api_source,
-                                }, websocket)
-                                
-                                # Small delay for smooth UI updates (longer delay for visual effect)
-                                await asyncio.sleep(0.05)  # 50ms delay between NFTs for live display effect
-                                
-                                # Update collection name from first NFT if not set
-                                if total_scraped == 1:
-                                    await manager.send_personal_message({
-                                        "type": "collection_info",
-                                        "collection_name": nft.collection_name or contract_address,
-                                        "chain": chain.value,
-                                    }, websocket)
-                            
-                            await manager.send_personal_message({
-                                "type": "status",
-                                "message": f"✅ Completed page {page_count + 1}: {len(response.nfts)} NFTs scraped (total: {total_scraped})",
-                                "api_source": api_source,
-                                "chain": chain.value,
-                            }, websocket)
-                            
-                            # Calculate remaining and progress
-                            remaining = None
-                            progress_pct = 0
-                            if collection_total and collection_total > 0:
-                                remaining = max(0, collection_total - total_scraped)
-                                progress_pct = min(100, round((total_scraped / collection_total) * 100, 1))
-                            
-                            # Update progress
-                            await manager.send_personal_message({
-                                "type": "progress",
-                                "total_scraped": total_scraped,
-                                "collection_total": collection_total,
-                                "remaining": remaining,
-                                "progress_pct": progress_pct,
-                                "has_more": response.has_more,
-                                "message": f"Scraped {total_scraped} NFTs so far...",
-                            }, websocket)
-                            
-                            # Continue to next page if there are more NFTs
-                            # CRITICAL: For Alchemy/Moralis, we MUST continue if:
-                            # 1) has_more is True, OR
-                            # 2) cursor/pageKey exists, OR  
-                            # 3) We haven't reached the total collection size
-                            # 4) We got a full page (100 NFTs) - there's almost certainly more
-                            should_continue = False
-                            
-                            # Check for cursor/pageKey in response (Alchemy uses pageKey, Moralis uses cursor)
-                            # Also check the raw response dict if available
-                            # IMPORTANT: response is a CollectionNFTResponse object, cursor is a direct attribute
-                            response_cursor = response.cursor if hasattr(response, 'cursor') and response.cursor else None
-                            
-                            # If no cursor on response object, check if we can get it from the underlying API response
-                            # This shouldn't be necessary but just in case
-                            if not response_cursor:
-                                # Try to get from response attributes (for debugging)
-                                logger.debug(f"Response object attributes: {dir(response)}")
-                                response_cursor = getattr(response, 'pageKey', None) or getattr(response, 'nextToken', None)
-                            
-                            # Debug: Log what we have
-                            logger.info(f"🔍 Pagination check: has_more={response.has_more}, cursor={bool(response_cursor)}, total_scraped={total_scraped}, collection_total={collection_total}, nfts_in_page={len(response.nfts)}")
-                            
-                            # CRITICAL PAGINATION LOGIC - Must continue until ALL NFTs are scraped
-                            # PRIORITY 1: If we know the total and haven't reached it - MUST continue (highest priority)
-                            if collection_total and collection_total > 0 and total_scraped < collection_total:
-                                should_continue = True
-                                if response_cursor:
-                                    cursor = response_cursor
-                                    logger.info(f"✅ Total not reached ({total_scraped}/{collection_total}), using cursor to continue")
-                                elif cursor:
-                                    logger.warning(f"⚠️ Total not reached ({total_scraped}/{collection_total}), using existing cursor")
-                                else:
-                                    # Force continue - we'll try to get cursor from next request
-                                    logger.warning(f"⚠️ Total not reached ({total_scraped}/{collection_total}), forcing continuation without cursor")
-                            # PRIORITY 2: Got full page - almost certainly more (check this BEFORE has_more)
-                            # For Solana with 1000 per page, check for 1000; for others check for 100
-                            elif (chain == Chain.SOLANA and len(response.nfts) >= 1000) or (chain != Chain.SOLANA and len(response.nfts) >= 100):
-                                should_continue = True
-                                page_size_got = len(response.nfts)
-                                if response_cursor:
-                                    cursor = response_cursor
-                                    logger.info(f"✅ Got full page ({page_size_got} NFTs) with cursor, continuing...")
-                                elif cursor:
-                                    logger.warning(f"⚠️ Got full page ({page_size_got} NFTs), using existing cursor to continue")
-                                else:
-                                    # Try to continue anyway - might get cursor in next request
-                                    logger.warning(f"⚠️ Got full page ({page_size_got} NFTs) but no cursor - attempting to continue anyway (will try to get cursor from next request)")
-                            # PRIORITY 3: API explicitly says there's more
-                            elif response.has_more:
-                                should_continue = True
-                                if response_cursor:
-                                    cursor = response_cursor
-                                logger.info(f"✅ has_more=True, continuing. Cursor: {bool(response_cursor)}")
-                            # PRIORITY 4: Cursor exists (even if has_more is False)
-                            elif response_cursor:
-                                should_continue = True
-                                cursor = response_cursor
-                                logger.info(f"✅ Cursor exists (has_more={response.has_more}), continuing. Cursor: {response_cursor[:30]}...")
-                            # PRIORITY 5: Existing cursor from previous page
-                            elif cursor:
-                                should_continue = True
-                                logger.warning(f"⚠️ Using existing cursor to continue (has_more={response.has_more}, nfts={len(response.nfts)})")
-                            
-                            if should_continue:
-                                page_count += 1
-                                cursor_str = cursor[:20] + "..." if cursor and len(cursor) > 20 else (cursor or "none")
-                                logger.info(f"🔄 Continuing to page {page_count + 1} with cursor: {cursor_str} (scraped: {total_scraped}/{collection_total or '?'})")
-                                await manager.send_personal_message({
-                                    "type": "status",
-                                    "message": f"📥 {api_source} API: Fetching page {page_count + 1}... ({total_scraped}/{collection_total or '?'} NFTs)",
-                                    "api_source": api_source,
-                                    "chain": chain.value,
-                                }, websocket)
-                                await asyncio.sleep(0.5)  # Rate limiting
-                                # Continue loop - don't break
-                            else:
-                                # No more pages - but check if we should have continued
-                                if collection_total and total_scraped < collection_total:
-                                    # We know there are more but stopped - this is an error
-                                    logger.error(f"❌ CRITICAL ERROR: Stopped scraping but only got {total_scraped}/{collection_total} NFTs! has_more={response.has_more}, cursor={bool(response_cursor)}, nfts_in_page={len(response.nfts)}")
-                                    # Try to force continue one more time
-                                    if len(response.nfts) >= 100:
-                                        logger.warning(f"⚠️ Got 100 NFTs but stopped - forcing continuation")
-                                        should_continue = True
-                                        page_count += 1
-                                        await manager.send_personal_message({
-                                            "type": "status",
-                                            "message": f"⚠️ Forcing continuation - got 100 NFTs but total not reached ({total_scraped}/{collection_total})",
-                                            "api_source": api_source,
-                                            "chain": chain.value,
-                                        }, websocket)
-                                        await asyncio.sleep(0.5)
-                                    else:
-                                        await manager.send_personal_message({
-                                            "type": "warning",
-                                            "message": f"⚠️ {api_source} API: Scraped {total_scraped}/{collection_total} NFTs. Pagination may have been limited.",
-                                            "api_source": api_source,
-                                            "chain": chain.value,
-                                        }, websocket)
-                                        break
-                                elif len(response.nfts) >= 100:
-                                    # Got 100 NFTs but no total - might be more, try to continue
-                                    logger.warning(f"⚠️ Got 100 NFTs but has_more=False and no cursor - attempting to continue anyway")
-                                    should_continue = True
-                                    page_count += 1
-                                    await manager.send_personal_message({
-                                        "type": "status",
-                                        "message": f"⚠️ Got 100 NFTs, attempting to continue...",
-                                        "api_source": api_source,
-                                        "chain": chain.value,
-                                    }, websocket)
-                                    await asyncio.sleep(0.5)
-                                else:
-                                    # Legitimately done
-                                    logger.info(f"✅ Completed scraping. Total: {total_scraped} NFTs")
-                                    break
-                            
-                        except Exception as e:
-                            logger.error(f"Error scraping page: {e}")
-                            # If it's a chain-specific error, try other chains
-                            if "No client available" in str(e) or "not available" in str(e).lower():
-                                await manager.send_personal_message({
-                                    "type": "error",
-                                    "message": f"❌ Chain {chain.value} not available. Please ensure API keys are configured.",
-                                    "api_source": api_source if 'api_source' in locals() else "Unknown",
-                                    "chain": chain.value,
-                                }, websocket)
-                            else:
-                                await manager.send_personal_message({
-                                    "type": "error",
-                                    "message": f"❌ Error: {str(e)}",
-                                    "api_source": api_source if 'api_source' in locals() else "Unknown",
-                                    "chain": chain.value if 'chain' in locals() else "Unknown",
-                                }, websocket)
-                            break
-                    
-                    # Final progress update
-                    remaining = None
-                    progress_pct = 0
-                    if collection_total and collection_total > 0:
-                        remaining = max(0, collection_total - total_scraped)
-                        progress_pct = min(100, round((total_scraped / collection_total) * 100, 1))
-                    
-                    await manager.send_personal_message({
-                        "type": "complete",
-                        "total_scraped": total_scraped,
-                        "collection_total": collection_total,
-                        "remaining": remaining,
-                        "progress_pct": progress_pct,
-                        "message": f"✅ Completed scraping {total_scraped} NFTs from {api_source} API",
-                        "api_source": api_source,
-                        "chain": chain.value,
-                    }, websocket)
-                    
-                except Exception as e:
-                    logger.error(f"Scraping error: {e}")
-                    await manager.send_personal_message({
-                        "type": "error",
-                        "message": str(e),
-                    }, websocket)
-            
-            elif action == "get_collection_info":
-                collection_url = data.get("collection_url")
-                if not collection_url:
-                    await manager.send_personal_message({
-                        "type": "error",
-                        "message": "No collection URL provided",
-                    }, websocket)
-                    continue
-                
-                try:
-                    contract_address, chain = extract_collection_info(collection_url)
+                    continue
+                
+                try:
+                    contract_address, chain = extract_collection_info(collection_url)
                     
                     # If contract_address is still a URL (Nintondo, etc.), fetch the actual contract address
                     if contract_address.startswith("http://") or contract_address.startswith("https://"):
@@ -1673,9 +1861,6 @@ async def websocket_endpoint(websocket: WebSocket):
                     # For Solana/Helius, we can get the total from a small query
                     if chain == Chain.SOLANA and scout.helius:
                         try:
-                            # Don't reset client state - we want to preserve totals from previous queries
-                            # Only reset if we're starting fresh (not for info queries)
-                            
                             # Do a minimal query with limit=1 just to get total from response
                             # Use large page_size to get accurate total
                             logger.info(f"Fetching collection total for {contract_address} on {chain.value}...")
@@ -1692,31 +1877,19 @@ async def websocket_endpoint(websocket: WebSocket):
                                 collection_total = response.total
                                 logger.info(f"Got collection total from response.total: {collection_total}")
                             
-                            # 2. If cache hit but no total, try to force a fresh query
+                            # 2. A cached page may predate the total; ask the provider directly
                             if not collection_total and hasattr(response, 'total') and response.total is None:
-                                # Clear cache and try again
-                                cache_key = f"collection:{contract_address}:{chain.value}"
-                                await scout.storage.delete_cache(cache_key)
-                                logger.info("Cache had no total, clearing cache and fetching fresh...")
+                                logger.info("Page had no total, fetching it fresh from the provider...")
                                 response = await scout.get_collection_nfts(
                                     contract_address,
                                     chain,
                                     cursor=None,
                                     page_size=1000,
+                                    fresh=True,
                                 )
                                 if hasattr(response, 'total') and response.total:
                                     collection_total = response.total
                                     logger.info(f"Got collection total from fresh response.total: {collection_total}")
-                            
-                            # 3. Helius client's _last_total (set after RPC call)
-                            if not collection_total and hasattr(scout.helius, '_last_total') and scout.helius._last_total:
-                                collection_total = scout.helius._last_total
-                                logger.info(f"Got collection total from Helius _last_total: {collection_total}")
-                            
-                            # 4. Helius client's _collection_total
-                            if not collection_total and hasattr(scout.helius, '_collection_total') and scout.helius._collection_total:
-                                collection_total = scout.helius._collection_total
-                                logger.info(f"Got collection total from Helius _collection_total: {collection_total}")
                         except Exception as e:
                             logger.warning(f"Error fetching Solana collection info: {e}")
                             # Continue anyway - we'll try to get total during scraping
@@ -1796,31 +1969,21 @@ async def websocket_endpoint(websocket: WebSocket):
                                 "api_source": "Backend",
                             }, websocket)
                             
-                            # CRITICAL: Clear cache before counting to ensure fresh data
-                            cache_key = f"collection:{contract_address}:{chain.value}"
-                            await scout.storage.delete_cache(cache_key)
-                            logger.info(f"Cleared cache for {cache_key} before counting")
-                            
                             # Use the resolved collection address directly (not symbol)
                             # Get it from Helius client if available
                             actual_address = contract_address
                             if chain == Chain.SOLANA and scout.helius:
-                                # Try to get the resolved address from Helius
-                                if hasattr(scout.helius, '_current_collection') and scout.helius._current_collection:
-                                    actual_address = scout.helius._current_collection
-                                    logger.info(f"Using resolved collection address for counting: {actual_address}")
-                                else:
-                                    # Force a fresh query to resolve the address
-                                    logger.info(f"Resolving collection address before counting...")
-                                    temp_response = await scout.get_collection_nfts(
-                                        contract_address,
-                                        chain,
-                                        cursor=None,
-                                        page_size=1,  # Just to trigger resolution
-                                    )
-                                    if hasattr(scout.helius, '_current_collection') and scout.helius._current_collection:
-                                        actual_address = scout.helius._current_collection
-                                        logger.info(f"Resolved collection address: {actual_address}")
+                                # Resolve the address with a fresh query
+                                logger.info(f"Resolving collection address before counting...")
+                                temp_response = await scout.get_collection_nfts(
+                                    contract_address,
+                                    chain,
+                                    cursor=None,
+                                    page_size=1,  # Just to trigger resolution
+                                )
+                                if temp_response.resolved_address:
+                                    actual_address = temp_response.resolved_address
+                                    logger.info(f"Resolved collection address: {actual_address}")
                             
                             # Paginate through collection to count all NFTs
                             total_counted = 0
@@ -1833,16 +1996,14 @@ async def websocket_endpoint(websocket: WebSocket):
                             page_size = 100 if chain != Chain.SOLANA else 1000  # Alchemy max is 100, Helius is 1000
                             
                             while page_count < max_count_pages:
-                                # Clear cache for this specific page to avoid stale data
-                                if current_cursor:
-                                    await scout.storage.delete_cache(cache_key)
-                                
                                 try:
+                                    # Counted from the provider, not from pages cached up to PAGE_CACHE_TTL ago
                                     count_response = await scout.get_collection_nfts(
                                         actual_address,  # Use resolved address
                                         chain,
                                         cursor=current_cursor,
                                         page_size=page_size,
+                                        fresh=True,
                                     )
                                 except Exception as count_err:
                                     logger.error(f"Error counting NFTs on page {page_count + 1}: {count_err}")
@@ -2096,7 +2257,7 @@ async def websocket_endpoint(websocket: WebSocket):
                         logger.warning(f"⚠️ Sending collection_info with collection_total=None - will show 'Unknown' in modal, counting will happen during scraping")
                     
                     await manager.send_personal_message(response_data, websocket)
-                    
+                
                 except Exception as e:
                     logger.error(f"Error getting collection info: {e}")
                     await manager.send_personal_message({
@@ -2130,6 +2291,8 @@ async def websocket_endpoint(websocket: WebSocket):
     except Exception as e:
         logger.error(f"WebSocket error: {e}")
         manager.disconnect(websocket)
+    finally:
+        await close_subscriptions(subscriptions)
 
 
 if __name__ == "__main__":